@@ -9,6 +9,7 @@ from xmodule.modulestore.xml_importer import import_from_xml
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore
+from contentstore.models import CourseListing
 
 
 class Command(BaseCommand):
@@ -49,6 +50,7 @@ class Command(BaseCommand):
 
         for course in course_items:
             course_id = course.id
+            CourseListing.update_for_course(course)
             if not are_permissions_roles_seeded(course_id):
                 self.stdout.write('Seeding forum roles for course {0}\n'.format(course_id))
                 seed_permissions_roles(course_id)
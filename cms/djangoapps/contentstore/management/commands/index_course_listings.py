@@ -0,0 +1,29 @@
+"""Script for (re)building the index of courses listed on the Studio home page"""
+from django.core.management.base import BaseCommand, CommandError
+from contentstore.models import CourseListing
+from xmodule.error_module import ErrorDescriptor
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """Command for indexing the course listings of all courses"""
+    help = '''
+    Index the listings of all of the courses in the modulestore, and remove the
+    listings of courses which no longer exist. Takes no arguments.
+    '''
+
+    def handle(self, *args, **options):
+        if len(args) != 0:
+            raise CommandError("index_course_listings takes no arguments")
+
+        indexed_course_keys = set()
+        for course in modulestore().get_courses():
+            # TODO remove this condition when templates purged from db
+            if isinstance(course, ErrorDescriptor) or course.location.course == 'templates':
+                continue
+            CourseListing.update_for_course(course)
+            indexed_course_keys.add(course.id)
+
+        CourseListing.objects.exclude(course_key__in=indexed_course_keys).delete()
+
+        self.stdout.write(u"Indexed the listings of {0} courses.\n".format(len(indexed_course_keys)))
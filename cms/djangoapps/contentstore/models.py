@@ -3,9 +3,13 @@ Models for contentstore
 """
 # pylint: disable=no-member
 
+from django.db import models
 from django.db.models.fields import TextField
 
 from config_models.models import ConfigurationModel
+from xmodule.course_module import CourseSummary
+from xmodule.error_module import ErrorDescriptor
+from xmodule_django.models import CourseKeyField, UsageKeyField
 
 
 class VideoUploadConfig(ConfigurationModel):
@@ -34,3 +38,67 @@ class VideoUploadConfig(ConfigurationModel):
         download
         """
         return [status for status in cls.current().status_whitelist.split(",") if status]
+
+
+class CourseListing(models.Model):
+    """
+    An index of the courses in the modulestore, holding just what the Studio
+    home page lists for each course, so that it can list the courses a user
+    has access to without loading every course from every store.
+
+    The index is updated by Studio as it creates, reruns, imports, edits the
+    settings of, and deletes courses; the index_course_listings management
+    command (re)builds it from the modulestore.
+    """
+    course_key = CourseKeyField(max_length=255, unique=True)
+    # the course's root block; its name differs between the old mongo and split stores
+    location = UsageKeyField(max_length=255)
+    # the course's org, which org-wide access roles are matched against
+    org = models.CharField(max_length=255, db_index=True)
+    display_name = models.TextField(null=True)
+    display_organization = models.TextField(null=True)
+    display_coursenumber = models.TextField(null=True)
+
+    @classmethod
+    def update_for_course(cls, course):
+        """
+        Index the listing of the CourseDescriptor `course`, replacing any
+        previous listing of it.  Errored courses are removed from the index
+        rather than listed.
+        """
+        if course is None:
+            return
+        course_key = course.location.course_key
+        if isinstance(course, ErrorDescriptor):
+            cls.remove_course(course_key)
+            return
+
+        listing, __ = cls.objects.get_or_create(
+            course_key=course_key,
+            defaults={'location': course.location, 'org': course_key.org},
+        )
+        listing.location = course.location
+        listing.org = course_key.org
+        listing.display_name = course.display_name
+        listing.display_organization = course.display_organization
+        listing.display_coursenumber = course.display_coursenumber
+        listing.save()
+
+    @classmethod
+    def remove_course(cls, course_key):
+        """
+        Remove the listing of the course with the given key from the index.
+        """
+        cls.objects.filter(course_key=course_key).delete()
+
+    def to_summary(self):
+        """
+        Return the CourseSummary of the indexed course, which the course
+        listing views format the same way as a CourseDescriptor.
+        """
+        return CourseSummary(
+            self.location,
+            display_name=self.display_name,
+            display_organization=self.display_organization,
+            display_coursenumber=self.display_coursenumber,
+        )
@@ -3,17 +3,30 @@ This file contains celery tasks for contentstore views
 """
 
 from celery.task import task
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.exceptions import SuspiciousOperation
 import json
 import logging
+import os
+import shutil
+import tarfile
+from path import path
+from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.xml_importer import import_from_xml
 from xmodule.course_module import CourseFields
 
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
-from course_action_state.models import CourseRerunState
+from course_action_state.managers import CourseActionStateItemNotFoundError
+from course_action_state.models import CourseRerunState, CourseImportState
+from contentstore.models import CourseListing
 from contentstore.utils import initialize_permissions
+from extract_tar import safetar_extractall
 from opaque_keys.edx.keys import CourseKey
 
+log = logging.getLogger(__name__)
+
 
 @task()
 def rerun_course(source_course_key_string, destination_course_key_string, user_id, fields=None):
@@ -34,6 +47,7 @@ def rerun_course(source_course_key_string, destination_course_key_string, user_i
 
         # set initial permissions for the user to access the course.
         initialize_permissions(destination_course_key, User.objects.get(id=user_id))
+        CourseListing.update_for_course(store.get_course(destination_course_key))
 
         # update state: Succeeded
         CourseRerunState.objects.succeeded(course_key=destination_course_key)
@@ -61,6 +75,92 @@ def rerun_course(source_course_key_string, destination_course_key_string, user_i
         return "exception: " + unicode(exc)
 
 
+# acks_late makes the broker redeliver the task if the worker running it dies,
+# in which case the import resumes from the stage recorded in its CourseImportState.
+@task(acks_late=True)
+def import_olx(user_id, course_key_string, archive_path, archive_name):
+    """
+    Imports the uploaded course archive at archive_path into the given course
+    in a new celery task, recording the progress of the import in the
+    CourseImportState of the course.
+    """
+    course_key = CourseKey.from_string(course_key_string)
+    try:
+        import_state = CourseImportState.objects.find_first(course_key=course_key, filename=archive_name)
+    except CourseActionStateItemNotFoundError:
+        log.warning("Course import %s: no import of %s was initiated", course_key, archive_name)
+        return "not found"
+
+    # the import was already finished, or superseded by a later one
+    if import_state.state != CourseImportState.objects.State.IN_PROGRESS:
+        return import_state.state
+
+    course_dir = path(archive_path).dirname()
+    try:
+        if import_state.stage <= CourseImportState.objects.Stage.UNPACKING:
+            # read the archive as a stream, extracting each member as it is read
+            with tarfile.open(archive_path, mode='r|gz') as tar_file:
+                safetar_extractall(tar_file, (course_dir + '/').encode('utf-8'))
+            log.info("Course import %s: Uploaded file extracted", course_key)
+            CourseImportState.objects.stage_started(course_key, CourseImportState.objects.Stage.VERIFYING)
+
+        dirpath = _get_dir_for_fname(course_dir, "course.xml")
+        if not dirpath:
+            CourseImportState.objects.stage_started(course_key, CourseImportState.objects.Stage.VERIFYING)
+            CourseImportState.objects.failed(course_key, "Could not find the course.xml file in the package.")
+            return "failed"
+
+        dirpath = os.path.relpath(dirpath, settings.GITHUB_REPO_ROOT)
+        log.debug('found course.xml at %s', dirpath)
+        log.info("Course import %s: Extracted file verified", course_key)
+        CourseImportState.objects.stage_started(course_key, CourseImportState.objects.Stage.UPDATING)
+
+        import_from_xml(
+            modulestore(),
+            user_id,
+            settings.GITHUB_REPO_ROOT,
+            [dirpath],
+            load_error_modules=False,
+            static_content_store=contentstore(),
+            target_course_id=course_key,
+        )
+        CourseListing.update_for_course(modulestore().get_course(course_key))
+
+        log.info("Course import %s: Course import successful", course_key)
+        CourseImportState.objects.succeeded(course_key)
+        return "succeeded"
+
+    except SuspiciousOperation as exc:
+        CourseImportState.objects.failed(course_key, u"Unsafe tar file. Aborting import. {0}".format(exc.args[0]))
+        log.exception(u'Course Import Error')
+        return "unsafe tar file"
+
+    # catch all exceptions so we can update the state and report the error to the user.
+    except Exception as exc:  # pylint: disable=broad-except
+        CourseImportState.objects.failed(course_key, unicode(exc))
+        log.exception(u'Course Import Error')
+        return "exception: " + unicode(exc)
+
+    finally:
+        # a worker which dies never gets here, leaving the temp data in place
+        # for the redelivered task to resume the import from.
+        if course_dir.isdir():
+            shutil.rmtree(course_dir)
+            log.info("Course import %s: Temp data cleared", course_key)
+
+
+def _get_dir_for_fname(directory, filename):
+    """
+    Returns the dirpath for the first file found in the directory
+    with the given name.  If there is no file in the directory with
+    the specified name, return None.
+    """
+    for dirpath, _dirnames, filenames in os.walk(directory):
+        if filename in filenames:
+            return dirpath
+    return None
+
+
 def deserialize_fields(json_fields):
     fields = json.loads(json_fields)
     for field_name, value in fields.iteritems():
@@ -8,9 +8,14 @@ from chrono import Timer
 from mock import patch, Mock
 import ddt
 
+from django.core.management import call_command
 from django.test import RequestFactory
 
-from contentstore.views.course import _accessible_courses_list, _accessible_courses_list_from_groups, AccessListFallback
+from contentstore.models import CourseListing
+from contentstore.views.course import (
+    _accessible_courses_list, _accessible_courses_list_from_groups, _accessible_courses_list_from_index,
+    AccessListFallback
+)
 from contentstore.utils import delete_course_and_groups, reverse_course_url
 from contentstore.tests.utils import AjaxEnabledTestClient
 from student.tests.factories import UserFactory
@@ -266,6 +271,10 @@ class TestCourseListing(ModuleStoreTestCase):
         courses_list, __ = _accessible_courses_list(self.request)
         self.assertEqual(len(courses_list), 2)
 
+        call_command('index_course_listings')
+        courses_list, __ = _accessible_courses_list_from_index(self.request)
+        self.assertEqual(len(courses_list), 2)
+
     def test_course_listing_with_actions_in_progress(self):
         sourse_course_key = CourseLocator('source-Org', 'source-Course', 'source-Run')
 
@@ -296,3 +305,66 @@ class TestCourseListing(ModuleStoreTestCase):
             self.assertSetEqual(
                 set_of_course_keys(courses_in_progress), set_of_course_keys(unsucceeded_course_actions, 'course_key')
             )
+
+    def test_course_listing_from_index(self):
+        """
+        Test that the courses listed from the index are those listed by iterating all courses,
+        and that listing them doesn't read the modulestore.
+        """
+        for num in range(3):
+            course_key = SlashSeparatedCourseKey('Org1', 'Course{}'.format(num), 'Run1')
+            self._create_course_with_access_groups(course_key, self.user)
+        self._create_course_with_access_groups(SlashSeparatedCourseKey('Org2', 'OtherCourse', 'Run1'))
+        call_command('index_course_listings')
+
+        def course_summary(course):
+            """The parts of a course which the course listing shows."""
+            return (course.id, course.location, course.display_name, course.display_org_with_default)
+
+        courses_list, __ = _accessible_courses_list(self.request)
+        with check_mongo_calls(0):
+            courses_list_from_index, __ = _accessible_courses_list_from_index(self.request)
+        self.assertEqual(len(courses_list_from_index), 3)
+        self.assertItemsEqual(
+            [course_summary(course) for course in courses_list],
+            [course_summary(course) for course in courses_list_from_index],
+        )
+
+        # global staff see every course
+        GlobalStaff().add_users(self.user)
+        courses_list_from_index, __ = _accessible_courses_list_from_index(self.request)
+        self.assertEqual(len(courses_list_from_index), 4)
+
+    def test_course_listing_index_updates(self):
+        """
+        Test that the index follows the courses' display names, and drops deleted courses.
+        """
+        course = self._create_course_with_access_groups(SlashSeparatedCourseKey('Org1', 'Course1', 'Run1'), self.user)
+        self.assertFalse(CourseListing.objects.exists())
+        CourseListing.update_for_course(course)
+
+        course.display_name = 'Renamed Course'
+        modulestore().update_item(course, self.user.id)
+        CourseListing.update_for_course(course)
+        courses_list, __ = _accessible_courses_list_from_index(self.request)
+        self.assertEqual([course.display_name for course in courses_list], ['Renamed Course'])
+
+        delete_course_and_groups(course.id, self.user.id)
+        self.assertFalse(CourseListing.objects.exists())
+
+    def test_course_listing_index_fallback(self):
+        """
+        Test that the user's role courses which are missing from the index, such as courses
+        written outside of Studio, are listed from the modulestore and then indexed.
+        """
+        course_key = SlashSeparatedCourseKey('Org1', 'Course1', 'Run1')
+        self._create_course_with_access_groups(course_key, self.user)
+        self.assertFalse(CourseListing.objects.exists())
+
+        courses_list, __ = _accessible_courses_list_from_index(self.request)
+        self.assertEqual([course.id for course in courses_list], [course_key])
+        self.assertTrue(CourseListing.objects.filter(course_key=course_key).exists())
+
+        with check_mongo_calls(0):
+            courses_list, __ = _accessible_courses_list_from_index(self.request)
+        self.assertEqual([course.id for course in courses_list], [course_key])
@@ -23,6 +23,7 @@ from opaque_keys.edx.keys import UsageKey, CourseKey
 from student.roles import CourseInstructorRole, CourseStaffRole
 from student.models import CourseEnrollment
 from student import auth
+from contentstore.models import CourseListing
 
 
 log = logging.getLogger(__name__)
@@ -78,6 +79,7 @@ def delete_course_and_groups(course_key, user_id):
 
     with module_store.bulk_operations(course_key):
         module_store.delete_course(course_key, user_id)
+        CourseListing.remove_course(course_key)
 
         print 'removing User permissions from course....'
         # in the django layer, we need to remove all the user permissions groups associated with this course
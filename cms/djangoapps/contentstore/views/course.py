@@ -13,6 +13,7 @@ from django.conf import settings
 from django.views.decorators.http import require_http_methods
 from django.core.exceptions import PermissionDenied
 from django.core.urlresolvers import reverse
+from django.db.models import Q
 from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponse, Http404
 from util.json_request import JsonResponse, JsonResponseBadRequest
 from util.date_utils import get_default_time_display
@@ -60,6 +61,7 @@ from .component import (
     ADVANCED_COMPONENT_TYPES,
 )
 from contentstore.tasks import rerun_course
+from contentstore.models import CourseListing
 from contentstore.views.entrance_exam import create_entrance_exam, delete_entrance_exam
 
 from .library import LIBRARIES_ENABLED
@@ -70,6 +72,7 @@ from student.roles import (
     CourseInstructorRole, CourseStaffRole, CourseCreatorRole, GlobalStaff, UserBasedRole
 )
 from student import auth
+from student.models import CourseAccessRole
 from course_action_state.models import CourseRerunState, CourseRerunUIStateManager
 from course_action_state.managers import CourseActionStateItemNotFoundError
 from microsite_configuration import microsite
@@ -291,7 +294,8 @@ def _course_outline_json(request, course_module):
         course_module,
         include_child_info=True,
         course_outline=True,
-        include_children_predicate=lambda xblock: not xblock.category == 'vertical'
+        include_children_predicate=lambda xblock: not xblock.category == 'vertical',
+        subtree_changes=modulestore().get_subtree_changes(course_module),
     )
 
 
@@ -314,14 +318,54 @@ def _accessible_courses_list(request):
         return has_studio_read_access(request.user, course.id)
 
     courses = filter(course_filter, modulestore().get_courses())
-    in_process_course_actions = [
+    return courses, _accessible_in_process_course_actions(request)
+
+
+def _accessible_in_process_course_actions(request):
+    """
+    List all the unsucceeded course reruns which the logged in user can see
+    """
+    return [
         course for course in
         CourseRerunState.objects.find_all(
             exclude_args={'state': CourseRerunUIStateManager.State.SUCCEEDED}, should_display=True
         )
         if has_studio_read_access(request.user, course.course_key)
     ]
-    return courses, in_process_course_actions
+
+
+def _accessible_courses_list_from_index(request):
+    """
+    List all courses available to the logged in user from the CourseListing index,
+    which is matched against the user's instructor and staff roles in the database
+    rather than loading and checking every course in the modulestore
+    """
+    listings = CourseListing.objects.all()
+    course_keys = set()
+    if not GlobalStaff().has_user(request.user):
+        orgs = set()
+        roles = CourseAccessRole.objects.filter(
+            user=request.user, role__in=(CourseInstructorRole.ROLE, CourseStaffRole.ROLE)
+        )
+        for org, course_id in roles.values_list('org', 'course_id'):
+            if course_id:
+                course_keys.add(CourseKey.from_string(unicode(course_id)))
+            else:
+                # a role without a course_id is an org-wide role
+                orgs.add(org)
+        listings = listings.filter(Q(course_key__in=course_keys) | Q(org__in=orgs))
+
+    courses = [listing.to_summary() for listing in listings]
+
+    # courses written outside of Studio (e.g. by the import command, or XML courses) may not have
+    # been indexed yet, so list those of the user's role courses which are missing from the index
+    # from the modulestore, and index them for next time
+    missing_course_keys = course_keys - set(listing.course_key for listing in listings)
+    if missing_course_keys:
+        for summary in modulestore().get_course_summaries(missing_course_keys).itervalues():
+            CourseListing.update_for_course(summary)
+            courses.append(summary)
+    return courses, _accessible_in_process_course_actions(request)
 
 
 def _accessible_courses_list_from_groups(request):
@@ -486,6 +530,10 @@ def get_courses_accessible_to_user(request):
     Try to get all courses by first reversing django groups and fallback to old method if it fails
     Note: overhead of pymongo reads will increase if getting courses from django groups fails
     """
+    if settings.FEATURES.get('ENABLE_COURSE_LISTING_INDEX', False):
+        # the index lists the courses of every user, including global staff, without reading the modulestore
+        return _accessible_courses_list_from_index(request)
+
     if GlobalStaff().has_user(request.user):
         # user has global access so no need to get courses from django groups
         courses, in_process_course_actions = _accessible_courses_list(request)
@@ -669,6 +717,8 @@ def create_new_course_in_store(store, user, org, number, run, fields):
 
     # Initialize permissions for user in the new course
     initialize_permissions(new_course.id, user)
+
+    CourseListing.update_for_course(new_course)
     return new_course
 
 
@@ -1078,6 +1128,8 @@ def advanced_settings_handler(request, course_key_string):
                     )
 
                     if is_valid:
+                        # the display name, org and number of the course may have changed
+                        CourseListing.update_for_course(course_module)
                         return JsonResponse(updated_data)
                     else:
                         return JsonResponseBadRequest(errors)
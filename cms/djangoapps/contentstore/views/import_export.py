@@ -6,13 +6,11 @@ import logging
 import os
 import re
 import shutil
-import tarfile
 from path import path
-from tempfile import mkdtemp
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.exceptions import SuspiciousOperation, PermissionDenied
+from django.core.exceptions import PermissionDenied
 from django.core.files.temp import NamedTemporaryFile
 from django.core.servers.basehttp import FileWrapper
 from django.http import HttpResponse, HttpResponseNotFound
@@ -25,16 +23,17 @@ from xmodule.contentstore.django import contentstore
 from xmodule.exceptions import SerializationError
 from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import CourseKey
-from xmodule.modulestore.xml_importer import import_from_xml
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_tar_file
 
 from student.auth import has_course_author_access
 
-from extract_tar import safetar_extractall
 from util.json_request import JsonResponse
 from util.views import ensure_valid_course_key
 
+from contentstore.tasks import import_olx
 from contentstore.utils import reverse_course_url, reverse_usage_url
+from course_action_state.managers import CourseActionStateItemNotFoundError
+from course_action_state.models import CourseImportState
 
 
 __all__ = ['import_handler', 'import_status_handler', 'export_handler']
@@ -77,8 +76,7 @@ def import_handler(request, course_key_string):
                 course_dir = data_root / course_subdir
                 filename = request.FILES['course-data'].name
 
-                # Use sessions to keep info about import progress
-                session_status = request.session.setdefault("import_status", {})
+                # Use sessions to keep info about the progress of the upload
                 key = unicode(course_key) + filename
                 _save_request_status(request, key, 0)
                 if not filename.endswith('.tar.gz'):
@@ -169,109 +167,15 @@ def import_handler(request, course_key_string):
                     status=400
                 )
 
-            # try-finally block for proper clean up after receiving last chunk.
-            try:
-                # This was the last chunk.
-                log.info("Course import {0}: Upload complete".format(course_key))
-                _save_request_status(request, key, 1)
-
-                tar_file = tarfile.open(temp_filepath)
-                try:
-                    safetar_extractall(tar_file, (course_dir + '/').encode('utf-8'))
-                except SuspiciousOperation as exc:
-                    _save_request_status(request, key, -1)
-                    return JsonResponse(
-                        {
-                            'ErrMsg': 'Unsafe tar file. Aborting import.',
-                            'SuspiciousFileOperationMsg': exc.args[0],
-                            'Stage': -1
-                        },
-                        status=400
-                    )
-                finally:
-                    tar_file.close()
-
-                log.info("Course import {0}: Uploaded file extracted".format(course_key))
-                _save_request_status(request, key, 2)
-
-                # find the 'course.xml' file
-                def get_all_files(directory):
-                    """
-                    For each file in the directory, yield a 2-tuple of (file-name,
-                    directory-path)
-                    """
-                    for dirpath, _dirnames, filenames in os.walk(directory):
-                        for filename in filenames:
-                            yield (filename, dirpath)
-
-                def get_dir_for_fname(directory, filename):
-                    """
-                    Returns the dirpath for the first file found in the directory
-                    with the given name.  If there is no file in the directory with
-                    the specified name, return None.
-                    """
-                    for fname, dirpath in get_all_files(directory):
-                        if fname == filename:
-                            return dirpath
-                    return None
-
-                fname = "course.xml"
-                dirpath = get_dir_for_fname(course_dir, fname)
-                if not dirpath:
-                    _save_request_status(request, key, -2)
-                    return JsonResponse(
-                        {
-
-                            'ErrMsg': _('Could not find the course.xml file in the package.'),
-                            'Stage': -2
-                        },
-                        status=415
-                    )
-
-                dirpath = os.path.relpath(dirpath, data_root)
-                logging.debug('found course.xml at {0}'.format(dirpath))
-
-                log.info("Course import {0}: Extracted file verified".format(course_key))
-                _save_request_status(request, key, 3)
-
-                course_items = import_from_xml(
-                    modulestore(),
-                    request.user.id,
-                    settings.GITHUB_REPO_ROOT,
-                    [dirpath],
-                    load_error_modules=False,
-                    static_content_store=contentstore(),
-                    target_course_id=course_key,
-                )
-
-                new_location = course_items[0].location
-                logging.debug('new course at {0}'.format(new_location))
+            # This was the last chunk: hand the uploaded file over to a celery task,
+            # which extracts, verifies and imports it while the client polls
+            # import_status_handler for its progress.
+            log.info("Course import {0}: Upload complete".format(course_key))
+            import_state = CourseImportState.objects.initiated(course_key, request.user, filename)
+            _save_request_status(request, key, import_state.import_status)
+            import_olx.delay(request.user.id, unicode(course_key), unicode(temp_filepath), filename)
 
-                log.info("Course import {0}: Course import successful".format(course_key))
-                _save_request_status(request, key, 4)
-
-            # Send errors to client with stage at which error occurred.
-            except Exception as exception:   # pylint: disable=broad-except
-                log.exception(
-                    "error importing course"
-                )
-                return JsonResponse(
-                    {
-                        'ErrMsg': str(exception),
-                        'Stage': -session_status[key]
-                    },
-                    status=400
-                )
-
-            finally:
-                if course_dir.isdir():
-                    shutil.rmtree(course_dir)
-                    log.info("Course import {0}: Temp data cleared".format(course_key))
-                # set failed stage number with negative sign in case of unsuccessful import
-                if session_status[key] != 4:
-                    _save_request_status(request, key, -abs(session_status[key]))
-
-            return JsonResponse({'Status': 'OK'})
+            return JsonResponse({'ImportStatus': import_state.import_status})
     elif request.method == 'GET':  # assume html
         course_module = modulestore().get_course(course_key)
         return render_to_response('import.html', {
@@ -302,7 +206,8 @@ def _save_request_status(request, key, status):
 @ensure_valid_course_key
 def import_status_handler(request, course_key_string, filename=None):
     """
-    Returns an integer corresponding to the status of a file import. These are:
+    Returns an integer corresponding to the status of a file import, along
+    with a message explaining why the import failed, if it did. The statuses are:
 
         -X : Import unsuccessful due to some error with X as stage [0-3]
         0 : No status info found (import done or upload still in progress)
@@ -311,6 +216,9 @@ def import_status_handler(request, course_key_string, filename=None):
         3 : Importing to mongo
         4 : Import successful
 
+    The upload is tracked in the session of the uploading user, while the
+    stages after it are tracked in the CourseImportState of the course, which
+    is updated by the import_olx task.
     """
     course_key = CourseKey.from_string(course_key_string)
     if not has_course_author_access(request.user, course_key):
@@ -320,9 +228,18 @@ def import_status_handler(request, course_key_string, filename=None):
         session_status = request.session["import_status"]
         status = session_status[course_key_string + filename]
     except KeyError:
-        status = 0
+        status = None
 
-    return JsonResponse({"ImportStatus": status})
+    message = ""
+    if status is None or status >= CourseImportState.objects.Stage.UNPACKING:
+        try:
+            import_state = CourseImportState.objects.find_first(course_key=course_key, filename=filename)
+            status = import_state.import_status
+            message = import_state.message
+        except CourseActionStateItemNotFoundError:
+            status = 0
+
+    return JsonResponse({"ImportStatus": status, "Message": message})
 
 
 # pylint: disable=unused-argument
@@ -358,14 +275,11 @@ def export_handler(request, course_key_string):
     if 'application/x-tgz' in requested_format:
         name = course_module.url_name
         export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-        root_dir = path(mkdtemp())
 
         try:
-            export_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
             logging.debug(u'tar file being generated at {0}'.format(export_file.name))
-            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-                tar_file.add(root_dir / name, arcname=name)
+            export_to_tar_file(modulestore(), contentstore(), course_module.id, export_file, name)
+            export_file.seek(0)
         except SerializationError as exc:
             log.exception(u'There was an error exporting course %s', course_module.id)
             unit = None
@@ -403,8 +317,6 @@ def export_handler(request, course_key_string):
                 'course_home_url': reverse_course_url("course_handler", course_key),
                 'export_url': export_url
             })
-        finally:
-            shutil.rmtree(root_dir / name)
 
         wrapper = FileWrapper(export_file)
         response = HttpResponse(wrapper, content_type='application/x-tgz')
@@ -44,6 +44,7 @@ from contentstore.utils import find_release_date_source, find_staff_lock_source,
 from contentstore.views.helpers import is_unit, xblock_studio_url, xblock_primary_child_category, \
     xblock_type_display_name, get_parent_xblock
 from contentstore.views.preview import get_preview_fragment
+from contentstore.models import CourseListing
 from edxmako.shortcuts import render_to_string
 from models.settings.course_grading import CourseGradingModel
 from cms.lib.xblock.runtime import handler_url, local_resource_url
@@ -498,6 +499,10 @@ def _save_xblock(user, xblock, data=None, children_strings=None, metadata=None,
                 static_tab['name'] = xblock.display_name
                 store.update_item(course, user.id)
 
+        # the course listing records the display name of the course
+        if xblock.location.category == 'course':
+            CourseListing.update_for_course(xblock)
+
         result = {
             'id': unicode(xblock.location),
             'data': data,
@@ -815,7 +820,8 @@ def _get_module_info(xblock, rewrite_static_links=True, include_ancestor_info=Fa
 
 
 def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=False, include_child_info=False,
-                       course_outline=False, include_children_predicate=NEVER, parent_xblock=None, graders=None):
+                       course_outline=False, include_children_predicate=NEVER, parent_xblock=None, graders=None,
+                       subtree_changes=None):
     """
     Creates the information needed for client-side XBlockInfo.
 
@@ -830,13 +836,19 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
 
     In addition, an optional include_children_predicate argument can be provided to define whether or
     not a particular xblock should have its children included.
+
+    Whether the xblock and its descendants have changes can be passed in as subtree_changes, as returned
+    by the modulestore's get_subtree_changes, rather than checking the whole subtree of every xblock.
     """
     is_library_block = isinstance(xblock.location, LibraryUsageLocator)
     is_xblock_unit = is_unit(xblock, parent_xblock)
     # this should not be calculated for Sections and Subsections on Unit page or for library blocks
     has_changes = None
     if (is_xblock_unit or course_outline) and not is_library_block:
-        has_changes = modulestore().has_changes(xblock)
+        if subtree_changes is not None and xblock.location in subtree_changes:
+            has_changes = subtree_changes[xblock.location]
+        else:
+            has_changes = modulestore().has_changes(xblock)
 
     if graders is None:
         if not is_library_block:
@@ -855,6 +867,7 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
             course_outline,
             graders,
             include_children_predicate=include_children_predicate,
+            subtree_changes=subtree_changes,
         )
     else:
         child_info = None
@@ -1044,7 +1057,8 @@ def _create_xblock_ancestor_info(xblock, course_outline):
     }
 
 
-def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER):
+def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER,
+                              subtree_changes=None):
     """
     Returns information about the children of an xblock, as well as about the primary category
     of xblock expected as children.
@@ -1062,7 +1076,8 @@ def _create_xblock_child_info(xblock, course_outline, graders, include_children_
                 child, include_child_info=True, course_outline=course_outline,
                 include_children_predicate=include_children_predicate,
                 parent_xblock=xblock,
-                graders=graders
+                graders=graders,
+                subtree_changes=subtree_changes,
             ) for child in xblock.get_children()
         ]
     return child_info
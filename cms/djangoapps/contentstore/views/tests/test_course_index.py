@@ -4,6 +4,7 @@ Unit tests for getting the list of courses and the course outline.
 import json
 import lxml
 import datetime
+from mock import patch
 
 from contentstore.tests.utils import CourseTestCase
 from contentstore.utils import reverse_course_url, reverse_library_url, add_instructor
@@ -268,6 +269,23 @@ class TestCourseOutline(CourseTestCase):
         # Finally, validate the entire response for consistency
         self.assert_correct_json_response(json_response)
 
+    def test_json_response_has_changes(self):
+        """
+        Verify that whether each block has changes is found in a single pass over the course
+        rather than by checking the subtree of every block.
+        """
+        outline_url = reverse_course_url('course_handler', self.course.id)
+        with patch('xmodule.modulestore.mixed.MixedModuleStore.has_changes') as mock_has_changes:
+            resp = self.client.get(outline_url, HTTP_ACCEPT='application/json')
+        self.assertFalse(mock_has_changes.called)
+
+        json_response = json.loads(resp.content)
+        chapter_response = json_response['child_info']['children'][0]
+        vertical_response = chapter_response['child_info']['children'][0]['child_info']['children'][0]
+        store = modulestore()
+        self.assertEqual(chapter_response['has_changes'], store.has_changes(store.get_item(self.chapter.location)))
+        self.assertEqual(vertical_response['has_changes'], store.has_changes(store.get_item(self.vertical.location)))
+
     def assert_correct_json_response(self, json_response):
         """
         Asserts that the JSON response is syntactically consistent
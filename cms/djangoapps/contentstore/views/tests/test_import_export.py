@@ -82,7 +82,7 @@ class ImportTestCase(CourseTestCase):
                     "name": self.bad_tar,
                     "course-data": [btar]
                 })
-        self.assertEquals(resp.status_code, 415)
+        self.assertEquals(resp.status_code, 200)
         # Check that `import_status` returns the appropriate stage (i.e., the
         # stage at which import failed).
         resp_status = self.client.get(
@@ -92,8 +92,10 @@ class ImportTestCase(CourseTestCase):
                 kwargs={'filename': os.path.split(self.bad_tar)[1]}
             )
         )
+        status = json.loads(resp_status.content)
 
-        self.assertEquals(json.loads(resp_status.content)["ImportStatus"], -2)
+        self.assertEquals(status["ImportStatus"], -2)
+        self.assertIn("course.xml", status["Message"])
 
     def test_with_coursexml(self):
         """
@@ -213,7 +215,7 @@ class ImportTestCase(CourseTestCase):
         outside or directly in the working directory,
             'special files' (character device, block device or FIFOs),
 
-        all raise exceptions/400s.
+        all fail the import at the unpacking stage.
         """
 
         def try_tar(tarpath):
@@ -221,8 +223,17 @@ class ImportTestCase(CourseTestCase):
             with open(tarpath) as tar:
                 args = {"name": tarpath, "course-data": [tar]}
                 resp = self.client.post(self.url, args)
-            self.assertEquals(resp.status_code, 400)
-            self.assertTrue("SuspiciousFileOperation" in resp.content)
+            self.assertEquals(resp.status_code, 200)
+            resp_status = self.client.get(
+                reverse_course_url(
+                    'import_status_handler',
+                    self.course.id,
+                    kwargs={'filename': os.path.split(tarpath)[1]}
+                )
+            )
+            status = json.loads(resp_status.content)
+            self.assertEquals(status["ImportStatus"], -1)
+            self.assertIn("Unsafe tar file", status["Message"])
 
         try_tar(self._fifo_tar())
         try_tar(self._symlink_tar())
@@ -239,6 +239,11 @@ DATABASES = AUTH_TOKENS['DATABASES']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
+STATIC_CONTENT_SENDFILE_BACKEND = ENV_TOKENS.get('STATIC_CONTENT_SENDFILE_BACKEND', STATIC_CONTENT_SENDFILE_BACKEND)
+STATIC_CONTENT_SENDFILE_ROOT = ENV_TOKENS.get('STATIC_CONTENT_SENDFILE_ROOT', STATIC_CONTENT_SENDFILE_ROOT)
+STATIC_CONTENT_SENDFILE_URL = ENV_TOKENS.get('STATIC_CONTENT_SENDFILE_URL', STATIC_CONTENT_SENDFILE_URL)
+STATIC_URL_REWRITE_CACHE_SIZE = ENV_TOKENS.get('STATIC_URL_REWRITE_CACHE_SIZE', STATIC_URL_REWRITE_CACHE_SIZE)
+ENROLLMENT_AND_ROLE_CACHE_TIMEOUT = ENV_TOKENS.get('ENROLLMENT_AND_ROLE_CACHE_TIMEOUT', ENROLLMENT_AND_ROLE_CACHE_TIMEOUT)
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
 DATADOG.update(ENV_TOKENS.get("DATADOG", {}))
@@ -144,6 +144,11 @@ FEATURES = {
 
     # Deny access to no-staff for course creation
     'DISABLE_COURSE_CREATION': True,
+
+    # List the courses on the Studio home page from the CourseListing index rather
+    # than from the modulestore. Run the index_course_listings management command
+    # to build the index before turning this on.
+    'ENABLE_COURSE_LISTING_INDEX': False,
 }
 
 ENABLE_JASMINE = False
@@ -309,6 +314,15 @@ XBLOCK_SELECT_FUNCTION = prefer_xmodules
 ############################ Modulestore Configuration ################################
 MODULESTORE_BRANCH = 'draft-preferred'
 
+# Serve course assets from a local disk cache through the web server, rather than
+# streaming them through Django: 'nginx' sets X-Accel-Redirect to
+# STATIC_CONTENT_SENDFILE_URL (an `internal` location that serves
+# STATIC_CONTENT_SENDFILE_ROOT), 'apache' sets X-Sendfile (mod_xsendfile).
+# None streams assets through Django.
+STATIC_CONTENT_SENDFILE_BACKEND = None
+STATIC_CONTENT_SENDFILE_ROOT = ENV_ROOT / "static_content_cache"
+STATIC_CONTENT_SENDFILE_URL = '/static_content_cache/'
+
 ############################ DJANGO_BUILTINS ################################
 # Change DEBUG/TEMPLATE_DEBUG in your environment settings files, not here
 DEBUG = False
@@ -348,6 +362,10 @@ if not EDX_PLATFORM_REVISION:
 STATIC_URL = '/static/' + EDX_PLATFORM_REVISION + "/"
 STATIC_ROOT = ENV_ROOT / "staticfiles" / EDX_PLATFORM_REVISION
 
+# The total length of the blocks' contents that have had their /static/ urls rewritten
+# to keep, per process. 0 disables remembering static file and modulestore lookups too.
+STATIC_URL_REWRITE_CACHE_SIZE = 10 * 1024 * 1024
+
 STATICFILES_DIRS = [
     COMMON_ROOT / "static",
     PROJECT_ROOT / "static",
@@ -588,6 +606,12 @@ CELERY_QUEUES = {
 }
 
 
+############### Enrollments and course access roles ###############
+# How many seconds to keep snapshots of each user's enrollments and course
+# access roles in the cache, between requests. They are forgotten whenever
+# the user's enrollments or roles change. 0 disables it.
+ENROLLMENT_AND_ROLE_CACHE_TIMEOUT = 300
+
 ############################## Video ##########################################
 
 YOUTUBE = {
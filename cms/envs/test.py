@@ -74,6 +74,13 @@ STATICFILES_STORAGE = 'pipeline.storage.NonPackagingPipelineStorage'
 STATIC_URL = "/static/"
 PIPELINE_ENABLED = False
 
+# Tests mock out staticfiles_storage and the modulestore, so don't remember their lookups
+STATIC_URL_REWRITE_CACHE_SIZE = 0
+
+# Tests change enrollments and roles in ways that don't send signals (e.g. by
+# rolling back transactions), so don't keep them between requests
+ENROLLMENT_AND_ROLE_CACHE_TIMEOUT = 0
+
 TENDER_DOMAIN = "help.edge.edx.org"
 
 # Update module store settings per defaults for tests
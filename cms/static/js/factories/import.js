@@ -54,12 +54,10 @@ define([
                                 else {
                                     alert(gettext('Your import has failed.') + '\n\n' + errMsg);
                                 }
+                                CourseImport.stopGetStatus = true;
                                 chooseBtn.html(gettext('Choose new file')).show();
                                 bar.hide();
                             }
-                            CourseImport.stopGetStatus = true;
-                            chooseBtn.html(gettext('Choose new file')).show();
-                            bar.hide();
                         });
                     });
                 } else {
@@ -94,7 +92,6 @@ define([
             done: function(event, data){
                 bar.hide();
                 window.onbeforeunload = null;
-                CourseImport.displayFinishedImport();
             },
             start: function(event) {
                 window.onbeforeunload = function() {
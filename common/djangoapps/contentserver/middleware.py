@@ -3,7 +3,11 @@ Middleware to serve assets.
 """
 
 import logging
+import os
+import tempfile
+from uuid import uuid4
 
+from django.conf import settings
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden
 )
@@ -23,6 +27,14 @@ from xmodule.exceptions import NotFoundError
 
 log = logging.getLogger(__name__)
 
+# Headers that tell the web server which file to send, by sendfile backend.
+# nginx expects a URL of an `internal` location that serves
+# STATIC_CONTENT_SENDFILE_ROOT, apache (mod_xsendfile) expects a path.
+SENDFILE_HEADERS = {
+    'nginx': 'X-Accel-Redirect',
+    'apache': 'X-Sendfile',
+}
+
 
 class StaticContentServer(object):
     def process_request(self, request):
@@ -79,21 +91,38 @@ class StaticContentServer(object):
             # timestamp, so we can simply compare the strings
             last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
 
+            # The ETag is the digest of the content, so it is the same across servers and
+            # re-uploads of the same file. Content cached before digests were tracked has none.
+            content_digest = getattr(content, 'content_digest', None)
+            etag = '"{}"'.format(content_digest) if content_digest else None
+
             # see if the client has cached this content, if so then compare the
-            # timestamps, if they are the same then just return a 304 (Not Modified)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            # ETags, or the timestamps if the client sent no ETag; if they are the
+            # same then just return a 304 (Not Modified)
+            if etag is not None and 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag):
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
+            response = None
+            content_type = content.content_type
+            sendfile_backend = settings.STATIC_CONTENT_SENDFILE_BACKEND
+            if sendfile_backend and content_digest:
+                # Let the web server send the file, ranges included, from the local disk cache
+                response = sendfile_response(sendfile_backend, content, loc)
+
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
             # Request -> Range attribute structure: "Range: bytes=first-[last]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
-            response = None
-            if request.META.get('HTTP_RANGE'):
+            if response is None and request.META.get('HTTP_RANGE'):
                 # Data from cache (StaticContent) has no easy byte management, so we use the DB instead (StaticContentStream)
                 if type(content) == StaticContent:
                     content = AssetManager.find(loc, as_stream=True)
@@ -110,18 +139,17 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                        )
                     else:
-                        first, last = ranges[0]
+                        # Unsatisfiable ranges are ignored, unless none of them are satisfiable.
+                        ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
+                        if not ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        elif len(ranges) == 1:
+                            first, last = ranges[0]
                             response = HttpResponse(content.stream_data_in_range(first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
@@ -129,10 +157,9 @@ class StaticContentServer(object):
                             response['Content-Length'] = str(last - first + 1)
                             response.status_code = 206  # Partial Content
                         else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            response, content_type = multipart_byteranges_response(content, ranges)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
@@ -141,12 +168,130 @@ class StaticContentServer(object):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            response['Content-Type'] = content_type
             response['Last-Modified'] = last_modified_at_str
+            if etag is not None:
+                response['ETag'] = etag
 
             return response
 
 
+def etag_matches(header_value, etag):
+    """
+    Returns whether the If-None-Match header value `header_value` matches `etag`.
+    """
+    if header_value.strip() == '*':
+        return True
+    # Weak comparison is fine for If-None-Match
+    etags = [value.strip() for value in header_value.split(',')]
+    return etag in etags or 'W/' + etag in etags
+
+
+def multipart_byteranges_response(content, ranges):
+    """
+    Returns a 206 response with the given byte ranges of `content`, as a
+    multipart/byteranges message, and the Content-Type to send it with.
+
+    `ranges` is a list of satisfiable (first, last) tuples.
+    """
+    boundary = uuid4().hex
+    part_headers = [
+        (
+            '--{boundary}\r\n'
+            'Content-Type: {content_type}\r\n'
+            'Content-Range: bytes {first}-{last}/{length}\r\n'
+            '\r\n'
+        ).format(
+            boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length
+        )
+        for first, last in ranges
+    ]
+    closing = '--{boundary}--\r\n'.format(boundary=boundary)
+
+    def stream_parts():
+        """
+        Yields the parts of the message, streaming the data of each range.
+        """
+        for part_header, (first, last) in zip(part_headers, ranges):
+            yield part_header
+            for chunk in content.stream_data_in_range(first, last):
+                yield chunk
+            yield '\r\n'
+        yield closing
+
+    response = HttpResponse(stream_parts(), status=206)  # Partial Content
+    response['Content-Length'] = str(
+        sum(
+            len(part_header) + (last - first + 1) + len('\r\n')
+            for part_header, (first, last) in zip(part_headers, ranges)
+        ) + len(closing)
+    )
+    return response, 'multipart/byteranges; boundary={}'.format(boundary)
+
+
+def sendfile_path(content):
+    """
+    Returns the path of `content` in the local disk cache, relative to
+    STATIC_CONTENT_SENDFILE_ROOT, writing it there if it isn't yet.
+
+    Files are named after the digest of their data, so they never go stale,
+    and assets with the same data share a file. Nothing is ever removed from
+    the cache by the LMS; prune it by access time if disk space is a concern.
+    """
+    digest = content.content_digest
+    relative_path = os.path.join(digest[:2], digest)
+    full_path = os.path.join(settings.STATIC_CONTENT_SENDFILE_ROOT, relative_path)
+    if os.path.exists(full_path):
+        return relative_path
+
+    directory = os.path.dirname(full_path)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # Another process created it in the meantime
+            if not os.path.isdir(directory):
+                raise
+
+    # Write to a temporary file in the same directory, and rename it, so that the
+    # web server never sends a partially written file.
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            for chunk in content.stream_data():
+                temp_file.write(chunk)
+        os.rename(temp_path, full_path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return relative_path
+
+
+def sendfile_response(backend, content, loc):
+    """
+    Returns an empty response that tells the web server to send `content`
+    from the local disk cache, or None if that isn't possible.
+    """
+    if backend not in SENDFILE_HEADERS:
+        log.error(u"Unknown STATIC_CONTENT_SENDFILE_BACKEND: %s", backend)
+        return None
+
+    try:
+        relative_path = sendfile_path(content)
+    except (IOError, OSError):
+        log.exception(u"Cannot write content to the sendfile cache: %s", unicode(loc))
+        return None
+
+    if backend == 'nginx':
+        target = settings.STATIC_CONTENT_SENDFILE_URL + relative_path.replace(os.sep, '/')
+    else:
+        target = os.path.join(settings.STATIC_CONTENT_SENDFILE_ROOT, relative_path)
+
+    response = HttpResponse()
+    response[SENDFILE_HEADERS[backend]] = target
+    return response
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
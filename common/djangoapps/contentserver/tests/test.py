@@ -4,7 +4,10 @@ Tests for StaticContentServer
 import copy
 import ddt
 import logging
+import os
+import shutil
 import unittest
+from tempfile import mkdtemp
 from uuid import uuid4
 
 from django.conf import settings
@@ -145,7 +148,7 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges message.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
@@ -153,9 +156,83 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
             first=first_byte, last=last_byte)
         )
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        self.assertTrue(resp['Content-Type'].startswith('multipart/byteranges; boundary='))
+        boundary = resp['Content-Type'].split('boundary=')[1]
+
+        content = resp.content
+        self.assertEqual(resp['Content-Length'], str(len(content)))
+        self.assertTrue(content.endswith('--{}--\r\n'.format(boundary)))
+        parts = content.split('--{}'.format(boundary))[1:-1]
+        self.assertEqual(len(parts), 2)
+        self.assertIn('Content-Range: bytes {first}-{last}/{length}'.format(
+            first=first_byte, last=last_byte, length=self.length_unlocked), parts[0])
+        self.assertIn('Content-Range: bytes {first}-{last}/{length}'.format(
+            first=max(0, self.length_unlocked - 100), last=self.length_unlocked - 1, length=self.length_unlocked
+        ), parts[1])
+
+        full_content = self.client.get(self.url_unlocked).content
+        self.assertTrue(parts[0].endswith('\r\n\r\n' + full_content[first_byte:last_byte + 1] + '\r\n'))
+
+    def test_range_request_ignores_unsatisfiable_ranges(self):
+        """
+        Test that unsatisfiable ranges are ignored if another range is satisfiable.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-0, {first}-'.format(
+            first=self.length_unlocked)
+        )
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp['Content-Range'], 'bytes 0-0/{}'.format(self.length_unlocked))
+
+    def test_etag(self):
+        """
+        Test that the ETag is the digest of the content, and that a matching
+        If-None-Match gets a 304 (Not Modified).
+        """
+        resp = self.client.get(self.url_unlocked)
+        etag = '"{}"'.format(self.contentstore.get_attr(self.unlocked_asset, 'md5'))
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"other", {}'.format(etag))
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(resp.status_code, 200)
+
+    @ddt.data(
+        ('nginx', 'X-Accel-Redirect'),
+        ('apache', 'X-Sendfile'),
+    )
+    @ddt.unpack
+    def test_sendfile(self, backend, header):
+        """
+        Test that assets are written to the disk cache and sent by the web server.
+        """
+        sendfile_root = mkdtemp()
+        self.addCleanup(shutil.rmtree, sendfile_root)
+        digest = self.contentstore.get_attr(self.unlocked_asset, 'md5')
+
+        with override_settings(
+            STATIC_CONTENT_SENDFILE_BACKEND=backend,
+            STATIC_CONTENT_SENDFILE_ROOT=sendfile_root,
+            STATIC_CONTENT_SENDFILE_URL='/protected/',
+        ):
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-1, 3-4')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, '')
+        full_path = os.path.join(sendfile_root, digest[:2], digest)
+        if backend == 'nginx':
+            self.assertEqual(resp[header], '/protected/{}/{}'.format(digest[:2], digest))
+        else:
+            self.assertEqual(resp[header], full_path)
+        with open(full_path) as cached_file:
+            self.assertEqual(cached_file.read(), self.client.get(self.url_unlocked).content)
 
     @ddt.data(
         'bytes 0-',
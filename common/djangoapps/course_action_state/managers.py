@@ -147,6 +147,74 @@ class CourseRerunUIStateManager(CourseActionUIStateManager):
         )
 
 
+class CourseImportUIStateManager(CourseActionUIStateManager):
+    """
+    A concrete model Manager for the Import Action.
+    """
+    ACTION = "import"
+
+    class State(object):
+        """
+        An Enum class for maintaining the list of possible states for Imports.
+        """
+        IN_PROGRESS = "in_progress"
+        FAILED = "failed"
+        SUCCEEDED = "succeeded"
+
+    class Stage(object):
+        """
+        An Enum class for the stages of an import, numbered as they are shown on the import page.
+        """
+        UNPACKING = 1
+        VERIFYING = 2
+        UPDATING = 3
+        SUCCEEDED = 4
+
+    def initiated(self, course_key, user, filename):
+        """
+        To be called when the upload of the file to import into the given course has completed.
+        Returns the state of the import.
+        """
+        return self.update_state(
+            course_key=course_key,
+            new_state=self.State.IN_PROGRESS,
+            user=user,
+            allow_not_found=True,
+            filename=filename,
+            stage=self.Stage.UNPACKING,
+        )
+
+    def stage_started(self, course_key, stage):
+        """
+        To be called when an existing import into the given course starts the given stage.
+        """
+        self.update_state(
+            course_key=course_key,
+            new_state=self.State.IN_PROGRESS,
+            stage=stage,
+        )
+
+    def succeeded(self, course_key):
+        """
+        To be called when an existing import into the given course has successfully completed.
+        """
+        self.update_state(
+            course_key=course_key,
+            new_state=self.State.SUCCEEDED,
+            stage=self.Stage.SUCCEEDED,
+        )
+
+    def failed(self, course_key, message):
+        """
+        To be called when an existing import into the given course has failed, with a message for the user.
+        """
+        self.update_state(
+            course_key=course_key,
+            new_state=self.State.FAILED,
+            message=message[:1000],
+        )
+
+
 class CourseActionStateItemNotFoundError(Exception):
     """An exception class for errors specific to Course Action states."""
     pass
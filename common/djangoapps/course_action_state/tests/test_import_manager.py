@@ -0,0 +1,68 @@
+"""
+Tests specific to the CourseImportState Model and Manager.
+"""
+
+from django.test import TestCase
+from opaque_keys.edx.locations import CourseLocator
+from course_action_state.models import CourseImportState
+from course_action_state.managers import CourseImportUIStateManager
+from student.tests.factories import UserFactory
+
+
+class TestCourseImportStateManager(TestCase):
+    """
+    Test class for testing the CourseImportUIStateManager.
+    """
+    def setUp(self):
+        self.course_key = CourseLocator("test_org", "test_course_num", "test_run")
+        self.user = UserFactory()
+        self.filename = "course.tar.gz"
+
+    def verify_import_state(self, state, stage, import_status, message=""):
+        """
+        Gets the import state object for self.course_key and self.filename and
+        verifies its state, stage, status and message.
+        """
+        found_import = CourseImportState.objects.find_first(course_key=self.course_key, filename=self.filename)
+        self.assertEquals(found_import.state, state)
+        self.assertEquals(found_import.stage, stage)
+        self.assertEquals(found_import.import_status, import_status)
+        self.assertEquals(found_import.message, message)
+        return found_import
+
+    def test_import_successful(self):
+        import_state = CourseImportState.objects.initiated(self.course_key, self.user, self.filename)
+        self.assertEquals(import_state.created_user, self.user)
+        self.verify_import_state(
+            CourseImportUIStateManager.State.IN_PROGRESS, CourseImportUIStateManager.Stage.UNPACKING, 1
+        )
+
+        CourseImportState.objects.stage_started(self.course_key, CourseImportUIStateManager.Stage.VERIFYING)
+        self.verify_import_state(
+            CourseImportUIStateManager.State.IN_PROGRESS, CourseImportUIStateManager.Stage.VERIFYING, 2
+        )
+
+        CourseImportState.objects.succeeded(self.course_key)
+        self.verify_import_state(
+            CourseImportUIStateManager.State.SUCCEEDED, CourseImportUIStateManager.Stage.SUCCEEDED, 4
+        )
+
+    def test_import_failed(self):
+        CourseImportState.objects.initiated(self.course_key, self.user, self.filename)
+        CourseImportState.objects.stage_started(self.course_key, CourseImportUIStateManager.Stage.UPDATING)
+        CourseImportState.objects.failed(self.course_key, "x" * 2000)
+        self.verify_import_state(
+            CourseImportUIStateManager.State.FAILED, CourseImportUIStateManager.Stage.UPDATING, -3, "x" * 1000
+        )
+
+    def test_import_initiated_again(self):
+        CourseImportState.objects.initiated(self.course_key, self.user, self.filename)
+        CourseImportState.objects.failed(self.course_key, "failure")
+
+        # a new import of the course replaces the state of the previous one
+        self.filename = "other_course.tar.gz"
+        CourseImportState.objects.initiated(self.course_key, self.user, self.filename)
+        self.verify_import_state(
+            CourseImportUIStateManager.State.IN_PROGRESS, CourseImportUIStateManager.Stage.UNPACKING, 1
+        )
+        self.assertEquals(len(CourseImportState.objects.find_all(course_key=self.course_key)), 1)
@@ -1,5 +1,7 @@
 import threading
 
+from celery.signals import task_prerun
+
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
 
@@ -19,3 +21,13 @@ class RequestCache(object):
     def process_response(self, request, response):
         self.clear_request_cache()
         return response
+
+
+@task_prerun.connect
+def clear_request_cache_for_task(**kwargs):  # pylint: disable=unused-argument
+    """
+    Celery workers don't go through the middleware, so treat each task as a
+    request of its own, rather than letting the cache live as long as the
+    worker does.
+    """
+    RequestCache().clear_request_cache()
@@ -53,3 +53,14 @@ class MidcourseReverificationWindow(ValidateOnSaveMixin, models.Model):
             return cls.objects.get(course_id=course_id, start_date__lte=date, end_date__gte=date)
         except cls.DoesNotExist:
             return None
+
+    @classmethod
+    def get_windows(cls, course_ids, date):
+        """
+        Returns a dictionary mapping the ids of the courses among `course_ids` that
+        have a window open for the date to their window, found in a single query.
+        """
+        if not course_ids:
+            return {}
+        windows = cls.objects.filter(course_id__in=course_ids, start_date__lte=date, end_date__gte=date)
+        return {window.course_id: window for window in windows}
@@ -1,5 +1,8 @@
+import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
 
 from staticfiles.storage import staticfiles_storage
 from staticfiles import finders
@@ -11,6 +14,16 @@ from xmodule.contentstore.content import StaticContent
 
 log = logging.getLogger(__name__)
 
+# Per-process indexes used by replace_static_urls, when STATIC_URL_REWRITE_CACHE_SIZE is set.
+# The collected static files and the modulestore serving each course don't change while
+# the process runs, so lookups of either are remembered.
+_STATICFILES_URLS = {}  # path -> its url in staticfiles_storage, or None if it isn't there
+_MODULESTORE_TYPES = {}  # course_id -> type of the modulestore the course is in
+# The most recently rewritten texts, keyed by course and a digest of the text, and their total length
+_REWRITTEN_TEXTS = OrderedDict()
+_REWRITTEN_TEXTS_SIZE = 0
+_REWRITTEN_TEXTS_LOCK = threading.Lock()
+
 
 def _url_replace_regex(prefix):
     """
@@ -43,6 +56,61 @@ def try_staticfiles_lookup(path):
     return url
 
 
+def _rewrite_cache_size():
+    """
+    Return the total length of the rewritten texts that replace_static_urls keeps,
+    0 meaning that it doesn't remember anything between calls.
+
+    Nothing is remembered in DEBUG mode, where static files change on disk.
+    """
+    if settings.DEBUG:
+        return 0
+    return getattr(settings, 'STATIC_URL_REWRITE_CACHE_SIZE', 0)
+
+
+def clear_static_url_caches():
+    """
+    Forget the static file urls, modulestore types, and rewritten texts
+    remembered by replace_static_urls.
+    """
+    global _REWRITTEN_TEXTS_SIZE  # pylint: disable=global-statement
+    _STATICFILES_URLS.clear()
+    _MODULESTORE_TYPES.clear()
+    with _REWRITTEN_TEXTS_LOCK:
+        _REWRITTEN_TEXTS.clear()
+        _REWRITTEN_TEXTS_SIZE = 0
+
+
+def _staticfiles_url(path):
+    """
+    Return the url of `path` in staticfiles_storage, or None if it isn't there.
+
+    Errors of the storage are raised, and the lookup is tried again next time.
+    """
+    caching = _rewrite_cache_size() > 0
+    if caching and path in _STATICFILES_URLS:
+        return _STATICFILES_URLS[path]
+
+    url = staticfiles_storage.url(path) if staticfiles_storage.exists(path) else None
+    if caching:
+        _STATICFILES_URLS[path] = url
+    return url
+
+
+def _modulestore_type(course_id):
+    """
+    Return the type of the modulestore that the course is in.
+    """
+    caching = _rewrite_cache_size() > 0
+    if caching and course_id in _MODULESTORE_TYPES:
+        return _MODULESTORE_TYPES[course_id]
+
+    store_type = modulestore().get_modulestore_type(course_id)
+    if caching:
+        _MODULESTORE_TYPES[course_id] = store_type
+    return store_type
+
+
 def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
     """
     This will replace a link to another piece of courseware to a 'jump_to'
@@ -147,6 +215,7 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
+    global _REWRITTEN_TEXTS_SIZE  # pylint: disable=global-statement
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -163,20 +232,18 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) \
                 and course_id \
-                and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
+                and _modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
-            exists_in_staticfiles_storage = False
+            url = None
             try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                url = _staticfiles_url(rest)
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
                     rest, str(err)))
 
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
+            if url is None:
                 # if not, then assume it's courseware specific content and then look in the
                 # Mongo-backed database
                 url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
@@ -185,9 +252,8 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             course_path = "/".join((static_asset_path or data_directory, rest))
 
             try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
+                url = _staticfiles_url(rest)
+                if url is None:
                     url = staticfiles_storage.url(course_path)
             # And if that fails, assume that it's course content, and add manually data directory
             except Exception as err:
@@ -197,4 +263,27 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
 
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    cache_size = _rewrite_cache_size()
+    if not cache_size:
+        return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+    # Blocks are rendered over and over with the same content, so remember what it was rewritten to
+    digest = hashlib.md5(text.encode('utf-8') if isinstance(text, unicode) else text).hexdigest()
+    key = (course_id, data_directory, static_asset_path, digest)
+    with _REWRITTEN_TEXTS_LOCK:
+        rewritten = _REWRITTEN_TEXTS.pop(key, None)
+        if rewritten is not None:
+            _REWRITTEN_TEXTS[key] = rewritten
+            return rewritten
+
+    rewritten = process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    if len(rewritten) > cache_size:
+        return rewritten
+    with _REWRITTEN_TEXTS_LOCK:
+        if key not in _REWRITTEN_TEXTS:
+            _REWRITTEN_TEXTS[key] = rewritten
+            _REWRITTEN_TEXTS_SIZE += len(rewritten)
+        while _REWRITTEN_TEXTS_SIZE > cache_size:
+            __, evicted = _REWRITTEN_TEXTS.popitem(last=False)
+            _REWRITTEN_TEXTS_SIZE -= len(evicted)
+    return rewritten
@@ -1,7 +1,10 @@
 import re
 
+from django.test import TestCase
+from django.test.utils import override_settings
 from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
 from static_replace import (
+    clear_static_url_caches,
     replace_static_urls,
     replace_course_urls,
     _url_replace_regex,
@@ -161,3 +164,97 @@ def test_regex():
     for s in no:
         print 'Should not match: {0!r}'.format(s)
         assert_false(re.match(regex, s))
+
+
+@override_settings(STATIC_URL_REWRITE_CACHE_SIZE=70)
+@patch('static_replace.staticfiles_storage')
+@patch('static_replace.modulestore')
+class RewriteCacheTest(TestCase):
+    """
+    Test that replace_static_urls remembers its lookups and results.
+    """
+    def setUp(self):
+        super(RewriteCacheTest, self).setUp()
+        clear_static_url_caches()
+        self.addCleanup(clear_static_url_caches)
+
+    def test_lookups_are_remembered(self, mock_modulestore, mock_storage):
+        mock_modulestore.return_value = Mock(MongoModuleStore)
+        mock_storage.exists.side_effect = lambda path: path == 'js/vendor.js'
+        mock_storage.url.return_value = '/static/js/vendor.abc123.js'
+
+        for text in ('<img src="/static/file.png"/> <script src="/static/js/vendor.js"/>',
+                     '<script src="/static/js/vendor.js"/> <img src="/static/file.png"/>'):
+            assert_equals(
+                text.replace('/static/file.png', '/c4x/org/course/asset/file.png').replace(
+                    '/static/js/vendor.js', '/static/js/vendor.abc123.js'
+                ),
+                replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY)
+            )
+
+        assert_equals(mock_storage.exists.call_count, 2)
+        assert_equals(mock_storage.url.call_count, 1)
+        assert_equals(mock_modulestore.return_value.get_modulestore_type.call_count, 1)
+
+    def test_rewritten_texts_are_remembered(self, mock_modulestore, mock_storage):
+        mock_modulestore.return_value = Mock(MongoModuleStore)
+        mock_storage.exists.return_value = False
+        texts = ['"/static/file{}.png"'.format(index) for index in range(3)]
+
+        for text in texts + texts[1:]:
+            replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY)
+        assert_equals(mock_storage.exists.call_count, 3)
+
+        # Only the 2 most recently used texts fit, but the lookups are still remembered
+        with patch('static_replace.process_static_urls') as mock_process:
+            replace_static_urls(texts[2], DATA_DIRECTORY, COURSE_KEY)
+            assert_false(mock_process.called)
+            replace_static_urls(texts[0], DATA_DIRECTORY, COURSE_KEY)
+            assert_true(mock_process.called)
+
+    def test_rewritten_texts_are_evicted_by_size(self, mock_modulestore, mock_storage):
+        mock_modulestore.return_value = Mock(MongoModuleStore)
+        mock_storage.exists.return_value = False
+        small_texts = ['"/static/{}.png"'.format(index) for index in range(2)]
+        large_text = '"/static/{}.png"'.format('l' * 22)
+
+        for text in small_texts + [large_text]:
+            replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY)
+
+        # the large text only fits once both of the small ones are evicted
+        with patch('static_replace.process_static_urls') as mock_process:
+            replace_static_urls(large_text, DATA_DIRECTORY, COURSE_KEY)
+            assert_false(mock_process.called)
+            for text in small_texts:
+                replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY)
+            assert_equals(mock_process.call_count, 2)
+
+    def test_texts_too_large_are_not_remembered(self, mock_modulestore, mock_storage):
+        mock_modulestore.return_value = Mock(MongoModuleStore)
+        mock_storage.exists.return_value = False
+        text = '"/static/{}.png"'.format('x' * 70)
+
+        replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY)
+        with patch('static_replace.process_static_urls', return_value=text) as mock_process:
+            replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY)
+            assert_true(mock_process.called)
+
+    def test_results_depend_on_course(self, mock_modulestore, mock_storage):
+        mock_modulestore.return_value = Mock(MongoModuleStore)
+        mock_storage.exists.return_value = False
+        other_course_key = SlashSeparatedCourseKey('org', 'other', 'run')
+
+        assert_equals('"/c4x/org/course/asset/file.png"', replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY))
+        assert_equals(
+            '"/c4x/org/other/asset/file.png"', replace_static_urls(STATIC_SOURCE, course_id=other_course_key)
+        )
+
+    @override_settings(DEBUG=True)
+    def test_nothing_remembered_in_debug(self, mock_modulestore, mock_storage):
+        mock_modulestore.return_value = Mock(MongoModuleStore)
+        mock_storage.exists.return_value = False
+
+        with patch('static_replace.finders.find', return_value=None):
+            replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, COURSE_KEY)
+            replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, COURSE_KEY)
+        assert_equals(mock_storage.exists.call_count, 2)
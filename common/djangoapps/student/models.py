@@ -12,9 +12,11 @@ file and check it in at the same time as your model changes. To do that,
 """
 from datetime import datetime, timedelta
 import hashlib
+import itertools
 import json
 import logging
 from pytz import UTC
+import threading
 import uuid
 from collections import defaultdict
 import dogstats_wrapper as dog_stats_api
@@ -26,8 +28,11 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.core.cache import cache
 from django.db import models, IntegrityError, transaction
 from django.db.models import Count
+from django.db.models.signals import post_save, post_delete
+from django.core.signals import request_finished
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
@@ -42,6 +47,8 @@ from xmodule.modulestore import Location
 from opaque_keys import InvalidKeyError
 
 import lms.lib.comment_client as cc
+from celery.signals import task_postrun
+from request_cache.middleware import RequestCache
 from util.query import use_read_replica_if_available
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -672,6 +679,74 @@ class LoginFailures(models.Model):
             return
 
 
+# Numbers the changes of the rows summarized by user snapshots, so that the
+# snapshots kept by user objects can tell whether they are out of date
+_SNAPSHOT_CHANGES = itertools.count(1)
+
+# The cache keys of the snapshots forgotten inside a transaction which hadn't
+# been committed yet, to forget again once the request or task is over
+_uncommitted_snapshot_changes = threading.local()
+
+
+def user_snapshot(name, user, load):
+    """
+    Return `load(user)`, a picklable summary of some of the user's rows (e.g.
+    all of their enrollments), loading it at most once per user object, like
+    a request's user.
+
+    It's also kept in the django cache for
+    settings.ENROLLMENT_AND_ROLE_CACHE_TIMEOUT seconds. Receivers of changes
+    to the rows must call `forget_user_snapshot` with the same `name`.
+    """
+    # The snapshots of user objects that were loaded before the last change of
+    # the user's rows in this request are out of date
+    last_change = RequestCache.get_request_cache().data.get('student.user_snapshot_changes', {}).get((name, user.id))
+    snapshots = user.__dict__.setdefault('_snapshots', {})
+    if name in snapshots and snapshots[name][0] == last_change:
+        return snapshots[name][1]
+
+    timeout = getattr(settings, 'ENROLLMENT_AND_ROLE_CACHE_TIMEOUT', 0)
+    cache_key = u'student.user_snapshot.{}.{}'.format(name, user.id)
+    snapshot = cache.get(cache_key) if timeout else None
+    if snapshot is None:
+        snapshot = load(user)
+        if timeout:
+            cache.set(cache_key, snapshot, timeout)
+    snapshots[name] = (last_change, snapshot)
+    return snapshot
+
+
+def forget_user_snapshot(name, user_id):
+    """
+    Forget the snapshot `name` of the user with id `user_id`, in the user
+    objects of this request and in the django cache.
+    """
+    changes = RequestCache.get_request_cache().data.setdefault('student.user_snapshot_changes', {})
+    changes[(name, user_id)] = next(_SNAPSHOT_CHANGES)
+    cache_key = u'student.user_snapshot.{}.{}'.format(name, user_id)
+    cache.delete(cache_key)
+    if transaction.is_managed():
+        # Until the change is committed, other requests still load the old
+        # rows, and may cache them again
+        if not hasattr(_uncommitted_snapshot_changes, 'cache_keys'):
+            _uncommitted_snapshot_changes.cache_keys = set()
+        _uncommitted_snapshot_changes.cache_keys.add(cache_key)
+
+
+@receiver(request_finished)
+@task_postrun.connect
+def forget_uncommitted_snapshots(**kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the snapshots which were forgotten before the transaction of the
+    request (see TransactionMiddleware) or task that changed them was
+    committed, now that it has been.
+    """
+    cache_keys = getattr(_uncommitted_snapshot_changes, 'cache_keys', None)
+    if cache_keys:
+        cache.delete_many(list(cache_keys))
+        cache_keys.clear()
+
+
 class CourseEnrollmentException(Exception):
     pass
 
@@ -1061,11 +1136,7 @@ class CourseEnrollment(models.Model):
 
         `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_key)
-            return record.is_active
-        except cls.DoesNotExist:
-            return False
+        return cls.enrollment_mode_for_user(user, course_key)[1] or False
 
     @classmethod
     def is_enrolled_by_partial(cls, user, course_id_partial):
@@ -1086,14 +1157,10 @@ class CourseEnrollment(models.Model):
         assert not course_id_partial.run  # None or empty string
         course_key = SlashSeparatedCourseKey(course_id_partial.org, course_id_partial.course, '')
         querystring = unicode(course_key.to_deprecated_string())
-        try:
-            return CourseEnrollment.objects.filter(
-                user=user,
-                course_id__startswith=querystring,
-                is_active=1
-            ).exists()
-        except cls.DoesNotExist:
-            return False
+        return any(
+            course_id.startswith(querystring) and is_active
+            for course_id, (__, is_active) in cls._enrollments_snapshot(user).iteritems()
+        )
 
     @classmethod
     def enrollment_mode_for_user(cls, user, course_id):
@@ -1107,11 +1174,22 @@ class CourseEnrollment(models.Model):
             and is_active is whether the enrollment is active.
         Returns (None, None) if the courseenrollment record does not exist.
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_id)
-            return (record.mode, record.is_active)
-        except cls.DoesNotExist:
-            return (None, None)
+        course_id = cls._meta.get_field('course_id').get_prep_value(course_id)
+        return cls._enrollments_snapshot(user).get(course_id, (None, None))
+
+    @classmethod
+    def _enrollments_snapshot(cls, user):
+        """
+        Returns a dict mapping the course ids (as stored) of all of the user's
+        enrollments, active or not, to their (mode, is_active).
+        """
+        if user.id is None:
+            return {}
+        return user_snapshot('enrollments', user, lambda user: {
+            unicode(course_id): (mode, is_active)
+            for course_id, mode, is_active
+            in cls.objects.filter(user_id=user.id).values_list('course_id', 'mode', 'is_active')
+        })
 
     @classmethod
     def enrollments_for_user(cls, user):
@@ -1267,6 +1345,24 @@ class CourseAccessRole(models.Model):
         return "[CourseAccessRole] user: {}   role: {}   org: {}   course: {}".format(self.user.username, self.role, self.org, self.course_id)
 
 
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def forget_enrollments_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the snapshot of the enrollments of the user whose enrollment changed.
+    """
+    forget_user_snapshot('enrollments', instance.user_id)
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+def forget_roles_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the snapshot of the roles of the user whose role changed.
+    """
+    forget_user_snapshot('roles', instance.user_id)
+
+
 #### Helper methods for use from python manage.py shell and other classes.
 
 
@@ -8,7 +8,7 @@ from abc import ABCMeta, abstractmethod
 from django.contrib.auth.models import User
 import logging
 
-from student.models import CourseAccessRole
+from student.models import CourseAccessRole, user_snapshot
 from xmodule_django.models import CourseKeyField
 
 
@@ -36,23 +36,28 @@ def register_access_role(cls):
 
 class RoleCache(object):
     """
-    A cache of the CourseAccessRoles held by a particular user
+    A cache of the CourseAccessRoles held by a particular user, shared by all of the
+    RoleCaches of the user in a request (see student.models.user_snapshot)
     """
     def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
-        )
+        self._user = user
+
+    @property
+    def _roles(self):
+        """
+        The (role, org, course_id) of all of the user's CourseAccessRoles
+        """
+        return user_snapshot('roles', self._user, lambda user: frozenset(
+            (role, org, unicode(course_id))
+            for role, org, course_id in CourseAccessRole.objects.filter(user=user).values_list('role', 'org', 'course_id')
+        ))
 
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        course_id = CourseAccessRole._meta.get_field('course_id').get_prep_value(course_id)
+        return (role, org, course_id) in self._roles
 
 
 class AccessRole(object):
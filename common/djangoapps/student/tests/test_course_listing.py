@@ -3,7 +3,9 @@ Unit tests for getting the list of courses for a user through iterating all cour
 by reversing group name formats.
 """
 import mock
+from datetime import datetime
 from mock import patch, Mock
+from pytz import UTC
 
 from student.tests.factories import UserFactory
 from student.roles import GlobalStaff
@@ -13,7 +15,9 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.modulestore.django import modulestore
 from xmodule.error_module import ErrorDescriptor
+from django.core.urlresolvers import reverse
 from django.test.client import Client
+from courseware.access import has_access
 from student.models import CourseEnrollment
 from student.views import get_course_enrollment_pairs
 from opaque_keys.edx.keys import CourseKey
@@ -93,9 +97,10 @@ class TestCourseListing(ModuleStoreTestCase):
         with patch('xmodule.modulestore.mongo.base.MongoKeyValueStore', Mock(side_effect=Exception)):
             self.assertIsInstance(modulestore().get_course(course_key), ErrorDescriptor)
 
-            # get courses through iterating all courses
+            # the course is listed from its summary, but fails to load
             courses_list = list(get_course_enrollment_pairs(self.student, None, []))
-            self.assertEqual(courses_list, [])
+            self.assertEqual([course.id for course, __ in courses_list], [course_key])
+            self.assertFalse(courses_list[0][0].is_loadable())
 
     def test_course_listing_errored_deleted_courses(self):
         """
@@ -125,10 +130,81 @@ class TestCourseListing(ModuleStoreTestCase):
             }},
         )
 
-        courses_list = list(get_course_enrollment_pairs(self.student, None, []))
+        courses_list = [
+            (course, enrollment) for course, enrollment in get_course_enrollment_pairs(self.student, None, [])
+            if course.is_loadable()
+        ]
         self.assertEqual(len(courses_list), 1, courses_list)
         self.assertEqual(courses_list[0][0].id, good_location)
 
+    def test_filtered_out_courses_are_not_loaded(self):
+        """
+        Test that only the courses which are listed are loaded
+        """
+        self._create_course_with_access_groups(SlashSeparatedCourseKey('Org1', 'Course1', 'Run1'))
+        self._create_course_with_access_groups(SlashSeparatedCourseKey('Org2', 'Course1', 'Run1'))
+
+        store = modulestore()
+        with patch.object(store, 'get_course', wraps=store.get_course) as mock_get_course:
+            courses_list = list(get_course_enrollment_pairs(self.student, None, ['Org2']))
+            self.assertEqual([course.id.org for course, __ in courses_list], ['Org1'])
+            self.assertTrue(courses_list[0][0].display_name_with_default)
+            self.assertEqual(mock_get_course.call_count, 0)
+
+            # the fields that the access checks read are summarized
+            self.assertFalse(courses_list[0][0].pre_requisite_courses)
+            self.assertFalse(courses_list[0][0].invitation_only)
+            self.assertEqual(mock_get_course.call_count, 0)
+
+            # the course is loaded, once, for the attributes which aren't summarized
+            self.assertTrue(courses_list[0][0].tabs)
+            self.assertTrue(courses_list[0][0].grading_policy)
+            self.assertEqual(mock_get_course.call_count, 1)
+
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    @mock.patch.dict("django.conf.settings.FEATURES", {'DISABLE_START_DATES': False})
+    def test_access_checks_use_summaries(self):
+        """
+        Test that the courses are checked for access from their summaries, without loading them
+        """
+        started = datetime(2000, 1, 1, tzinfo=UTC)
+        self._create_course_with_access_groups(SlashSeparatedCourseKey('Org1', 'Course1', 'Run1'), {'start': started})
+        self._create_course_with_access_groups(
+            SlashSeparatedCourseKey('Org1', 'Course2', 'Run1'), {'start': started, 'visible_to_staff_only': True}
+        )
+        self._create_course_with_access_groups(
+            SlashSeparatedCourseKey('Org1', 'Course3', 'Run1'), {'start': datetime(2100, 1, 1, tzinfo=UTC)}
+        )
+
+        store = modulestore()
+        with patch.object(store, 'get_course', wraps=store.get_course) as mock_get_course:
+            courses_list = list(get_course_enrollment_pairs(self.student, None, []))
+            can_load = {
+                course.id.course: has_access(self.student, 'load', course.summary)
+                for course, __ in courses_list
+            }
+            self.assertEqual(can_load, {'Course1': True, 'Course2': False, 'Course3': False})
+            self.assertTrue(all(
+                has_access(self.teacher, 'load', course.summary) for course, __ in courses_list
+            ))
+            self.assertEqual(mock_get_course.call_count, 0)
+
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_dashboard_does_not_load_courses(self):
+        """
+        Test that the dashboard is rendered from the summaries of its courses
+        """
+        self._create_course_with_access_groups(SlashSeparatedCourseKey('Org1', 'Course1', 'Run1'))
+        self._create_course_with_access_groups(SlashSeparatedCourseKey('Org1', 'Course2', 'Run1'))
+        self.client.logout()
+        self.client.login(username=self.student.username, password='test')
+
+        store = modulestore()
+        with patch.object(store, 'get_course', wraps=store.get_course) as mock_get_course:
+            response = self.client.get(reverse('dashboard'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(mock_get_course.call_count, 0)
+
     @mock.patch.dict("django.conf.settings.FEATURES", {'ENABLE_PREREQUISITE_COURSES': True, 'MILESTONES_APP': True})
     def test_course_listing_has_pre_requisite_courses(self):
         """
@@ -2,6 +2,7 @@
 Tests of student.roles
 """
 import ddt
+from django.contrib.auth.models import User
 from django.test import TestCase
 
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
@@ -191,3 +192,17 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_roles_are_queried_once_per_user(self):
+        CourseStaffRole(self.IN_KEY).add_users(self.user)
+        with self.assertNumQueries(1):
+            self.assertTrue(CourseStaffRole(self.IN_KEY).has_user(self.user))
+            self.assertFalse(CourseInstructorRole(self.IN_KEY).has_user(self.user))
+            self.assertFalse(OrgStaffRole(self.IN_KEY.org).has_user(self.user))
+
+    def test_role_changes_are_noticed(self):
+        cache = RoleCache(self.user)
+        self.assertFalse(cache.has_role('staff', self.IN_KEY, 'edX'))
+        # Through another user object, so that the user's cached roles aren't deleted
+        CourseStaffRole(self.IN_KEY).add_users(User.objects.get(id=self.user.id))
+        self.assertTrue(cache.has_role('staff', self.IN_KEY, 'edX'))
@@ -13,6 +13,8 @@ import unittest
 from django.conf import settings
 from django.contrib.auth.models import User, AnonymousUser
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.core.signals import request_finished
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 from django.test.client import RequestFactory, Client
@@ -589,6 +591,51 @@ class EnrollInCourseTest(TestCase):
         CourseEnrollment.enroll(user, course_id, "honor")
         self.assert_enrollment_mode_change_event_was_emitted(user, course_id, "honor")
 
+    def test_enrollments_are_queried_once_per_user(self):
+        user = User.objects.create(username="snapshot", email="snapshot@fake.edx.org")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        other_course_id = SlashSeparatedCourseKey("edX", "Test102", "2013")
+        CourseEnrollment.enroll(user, course_id, "audit")
+
+        with self.assertNumQueries(1):
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+            self.assertFalse(CourseEnrollment.is_enrolled(user, other_course_id))
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_id), ("audit", True))
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, other_course_id), (None, None))
+            self.assertTrue(CourseEnrollment.is_enrolled_by_partial(user, SlashSeparatedCourseKey("edX", "Test101", None)))
+
+        # Changing an enrollment through another user object is noticed
+        CourseEnrollment.objects.get(user_id=user.id, course_id=course_id).deactivate()
+        self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+        self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_id), ("audit", False))
+
+    @override_settings(ENROLLMENT_AND_ROLE_CACHE_TIMEOUT=300)
+    def test_enrollments_are_cached_between_requests(self):
+        user = User.objects.create(username="snapshot", email="snapshot@fake.edx.org")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+
+        # The user object of another request finds the snapshot in the cache
+        with self.assertNumQueries(0):
+            self.assertFalse(CourseEnrollment.is_enrolled(User(id=user.id), course_id))
+
+        CourseEnrollment.enroll(user, course_id)
+        self.assertTrue(CourseEnrollment.is_enrolled(User(id=user.id), course_id))
+
+    @override_settings(ENROLLMENT_AND_ROLE_CACHE_TIMEOUT=300)
+    def test_enrollments_are_forgotten_after_commit(self):
+        user = User.objects.create(username="snapshot", email="snapshot@fake.edx.org")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        CourseEnrollment.enroll(user, course_id)
+
+        # A concurrent request caches the enrollments it read before the enrollment was committed
+        cache.set(u'student.user_snapshot.enrollments.{}'.format(user.id), {}, 300)
+        self.assertFalse(CourseEnrollment.is_enrolled(User(id=user.id), course_id))
+
+        # They're forgotten once the request which enrolled the user is over
+        request_finished.send(sender=self.__class__)
+        self.assertTrue(CourseEnrollment.is_enrolled(User(id=user.id), course_id))
+
 
 @override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
@@ -8,6 +8,7 @@ import uuid
 import time
 import json
 from collections import defaultdict
+from lazy import lazy
 from pytz import UTC
 
 from django.conf import settings
@@ -58,10 +59,12 @@ from student.models import (
 from student.forms import PasswordResetFormNoActive
 
 from verify_student.models import SoftwareSecurePhotoVerification, MidcourseReverificationWindow
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import (
+    CertificateStatuses, certificate_status_for_student, certificate_statuses_for_student
+)
 from dark_lang.models import DarkLangConfig
 
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, ModuleI18nService
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from opaque_keys.edx.locator import CourseLocator
@@ -105,7 +108,9 @@ from student.helpers import (
     auth_pipeline_urls, set_logged_in_cookie,
     check_verify_status_by_course
 )
+from xmodule.course_module import CourseSummary, course_start_datetime_text, course_end_datetime_text
 from xmodule.error_module import ErrorDescriptor
+from xmodule.modulestore.exceptions import ItemNotFoundError
 from shoppingcart.models import DonationConfiguration, CourseRegistrationCode
 from openedx.core.djangoapps.user_api.api import profile as profile_api
 
@@ -183,10 +188,12 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course):
+def cert_info(user, course, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
-    student and course.  Returns a dictionary with keys:
+    student and course.  The status of the student's certificate is looked up
+    unless it is given, as certificate_status_for_student returns it.  Returns a
+    dictionary with keys:
 
     'status': one of 'generating', 'ready', 'notpassing', 'processing', 'restricted'
     'show_download_url': bool
@@ -199,7 +206,9 @@ def cert_info(user, course):
     if not course.may_certify():
         return {}
 
-    return _cert_info(user, course, certificate_status_for_student(user, course.id))
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course.id)
+    return _cert_info(user, course, cert_status)
 
 
 def reverification_info(course_enrollment_pairs, user, statuses):
@@ -218,9 +227,15 @@ def reverification_info(course_enrollment_pairs, user, statuses):
             dict["must_reverify"] = []
             dict["must_reverify"] = [some information]
     """
+    # Look up the windows of all of the verified enrollments at once
+    windows = MidcourseReverificationWindow.get_windows(
+        [course.id for course, enrollment in course_enrollment_pairs if enrollment.mode == "verified"],
+        datetime.datetime.now(UTC)
+    )
+
     reverifications = defaultdict(list)
     for (course, enrollment) in course_enrollment_pairs:
-        info = single_course_reverification_info(user, course, enrollment)
+        info = _reverification_info_for_window(user, course, enrollment, windows.get(course.id))
         if info:
             reverifications[info.status].append(info)
 
@@ -247,7 +262,14 @@ def single_course_reverification_info(user, course, enrollment):  # pylint: disa
         OR, None: None if there is no re-verification info for this enrollment
     """
     window = MidcourseReverificationWindow.get_window(course.id, datetime.datetime.now(UTC))
+    return _reverification_info_for_window(user, course, enrollment, window)
+
 
+def _reverification_info_for_window(user, course, enrollment, window):
+    """
+    Returns the ReverifyInfo of single_course_reverification_info for the open
+    MidcourseReverificationWindow `window` of the course, if it has one.
+    """
     # If there's no window OR the user is not verified, we don't get reverification info
     if (not window) or (enrollment.mode != "verified"):
         return None
@@ -259,31 +281,88 @@ def single_course_reverification_info(user, course, enrollment):  # pylint: disa
     )
 
 
+class DashboardCourse(object):
+    """
+    A course listed on the student dashboard. The attributes of its CourseSummary,
+    which has everything that the dashboard and the access checks of its courses
+    read, are read from the summary (pass `summary` to has_access); the
+    CourseDescriptor is only loaded, once, for the first attribute that isn't
+    summarized.
+    """
+    # The attributes of the course that its CourseSummary provides
+    SUMMARY_ATTRIBUTES = frozenset(CourseSummary.summary_fields) | frozenset([
+        'location', 'id', 'number', 'org', 'display_name_with_default', 'display_number_with_default',
+        'display_org_with_default', 'start_date_is_still_default', 'may_certify', 'has_started', 'has_ended',
+    ])
+
+    def __init__(self, summary):
+        self.summary = summary
+
+    @lazy
+    def descriptor(self):
+        """
+        The CourseDescriptor of the course, or None if it no longer exists.
+        """
+        try:
+            return modulestore().get_course(self.summary.id)
+        except ItemNotFoundError:
+            return None
+
+    def is_loadable(self):
+        """
+        Return whether the course's descriptor loads without errors.
+        """
+        return self.descriptor is not None and not isinstance(self.descriptor, ErrorDescriptor)
+
+    def start_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the text of the course's start date, as CourseDescriptor.start_datetime_text does.
+        """
+        return course_start_datetime_text(self.summary, ModuleI18nService(), format_string)
+
+    def end_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the text of the course's end date, as CourseDescriptor.end_datetime_text does.
+        """
+        return course_end_datetime_text(self.summary, ModuleI18nService(), format_string)
+
+    def __getattr__(self, name):
+        # Only called for the attributes which aren't set on this object
+        if name in self.SUMMARY_ATTRIBUTES:
+            return getattr(self.summary, name)
+        return getattr(self.descriptor, name)
+
+
 def get_course_enrollment_pairs(user, course_org_filter, org_filter_out_set):
     """
-    Get the relevant set of (Course, CourseEnrollment) pairs to be displayed on
-    a student's dashboard.
+    Get the relevant set of (DashboardCourse, CourseEnrollment) pairs to be
+    displayed on a student's dashboard. The courses are built from their
+    summaries, so none of them is loaded here; check `is_loadable()` before
+    relying on an attribute of a course that isn't summarized.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
-        store = modulestore()
-        with store.bulk_operations(enrollment.course_id):
-            course = store.get_course(enrollment.course_id)
-            if course and not isinstance(course, ErrorDescriptor):
-
-                # if we are in a Microsite, then filter out anything that is not
-                # attributed (by ORG) to that Microsite
-                if course_org_filter and course_org_filter != course.location.org:
-                    continue
-                # Conversely, if we are not in a Microsite, then let's filter out any enrollments
-                # with courses attributed (by ORG) to Microsites
-                elif course.location.org in org_filter_out_set:
-                    continue
-
-                yield (course, enrollment)
-            else:
-                log.error("User {0} enrolled in {2} course {1}".format(
-                    user.username, enrollment.course_id, "broken" if course else "non-existent"
-                ))
+    store = modulestore()
+    enrollments = list(CourseEnrollment.enrollments_for_user(user))
+
+    # Summarize all of the courses at once, so that the courses which don't exist
+    # or aren't shown here never have to be loaded
+    summaries = store.get_course_summaries([enrollment.course_id for enrollment in enrollments])
+
+    for enrollment in enrollments:
+        summary = summaries.get(enrollment.course_id)
+        if summary is None:
+            log.error("User {0} enrolled in non-existent course {1}".format(user.username, enrollment.course_id))
+            continue
+
+        # if we are in a Microsite, then filter out anything that is not
+        # attributed (by ORG) to that Microsite
+        if course_org_filter and course_org_filter != summary.location.org:
+            continue
+        # Conversely, if we are not in a Microsite, then let's filter out any enrollments
+        # with courses attributed (by ORG) to Microsites
+        elif summary.location.org in org_filter_out_set:
+            continue
+
+        yield (DashboardCourse(summary), enrollment)
 
 
 def _cert_info(user, course, cert_status):
@@ -544,8 +623,8 @@ def dashboard(request):
 
     show_courseware_links_for = frozenset(
         course.id for course, _enrollment in course_enrollment_pairs
-        if has_access(request.user, 'load', course)
-        and has_access(request.user, 'view_courseware_with_prerequisites', course)
+        if has_access(request.user, 'load', course.summary)
+        and has_access(request.user, 'view_courseware_with_prerequisites', course.summary)
     )
 
     # Construct a dictionary of course mode information
@@ -590,8 +669,10 @@ def dashboard(request):
             del request.session['separate-verified']
         verify_status_by_course = {}
 
+    # Look up the certificates of all of the courses at once
+    certificate_statuses = certificate_statuses_for_student(request.user, enrolled_course_ids)
     cert_statuses = {
-        course.id: cert_info(request.user, course)
+        course.id: cert_info(request.user, course, certificate_statuses[course.id])
         for course, _enrollment in course_enrollment_pairs
     }
 
@@ -26,3 +26,13 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_batch(self, events):
+        """
+        Send a list of events to tracker.
+
+        Backends that can store many events at once should override this.
+
+        """
+        for event in events:
+            self.send(event)
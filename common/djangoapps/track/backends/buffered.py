@@ -0,0 +1,195 @@
+"""
+Event tracker backend that hands events over to another backend in
+batches, from a background thread.
+
+Backends are called in the request thread, so the time they spend
+storing events is added to every tracked request. Wrapping a backend in
+a `BufferedBackend` only costs the request thread a queue insertion::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {
+                      'database': 'track',
+                      ...
+                  }
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'flush_interval': 1.0,
+              'overflow': 'drop',
+          }
+      }
+  }
+
+Events that are still queued when the process is killed are lost.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+from Queue import Queue, Empty, Full
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+
+# What to do with events sent while the queue is full
+OVERFLOW_DROP = 'drop'
+OVERFLOW_BLOCK = 'block'
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events, and sends them to another
+    backend in batches from a background thread.
+
+    """
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0,
+                 overflow=OVERFLOW_DROP, block_timeout=None, **kwargs):
+        """
+        Configure the wrapped backend and the queue.
+
+        :Parameters:
+
+          - `backend`: configuration of the backend that stores the
+            events, a dict with an `ENGINE` and optional `OPTIONS`, like
+            the entries of `TRACKING_BACKENDS`
+          - `max_queue_size`: how many events may be waiting to be sent
+          - `batch_size`: the most events sent to the backend at once
+          - `flush_interval`: the most seconds an event waits for its
+            batch to fill up
+          - `overflow`: 'drop' to drop events sent while the queue is
+            full, or 'block' to wait for the queue to have room
+          - `block_timeout`: when blocking, the most seconds to wait
+            before dropping the event. None waits forever.
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        # The tracker instantiates the backends when it is imported, so
+        # import it lazily.
+        from track.tracker import _instantiate_backend_from_name  # pylint: disable=protected-access
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError('Invalid overflow policy for buffered event track backend: %s' % overflow)
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.tags = [u'backend:{}'.format(self.backend.__class__.__name__)]
+
+        self.queue = Queue(max_queue_size)
+        self._worker_lock = threading.Lock()
+        self._worker_pid = None
+
+        # Don't lose the queued events when the process exits normally
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Queue the event, to be sent by the background thread."""
+        self._ensure_worker()
+
+        try:
+            if self.overflow == OVERFLOW_BLOCK:
+                self.queue.put(event, True, self.block_timeout)
+            else:
+                self.queue.put_nowait(event)
+        except Full:
+            dog_stats_api.increment('track.buffered.dropped', tags=self.tags)
+
+    def flush(self):
+        """
+        Send all queued events to the backend from the calling thread.
+
+        A batch that the background thread is in the middle of sending
+        isn't waited for.
+
+        """
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except Empty:
+                pass
+
+            if not batch:
+                return
+            self._send_batch(batch)
+
+    def _ensure_worker(self):
+        """
+        Start the background thread, unless this process already has one.
+
+        Threads don't survive a fork, so forked workers (e.g. of gunicorn)
+        each start their own thread, with their own queue.
+
+        """
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+
+        with self._worker_lock:
+            if self._worker_pid == pid:
+                return
+
+            if self._worker_pid is not None:
+                # Events queued by the parent process are sent by the parent.
+                self.queue = Queue(self.max_queue_size)
+
+            worker = threading.Thread(target=self._run, name='track-{}'.format(self.backend.__class__.__name__))
+            worker.daemon = True
+            worker.start()
+            self._worker_pid = pid
+
+    def _run(self):
+        """Send the queued events, batch by batch, forever."""
+        while True:
+            self._send_batch(self._next_batch())
+
+    def _next_batch(self):
+        """
+        Wait for an event, then for up to `batch_size` events or
+        `flush_interval` seconds, whichever comes first.
+
+        """
+        batch = [self.queue.get()]
+        deadline = time.time() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(True, timeout))
+            except Empty:
+                break
+
+        return batch
+
+    def _send_batch(self, batch):
+        """Send the batch to the backend, reporting the queue depth."""
+        dog_stats_api.gauge('track.buffered.queue_depth', self.queue.qsize(), tags=self.tags)
+        dog_stats_api.histogram('track.buffered.batch_size', len(batch), tags=self.tags)
+
+        try:
+            self.backend.send_batch(batch)
+        except Exception:  # pylint: disable=broad-except
+            # Don't let a failing backend stop the background thread
+            log.exception('Error sending a batch of %d events to tracking backend', len(batch))
@@ -95,3 +95,12 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection at once"""
+        try:
+            # Keep inserting the rest of the batch if one event fails
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except PyMongoError:
+            msg = 'Error inserting batch of {} events to MongoDB event tracker backend'.format(len(events))
+            log.exception(msg)
@@ -0,0 +1,78 @@
+from __future__ import absolute_import
+
+import time
+
+from mock import patch
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Backend that keeps the batches of events it is sent."""
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.batches.append(events)
+
+
+IN_MEMORY_BACKEND = {'ENGINE': 'track.backends.tests.test_buffered.InMemoryBackend'}
+
+
+class TestBufferedBackend(TestCase):
+    def test_batches_sent_in_background(self):
+        backend = BufferedBackend(IN_MEMORY_BACKEND, batch_size=2, flush_interval=0.01)
+        events = [{'test': i} for i in range(5)]
+        for event in events:
+            backend.send(event)
+
+        # Wait for the background thread to send everything
+        deadline = time.time() + 5
+        while sum(len(batch) for batch in backend.backend.batches) < len(events) and time.time() < deadline:
+            time.sleep(0.01)
+
+        batches = backend.backend.batches
+        self.assertEqual([event for batch in batches for event in batch], events)
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+
+    @patch('track.backends.buffered.dog_stats_api')
+    @patch.object(BufferedBackend, '_ensure_worker')
+    def test_drop_when_full(self, _ensure_worker, dog_stats_api):
+        backend = BufferedBackend(IN_MEMORY_BACKEND, max_queue_size=2, batch_size=10)
+        for i in range(3):
+            backend.send({'test': i})
+
+        dog_stats_api.increment.assert_called_once_with('track.buffered.dropped', tags=backend.tags)
+
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 0}, {'test': 1}]])
+
+    @patch('track.backends.buffered.dog_stats_api')
+    @patch.object(BufferedBackend, '_ensure_worker')
+    def test_block_when_full(self, _ensure_worker, dog_stats_api):
+        backend = BufferedBackend(
+            IN_MEMORY_BACKEND, max_queue_size=1, overflow='block', block_timeout=0.01
+        )
+        backend.send({'test': 0})
+        backend.send({'test': 1})
+        dog_stats_api.increment.assert_called_once_with('track.buffered.dropped', tags=backend.tags)
+
+    def test_flush_in_batches(self):
+        with patch.object(BufferedBackend, '_ensure_worker'):
+            backend = BufferedBackend(IN_MEMORY_BACKEND, batch_size=2)
+            for i in range(3):
+                backend.send({'test': i})
+            backend.flush()
+
+        self.assertEqual(backend.backend.batches, [[{'test': 0}, {'test': 1}], [{'test': 2}]])
+
+    def test_invalid_overflow(self):
+        with self.assertRaises(ValueError):
+            BufferedBackend(IN_MEMORY_BACKEND, overflow='explode')
@@ -1,5 +1,9 @@
 import re
+import threading
+
+from capa.safe_exec import LocalCache, SafeExecCache
 from django.conf import settings
+from django.core.cache import cache
 
 # We'll make assets named this be importable by Python code in the sandbox.
 PYTHON_LIB_ZIP = "python_lib.zip"
@@ -38,3 +42,24 @@ def get_python_lib_zip(contentstore, course_id):
         return zip_lib.data
     else:
         return None
+
+
+_LOCAL_SAFE_EXEC_CACHE = None
+_LOCAL_SAFE_EXEC_CACHE_LOCK = threading.Lock()
+
+
+def safe_exec_cache(course_id):
+    """
+    Return the cache of the results of running the code of `course_id`'s
+    problems: in this process (up to settings.SAFE_EXEC_LOCAL_CACHE_SIZE bytes
+    of them), then in the Django cache.
+    """
+    global _LOCAL_SAFE_EXEC_CACHE  # pylint: disable=global-statement
+    size = getattr(settings, 'SAFE_EXEC_LOCAL_CACHE_SIZE', 0)
+    local_cache = None
+    if size:
+        with _LOCAL_SAFE_EXEC_CACHE_LOCK:
+            if _LOCAL_SAFE_EXEC_CACHE is None or _LOCAL_SAFE_EXEC_CACHE.max_size != size:
+                _LOCAL_SAFE_EXEC_CACHE = LocalCache(size)
+            local_cache = _LOCAL_SAFE_EXEC_CACHE
+    return SafeExecCache(cache, local_cache, tags=[u'course_id:{}'.format(course_id.to_deprecated_string())])
@@ -3,7 +3,7 @@ Tests for sandboxing.py in util app
 """
 
 from django.test import TestCase
-from util.sandboxing import can_execute_unsafe_code
+from util.sandboxing import can_execute_unsafe_code, safe_exec_cache
 from django.test.utils import override_settings
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
@@ -33,3 +33,20 @@ class SandboxingTest(TestCase):
         """
         self.assertFalse(can_execute_unsafe_code(SlashSeparatedCourseKey('edX', 'full', '2012_Fall')))
         self.assertFalse(can_execute_unsafe_code(SlashSeparatedCourseKey('edX', 'full', '2013_Spring')))
+
+    @override_settings(SAFE_EXEC_LOCAL_CACHE_SIZE=1024)
+    def test_safe_exec_cache(self):
+        """
+        Test that the caches of all courses share the local tier, and are tagged with their course
+        """
+        course_cache = safe_exec_cache(SlashSeparatedCourseKey('edX', 'full', '2012_Fall'))
+        other_course_cache = safe_exec_cache(SlashSeparatedCourseKey('edX', 'full', '2013_Spring'))
+        self.assertIs(course_cache.local_cache, other_course_cache.local_cache)
+        self.assertEqual(course_cache.tags, [u'course_id:edX/full/2012_Fall'])
+
+    @override_settings(SAFE_EXEC_LOCAL_CACHE_SIZE=0)
+    def test_safe_exec_cache_without_local_tier(self):
+        """
+        Test that results are only cached in the Django cache if the local cache size is 0
+        """
+        self.assertIsNone(safe_exec_cache(SlashSeparatedCourseKey('edX', 'full', '2012_Fall')).local_cache)
@@ -172,6 +172,16 @@ def grade_histogram(module_id):
     it, their grade is None. Since there will always be at least one such student
     this function almost always returns [].
     '''
+    from courseware.models import StudentModuleGradeCount
+    if StudentModuleGradeCount.is_enabled():
+        grades = {}
+        for _, grade, _, count in StudentModuleGradeCount.distribution(module_state_key=module_id):
+            grades[grade] = grades.get(grade, 0) + count
+        grades = sorted(grades.items())
+        if len(grades) >= 1 and grades[0][0] is None:
+            return []
+        return grades
+
     from django.db import connection
     cursor = connection.cursor()
 
@@ -7,6 +7,9 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import operator
 import numbers
+import threading
+from collections import OrderedDict
+
 import numpy
 import scipy.constants
 import functions
@@ -61,6 +64,9 @@ DEFAULT_VARIABLES = {
     'q': scipy.constants.e  # Fund. Charge: 1.602176565e-19 (Coulombs)
 }
 
+# How many parsed expressions `compile_expression` keeps around.
+COMPILED_EXPRESSION_CACHE_SIZE = 1024
+
 # We eliminated the following extreme suffixes:
 #   P (1e15), E (1e18), Z (1e21), Y (1e24),
 #   f (1e-15), a (1e-18), z (1e-21), y (1e-24)
@@ -115,6 +121,16 @@ def eval_number(parse_result):
     return super_float("".join(parse_result))
 
 
+def is_value(token):
+    """
+    Return whether `token` is a value, as opposed to an operator or a paren.
+
+    Values are numbers, or numpy arrays of them when evaluating many samples
+    at once (see `CompiledExpression.evaluate_samples`).
+    """
+    return not isinstance(token, basestring)
+
+
 def eval_atom(parse_result):
     """
     Return the value wrapped by the atom.
@@ -122,7 +138,7 @@ def eval_atom(parse_result):
     In the case of parenthesis, ignore them.
     """
     # Find first number in the list
-    result = next(k for k in parse_result if isinstance(k, numbers.Number))
+    result = next(k for k in parse_result if is_value(k))
     return result
 
 
@@ -136,7 +152,7 @@ def eval_power(parse_result):
     # `reduce` will go from left to right; reverse the list.
     parse_result = reversed(
         [k for k in parse_result
-         if isinstance(k, numbers.Number)]  # Ignore the '^' marks.
+         if is_value(k)]  # Ignore the '^' marks.
     )
     # Having reversed it, raise `b` to the power of `a`.
     power = reduce(lambda a, b: b ** a, parse_result)
@@ -155,10 +171,12 @@ def eval_parallel(parse_result):
     """
     if len(parse_result) == 1:
         return parse_result[0]
-    if 0 in parse_result:
+    values = [e for e in parse_result if is_value(e)]
+    # Arrays with a zero in them divide by zero below, which makes
+    # `evaluate_samples` go back to evaluating one sample at a time.
+    if any(numpy.ndim(e) == 0 and e == 0 for e in values):
         return float('nan')
-    reciprocals = [1. / e for e in parse_result
-                   if isinstance(e, numbers.Number)]
+    reciprocals = [1. / e for e in values]
     return 1. / sum(reciprocals)
 
 
@@ -173,12 +191,12 @@ def eval_sum(parse_result):
     total = 0.0
     current_op = operator.add
     for token in parse_result:
-        if token == '+':
+        if is_value(token):
+            total = current_op(total, token)
+        elif token == '+':
             current_op = operator.add
         elif token == '-':
             current_op = operator.sub
-        else:
-            total = current_op(total, token)
     return total
 
 
@@ -191,12 +209,12 @@ def eval_product(parse_result):
     prod = 1.0
     current_op = operator.mul
     for token in parse_result:
-        if token == '*':
+        if is_value(token):
+            prod = current_op(prod, token)
+        elif token == '*':
             current_op = operator.mul
         elif token == '/':
             current_op = operator.truediv
-        else:
-            prod = current_op(prod, token)
     return prod
 
 
@@ -224,38 +242,154 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
     """
-    # No need to go further.
-    if math_expr.strip() == "":
-        return float('nan')
+    return compile_expression(math_expr, case_sensitive).evaluate(variables, functions)
 
-    # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+_COMPILED_EXPRESSIONS = OrderedDict()
+_COMPILED_EXPRESSIONS_LOCK = threading.Lock()
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
-
-    return math_interpreter.reduce_tree(evaluate_actions)
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return a `CompiledExpression` for `math_expr`, parsing it only if needed.
+
+    The most recently used `COMPILED_EXPRESSION_CACHE_SIZE` expressions are
+    kept, keyed by (`math_expr`, `case_sensitive`). They are shared between
+    callers, so don't modify them. Expressions that don't parse raise
+    `pyparsing.ParseException` and aren't cached.
+    """
+    key = (math_expr, case_sensitive)
+    with _COMPILED_EXPRESSIONS_LOCK:
+        compiled = _COMPILED_EXPRESSIONS.pop(key, None)
+        if compiled is not None:
+            _COMPILED_EXPRESSIONS[key] = compiled
+            return compiled
+
+    # Parse outside of the lock; at worst two threads parse the same string.
+    compiled = CompiledExpression(math_expr, case_sensitive)
+
+    with _COMPILED_EXPRESSIONS_LOCK:
+        _COMPILED_EXPRESSIONS[key] = compiled
+        while len(_COMPILED_EXPRESSIONS) > COMPILED_EXPRESSION_CACHE_SIZE:
+            _COMPILED_EXPRESSIONS.popitem(last=False)
+    return compiled
+
+
+def stack_samples(samples):
+    """
+    Turn a list of dicts of variables into one dict of numpy arrays.
+
+    e.g. [{'x': 1, 'y': 2}, {'x': 3, 'y': 4}] -> {'x': [1, 3], 'y': [2, 4]}
+
+    Return None if the samples don't all define the same numeric variables.
+    """
+    if not samples:
+        return None
+    names = set(samples[0])
+    for sample in samples:
+        if set(sample) != names:
+            return None
+        if not all(isinstance(value, numbers.Number) for value in sample.itervalues()):
+            return None
+    return {name: numpy.array([sample[name] for sample in samples]) for name in names}
+
+
+class CompiledExpression(object):
+    """
+    A parsed math expression, which may be evaluated any number of times.
+
+    Use `compile_expression` to get one, rather than creating it directly.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        """
+        Parse `math_expr`; raise a `pyparsing.ParseException` if it is invalid.
+        """
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        self.math_interpreter = None
+
+        # Blank expressions evaluate to NaN; there is nothing to parse.
+        if math_expr.strip() != "":
+            self.math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+            self.math_interpreter.parse_algebra()
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression with the given variables and functions.
+
+        Takes the same `variables` and `functions` as `evaluator`.
+        """
+        if self.math_interpreter is None:
+            return float('nan')
+
+        all_variables, all_functions = self._add_defaults(variables, functions)
+        return self._reduce(all_variables, all_functions)
+
+    def evaluate_samples(self, samples, functions):
+        """
+        Evaluate the expression for each dict of variables in `samples`.
+
+        Return a list with one result per sample, equal to what `evaluate`
+        would return for it.
+
+        Try to do this in one pass, with each variable being a numpy array of
+        its values across the samples. If part of the expression doesn't work
+        elementwise (e.g. `fact`, or a custom function) or runs into a
+        floating point error (which scalars handle differently, e.g. 1/0),
+        go back to evaluating one sample at a time, so that both results and
+        exceptions are the same as those of `evaluate`.
+        """
+        samples = list(samples)
+        if self.math_interpreter is None:
+            return [float('nan')] * len(samples)
+
+        stacked_variables = stack_samples(samples)
+        if stacked_variables is not None:
+            all_variables, all_functions = self._add_defaults(stacked_variables, functions)
+            try:
+                with numpy.errstate(all='raise', under='ignore'):
+                    result = self._reduce(all_variables, all_functions)
+                    if numpy.ndim(result) == 0:
+                        # The result doesn't depend on any sampled variable.
+                        return [result] * len(samples)
+                    if numpy.shape(result) == (len(samples),):
+                        return list(result)
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+        return [self.evaluate(variables, functions) for variables in samples]
+
+    def _add_defaults(self, variables, functions):
+        """
+        Add the default variables and functions, and check that the
+        expression doesn't use anything else.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        self.math_interpreter.check_variables(all_variables, all_functions)
+        return all_variables, all_functions
+
+    def _reduce(self, all_variables, all_functions):
+        """
+        Evaluate the parse tree, with variables and functions already checked.
+        """
+        # Create a recursion to evaluate the tree.
+        if self.case_sensitive:
+            casify = lambda x: x
+        else:
+            casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        evaluate_actions = {
+            'number': eval_number,
+            'variable': lambda x: all_variables[casify(x[0])],
+            'function': lambda x: all_functions[casify(x[0])](x[1]),
+            'atom': eval_atom,
+            'power': eval_power,
+            'parallel': eval_parallel,
+            'product': eval_product,
+            'sum': eval_sum
+        }
+
+        return self.math_interpreter.reduce_tree(evaluate_actions)
 
 
 class ParseAugmenter(object):
@@ -559,3 +559,86 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Test `calc.compile_expression` and evaluating the resulting expressions
+    for many samples at once.
+    """
+
+    def test_cached(self):
+        """
+        Each expression is parsed once per case sensitivity.
+        """
+        self.assertIs(
+            calc.compile_expression("x^2 + 1"),
+            calc.compile_expression("x^2 + 1")
+        )
+        self.assertIsNot(
+            calc.compile_expression("x^2 + 1"),
+            calc.compile_expression("x^2 + 1", case_sensitive=True)
+        )
+
+    def test_cache_size(self):
+        """
+        The least recently used expressions are dropped.
+        """
+        first = calc.compile_expression("x + 1")
+        for i in range(calc.COMPILED_EXPRESSION_CACHE_SIZE):
+            calc.compile_expression("x + {}".format(i + 2))
+        self.assertIsNot(first, calc.compile_expression("x + 1"))
+
+    def test_invalid_not_cached(self):
+        with self.assertRaises(ParseException):
+            calc.compile_expression("1 + * 2")
+        with self.assertRaises(ParseException):
+            calc.compile_expression("1 + * 2")
+
+    def test_evaluate_samples(self):
+        """
+        Evaluating many samples gives the same results as evaluating each
+        sample on its own.
+        """
+        samples = [{'x': x, 'y': y} for x, y in [(1.0, 2.0), (-3.5, 0.25), (12.0, -7.0)]]
+        expressions = [
+            "x^2 + y", "3*x/y - 2", "sin(x) * cos(y)", "x || y", "-y^2",
+            "sqrt(x) + i*y", "arccot(x)", "fact(3) + x", "5k + e^x", "17",
+        ]
+        for expression in expressions:
+            compiled = calc.compile_expression(expression)
+            expected = [calc.evaluator(sample, {}, expression) for sample in samples]
+            results = compiled.evaluate_samples(samples, {})
+            self.assertEqual(len(results), len(samples))
+            for result, value in zip(results, expected):
+                if numpy.isnan(value):
+                    self.assertTrue(numpy.isnan(result))
+                else:
+                    self.assertAlmostEqual(result, value)
+
+    def test_evaluate_samples_zero(self):
+        """
+        Floating point errors fall back to evaluating samples one at a time,
+        which keeps the scalar semantics.
+        """
+        samples = [{'x': 1.0}, {'x': 0.0}]
+        results = calc.compile_expression("1 || x").evaluate_samples(samples, {})
+        self.assertEqual(results[0], 1.0)
+        self.assertTrue(numpy.isnan(results[1]))
+
+        with self.assertRaises(ZeroDivisionError):
+            calc.compile_expression("1/x").evaluate_samples(samples, {})
+
+    def test_evaluate_samples_functions(self):
+        """
+        Custom functions are called with either an array or a scalar.
+        """
+        samples = [{'x': 1.0}, {'x': 2.0}]
+        compiled = calc.compile_expression("f(x)", case_sensitive=True)
+        self.assertEqual(compiled.evaluate_samples(samples, {'f': lambda x: x * 2}), [2.0, 4.0])
+        scalar_only = lambda x: float(x) + 1
+        self.assertEqual(compiled.evaluate_samples(samples, {'f': scalar_only}), [2.0, 3.0])
+
+    def test_evaluate_samples_undefined(self):
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            calc.compile_expression("x + y").evaluate_samples([{'x': 1.0}], {})
@@ -13,11 +13,15 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+import threading
+import time
 
 from lxml import etree
 from pytz import UTC
@@ -73,6 +77,8 @@ class LoncapaSystem(object):
     Attributes:
         i18n: an object implementing the `gettext.Translations` interface so
             that we can use `.ugettext` to localize strings.
+        parsed_problem_cache: a `ParsedProblemCache` to share the parsed XML
+            and script context of problems through, or None.
 
     See :class:`ModuleSystem` for documentation of other attributes.
 
@@ -92,7 +98,8 @@ class LoncapaSystem(object):
         seed,      # Why do we do this if we have self.seed?
         STATIC_URL,                                     # pylint: disable=invalid-name
         xqueue,
-        matlab_api_key=None
+        matlab_api_key=None,
+        parsed_problem_cache=None,
     ):
         self.ajax_url = ajax_url
         self.anonymous_student_id = anonymous_student_id
@@ -108,6 +115,58 @@ class LoncapaSystem(object):
         self.STATIC_URL = STATIC_URL                    # pylint: disable=invalid-name
         self.xqueue = xqueue
         self.matlab_api_key = matlab_api_key
+        self.parsed_problem_cache = parsed_problem_cache
+
+
+class ParsedProblemCache(object):
+    """
+    A bounded cache of the XML tree (with includes processed) and the script
+    context of problems, so that building a problem that was built recently
+    doesn't parse its XML and run its script again.
+
+    Both only depend on the problem text and the seed, plus the student's
+    anonymous id for scripts that use it, or that could through python_lib.zip
+    (see `LoncapaProblem._set_parsed_problem`). They also depend on the
+    course's files and python_lib.zip, which aren't part of the key, so
+    entries expire after `timeout` seconds.
+
+    Entries are copied in and out, since building a problem modifies them.
+    """
+    def __init__(self, max_size, timeout=300):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return a copy of the (tree, context) cached under `key`, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] < time.time() - self.timeout:
+                return None
+            # Mark the entry as the most recently used
+            self._entries[key] = entry
+        return deepcopy(entry[1]), deepcopy(entry[2])
+
+    def set(self, key, tree, context):
+        """
+        Cache a copy of `tree` and `context` under `key`.
+        """
+        entry = (time.time(), deepcopy(tree), deepcopy(context))
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._entries.clear()
 
 
 class LoncapaProblem(object):
@@ -159,14 +218,24 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
+        parsed_problem_cache = self.capa_system.parsed_problem_cache
+        parsed = self._get_parsed_problem(parsed_problem_cache) if parsed_problem_cache else None
+        if parsed is not None:
+            self.tree, self.context = parsed
+            # Scripts that don't use it share the context of other students
+            self.context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+        else:
+            # parse problem XML file into an element tree
+            self.tree = etree.XML(problem_text)
+
+            # handle any <include file="foo"> tags
+            self._process_includes()
 
-        # handle any <include file="foo"> tags
-        self._process_includes()
+            # construct script processor context (eg for customresponse problems)
+            self.context = self._extract_context(self.tree)
 
-        # construct script processor context (eg for customresponse problems)
-        self.context = self._extract_context(self.tree)
+            if parsed_problem_cache:
+                self._set_parsed_problem(parsed_problem_cache)
 
         # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
         # transformations.  This also creates the dict (self.responders) of Response
@@ -191,6 +260,46 @@ class LoncapaProblem(object):
 
         self.extracted_tree = self._extract_html(self.tree)
 
+    def _parsed_problem_cache_key(self, student_specific=False):
+        """
+        Return the key of this problem's tree and script context in the
+        ParsedProblemCache, for the current student only if `student_specific`.
+        """
+        text = self.problem_text
+        if isinstance(text, unicode):
+            text = text.encode('utf-8')
+        key = (self.problem_id, hashlib.md5(text).hexdigest(), self.seed)
+        if student_specific:
+            key += (self.capa_system.anonymous_student_id,)
+        return key
+
+    def _get_parsed_problem(self, parsed_problem_cache):
+        """
+        Return a copy of the (tree, context) of this problem cached in
+        `parsed_problem_cache` for the current student, or None.
+        """
+        parsed = parsed_problem_cache.get(self._parsed_problem_cache_key())
+        if parsed is not None and parsed[0] is None:
+            # The problem was found to depend on the student; see _set_parsed_problem
+            parsed = parsed_problem_cache.get(self._parsed_problem_cache_key(student_specific=True))
+        return parsed
+
+    def _set_parsed_problem(self, parsed_problem_cache):
+        """
+        Cache the tree and context of this problem in `parsed_problem_cache`.
+
+        Whether they depend on the student is only known once includes are
+        processed, from all of the script code: if it uses the student's
+        anonymous id, or imports from python_lib.zip, whose code isn't
+        checked, they're cached for the current student only, with an entry
+        without a tree under the shared key to tell so.
+        """
+        if 'anonymous_student_id' in self.context['script_code'] or self.context['extra_files']:
+            parsed_problem_cache.set(self._parsed_problem_cache_key(), None, {})
+            parsed_problem_cache.set(self._parsed_problem_cache_key(student_specific=True), self.tree, self.context)
+        else:
+            parsed_problem_cache.set(self._parsed_problem_cache_key(), self.tree, self.context)
+
     def do_reset(self):
         """
         Reset internal state to unfinished, with no answers
@@ -0,0 +1,121 @@
+"""
+Caches of safe_exec results, shared by the processes of a deployment.
+
+`safe_exec` only needs an object with `.get(key)` and `.set(key, value)`
+methods.  `SafeExecCache` is one that keeps the results compressed in a
+size-bounded in-process `LocalCache`, in front of a cache shared by all
+processes, such as a Django cache, and reports its hits and misses to
+datadog with the tags it was given (e.g. the course id)::
+
+    cache = SafeExecCache(django_cache, LocalCache(16 * 1024 * 1024), tags=[u'course_id:...'])
+    safe_exec(code, globals_dict, random_seed=seed, cache=cache)
+
+"""
+from collections import OrderedDict
+import json
+import threading
+import time
+import zlib
+
+from dogapi import dog_stats_api
+
+
+def compress(value):
+    """Serialize and compress a (JSON-safe) safe_exec result."""
+    return zlib.compress(json.dumps(value))
+
+
+def decompress(data):
+    """The inverse of `compress`."""
+    emsg, results = json.loads(zlib.decompress(data))
+    return emsg, results
+
+
+class LocalCache(object):
+    """
+    A thread-safe in-process cache of compressed results, keeping the most
+    recently used ones that fit in `max_size` bytes.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the compressed result cached under `key`, or None."""
+        with self._lock:
+            data = self._entries.pop(key, None)
+            if data is not None:
+                # Mark the entry as the most recently used
+                self._entries[key] = data
+            return data
+
+    def set(self, key, data):
+        """Cache the compressed result `data` under `key`."""
+        if len(data) > self.max_size:
+            return
+        with self._lock:
+            old_data = self._entries.pop(key, None)
+            if old_data is not None:
+                self.size -= len(old_data)
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_size:
+                __, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class SafeExecCache(object):
+    """
+    A two tier cache of safe_exec results: an in-process `LocalCache`, then
+    a cache shared between processes.  Either may be None.
+
+    Results are stored compressed in both tiers, and decompressed into new
+    objects on every hit, so callers can't change each other's results.
+    """
+    def __init__(self, shared_cache=None, local_cache=None, tags=None):
+        self.shared_cache = shared_cache
+        self.local_cache = local_cache
+        self.tags = tags or []
+
+    def get(self, key):
+        """Return the (emsg, results) cached under `key`, or None."""
+        start = time.time()
+        tier = None
+
+        data = self.local_cache.get(key) if self.local_cache is not None else None
+        if data is not None:
+            tier = 'local'
+        elif self.shared_cache is not None:
+            data = self.shared_cache.get(key)
+            if not isinstance(data, str):
+                # Not there, or cached uncompressed by an older version
+                data = None
+            else:
+                tier = 'shared'
+                if self.local_cache is not None:
+                    self.local_cache.set(key, data)
+
+        if tier is None:
+            dog_stats_api.increment('capa.safe_exec.cache.miss', tags=self.tags)
+            value = None
+        else:
+            dog_stats_api.increment('capa.safe_exec.cache.hit', tags=self.tags + [u'tier:{}'.format(tier)])
+            value = decompress(data)
+        dog_stats_api.histogram('capa.safe_exec.cache.get_time', time.time() - start, tags=self.tags)
+        return value
+
+    def set(self, key, value):
+        """Cache the (emsg, results) `value` under `key` in both tiers."""
+        data = compress(value)
+        if self.local_cache is not None:
+            self.local_cache.set(key, data)
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, data)
@@ -7,6 +7,7 @@ from . import lazymod
 from dogapi import dog_stats_api
 
 import hashlib
+import re
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -47,6 +48,12 @@ for name, modname in ASSUMED_IMPORTS:
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
 
+# Failures of the sandbox rather than of the code, which may not happen the
+# next time: the code ran out of memory, or was killed (e.g. for running out
+# of time) before it could say anything.
+TRANSIENT_FAILURE = re.compile(r"MemoryError|^Couldn't execute jailed code:\s*$")
+
+
 def update_hash(hasher, obj):
     """
     Update a `hashlib` hasher with a nested object.
@@ -99,7 +106,9 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  Exceptions raised by the code are cached too, but failures
+    of the sandbox that may not happen again aren't.  See `capa.safe_exec.cache` for
+    a cache shared between processes.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -146,7 +155,7 @@ def safe_exec(
 
     # Put the result back in the cache.  This is complicated by the fact that
     # the globals dict might not be entirely serializable.
-    if cache:
+    if cache and not (emsg and TRANSIENT_FAILURE.search(emsg)):
         cleaned_results = json_safe(globals_dict)
         cache.set(key, (emsg, cleaned_results))
 
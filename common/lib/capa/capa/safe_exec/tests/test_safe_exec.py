@@ -4,15 +4,20 @@ import hashlib
 import os
 import os.path
 import random
+import sys
 import textwrap
 import unittest
 
+from mock import patch
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, LocalCache, SafeExecCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
+# capa.safe_exec.safe_exec is rebound to the function by the package, so patch the module itself
+SAFE_EXEC_MODULE = sys.modules['capa.safe_exec.safe_exec']
+
 
 class TestSafeExec(unittest.TestCase):
     def test_set_values(self):
@@ -177,6 +182,71 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+    def test_transient_failures_arent_cached(self):
+        cache = {}
+        for message in ["Couldn't execute jailed code: ", "Traceback...\nMemoryError\n"]:
+            with patch.object(SAFE_EXEC_MODULE, 'codejail_safe_exec', side_effect=SafeExecException(message)):
+                with self.assertRaises(SafeExecException):
+                    safe_exec("a = 1", {}, cache=DictCache(cache))
+        self.assertEqual(cache, {})
+
+
+class TestSafeExecCache(unittest.TestCase):
+    """Tests of the two tier SafeExecCache."""
+
+    def test_miss_then_hit(self):
+        shared = {}
+        cache = SafeExecCache(DictCache(shared), LocalCache(1024 * 1024))
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=cache)
+        self.assertEqual(g['a'], 3)
+
+        # The result is compressed in the shared cache
+        self.assertEqual(len(shared), 1)
+        self.assertIsInstance(shared.values()[0], str)
+
+        with patch.object(SAFE_EXEC_MODULE, 'codejail_safe_exec') as mock_exec:
+            g = {}
+            safe_exec("a = int(math.pi)", g, cache=cache)
+        self.assertFalse(mock_exec.called)
+        self.assertEqual(g['a'], 3)
+
+    def test_shared_hits_are_kept_locally(self):
+        shared = {}
+        SafeExecCache(DictCache(shared)).set('key', (None, {'a': 17}))
+
+        local_cache = LocalCache(1024 * 1024)
+        cache = SafeExecCache(DictCache(shared), local_cache)
+        self.assertEqual(cache.get('key'), (None, {'a': 17}))
+        shared.clear()
+        self.assertEqual(cache.get('key'), (None, {'a': 17}))
+
+    def test_hits_are_copies(self):
+        cache = SafeExecCache(local_cache=LocalCache(1024 * 1024))
+        cache.set('key', (None, {'a': [1, 2]}))
+        cache.get('key')[1]['a'].append(3)
+        self.assertEqual(cache.get('key'), (None, {'a': [1, 2]}))
+
+    def test_old_shared_entries_are_misses(self):
+        cache = SafeExecCache(DictCache({'key': (None, {'a': 17})}))
+        self.assertIsNone(cache.get('key'))
+
+    def test_least_recently_used_are_evicted(self):
+        local_cache = LocalCache(10)
+        local_cache.set('first', 'xxxx')
+        local_cache.set('second', 'xxxx')
+        local_cache.get('first')
+        local_cache.set('third', 'xxxx')
+        self.assertEqual(local_cache.get('first'), 'xxxx')
+        self.assertIsNone(local_cache.get('second'))
+        self.assertEqual(local_cache.get('third'), 'xxxx')
+        self.assertEqual(local_cache.size, 8)
+
+        # Results bigger than the whole cache aren't kept
+        local_cache.set('fourth', 'x' * 11)
+        self.assertIsNone(local_cache.get('fourth'))
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
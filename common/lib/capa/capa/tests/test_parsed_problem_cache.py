@@ -0,0 +1,132 @@
+"""
+Tests of sharing the parsed XML and script context of problems.
+"""
+import textwrap
+import unittest
+
+from fs.memoryfs import MemoryFS
+from mock import patch
+
+from capa.capa_problem import ParsedProblemCache
+from capa.tests import new_loncapa_problem, test_capa_system
+
+
+SCRIPT_PROBLEM = textwrap.dedent("""
+    <problem>
+        <script type="loncapa/python">
+    answer = str(random.randint(0, 1000))
+        </script>
+        <customresponse cfn="check">
+            <textline size="10"/>
+        </customresponse>
+        <script type="loncapa/python">
+    def check(expect, ans):
+        return ans == answer
+        </script>
+    </problem>
+""")
+
+
+class ParsedProblemCacheTest(unittest.TestCase):
+    """
+    Tests of building problems through a ParsedProblemCache.
+    """
+    def setUp(self):
+        super(ParsedProblemCacheTest, self).setUp()
+        self.cache = ParsedProblemCache(10)
+
+    def _new_problem(self, xml=SCRIPT_PROBLEM, seed=723, anonymous_student_id='student', **system_attrs):
+        """
+        Build a problem that shares its parse products through `self.cache`.
+        """
+        capa_system = test_capa_system()
+        capa_system.parsed_problem_cache = self.cache
+        capa_system.anonymous_student_id = anonymous_student_id
+        for name, value in system_attrs.iteritems():
+            setattr(capa_system, name, value)
+        return new_loncapa_problem(xml, capa_system=capa_system, seed=seed)
+
+    def test_script_runs_once_per_seed(self):
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            self._new_problem()
+            self._new_problem(anonymous_student_id='another_student')
+            self.assertEqual(mock_safe_exec.call_count, 1)
+
+            self._new_problem(seed=1)
+            self.assertEqual(mock_safe_exec.call_count, 2)
+
+    def test_cached_problem_is_the_same(self):
+        problem = self._new_problem()
+        cached_problem = self._new_problem(anonymous_student_id='another_student')
+        self.assertEqual(cached_problem.context['answer'], problem.context['answer'])
+        self.assertEqual(cached_problem.context['anonymous_student_id'], 'another_student')
+        self.assertEqual(cached_problem.get_html(), problem.get_html())
+        self.assertEqual(cached_problem.get_question_answers(), problem.get_question_answers())
+
+    def test_problems_do_not_share_trees(self):
+        problem = self._new_problem()
+        cached_problem = self._new_problem()
+        self.assertIsNot(cached_problem.tree, problem.tree)
+        self.assertIsNot(cached_problem.context, problem.context)
+
+    def test_anonymous_student_id_in_key(self):
+        xml = SCRIPT_PROBLEM.replace('random.randint(0, 1000)', 'anonymous_student_id')
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            self._new_problem(xml)
+            self._new_problem(xml, anonymous_student_id='another_student')
+            self.assertEqual(mock_safe_exec.call_count, 2)
+
+    def test_anonymous_student_id_in_include(self):
+        filestore = MemoryFS()
+        filestore.setcontents('script.xml', textwrap.dedent("""
+            <script type="loncapa/python">
+        answer = anonymous_student_id
+            </script>
+        """))
+        xml = textwrap.dedent("""
+            <problem>
+                <include file="script.xml"/>
+                <customresponse cfn="check">
+                    <textline size="10"/>
+                </customresponse>
+                <script type="loncapa/python">
+            def check(expect, ans):
+                return ans == answer
+                </script>
+            </problem>
+        """)
+        problem = self._new_problem(xml, filestore=filestore)
+        other_problem = self._new_problem(xml, anonymous_student_id='another_student', filestore=filestore)
+        self.assertEqual(problem.context['answer'], 'student')
+        self.assertEqual(other_problem.context['answer'], 'another_student')
+
+        # each student's problem is still cached
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            cached_problem = self._new_problem(xml, filestore=filestore)
+            self.assertFalse(mock_safe_exec.called)
+        self.assertEqual(cached_problem.context['answer'], 'student')
+
+    def test_python_lib_in_key(self):
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            self._new_problem(get_python_lib_zip=lambda: 'zip contents')
+            self._new_problem(anonymous_student_id='another_student', get_python_lib_zip=lambda: 'zip contents')
+            self.assertEqual(mock_safe_exec.call_count, 2)
+
+    def test_least_recently_used_are_evicted(self):
+        cache = ParsedProblemCache(2)
+        cache.set('first', None, {})
+        cache.set('second', None, {})
+        cache.get('first')
+        cache.set('third', None, {})
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('third'))
+
+    def test_entries_expire(self):
+        cache = ParsedProblemCache(2, timeout=60)
+        with patch('capa.capa_problem.time.time', return_value=1000):
+            cache.set('key', None, {})
+        with patch('capa.capa_problem.time.time', return_value=1059):
+            self.assertIsNotNone(cache.get('key'))
+        with patch('capa.capa_problem.time.time', return_value=1061):
+            self.assertIsNone(cache.get('key'))
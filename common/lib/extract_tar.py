@@ -37,7 +37,9 @@ def _is_bad_link(info, base):
 
 def safemembers(members):
     """
-    Check that all elements of a tar file are safe.
+    Check that all elements of a tar file are safe, yielding each one after
+    it is checked so that tar files opened in stream mode can be extracted
+    while they are read.
     """
 
     base = resolved(".")
@@ -58,7 +60,7 @@ def safemembers(members):
                       finfo.name)
             raise SuspiciousOperation("Dev file")
 
-    return members
+        yield finfo
 
 
 def safetar_extractall(tarf, *args, **kwargs):
@@ -14,9 +14,16 @@ def wrap_message(message, width=MAX_LINE_LENGTH):
     a line. To ensure that messages look consistent this helper function wraps long lines to a conservative length.
     """
     lines = message.split('\n')
-    wrapped_lines = [textwrap.fill(
-        line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
-    ) for line in lines]
+    wrapped_lines = [wrap_line(line, width) for line in lines]
     wrapped_message = '\n'.join(wrapped_lines)
 
     return wrapped_message
+
+
+def wrap_line(line, width=MAX_LINE_LENGTH):
+    """
+    Wrap a single line of a message (containing no newlines) like wrap_message does.
+    """
+    return textwrap.fill(
+        line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
+    )
@@ -19,7 +19,7 @@ except ImportError:
 
 from pkg_resources import resource_string
 
-from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from capa.capa_problem import LoncapaProblem, LoncapaSystem, ParsedProblemCache
 from capa.responsetypes import StudentInputError, \
     ResponseError, LoncapaProblemError
 from capa.util import convert_files_to_filenames
@@ -59,6 +59,23 @@ def randomization_bin(seed, problem_id):
     return int(r_hash.hexdigest()[:7], 16) % NUM_RANDOMIZATION_BINS
 
 
+_PARSED_PROBLEM_CACHE = None
+
+
+def parsed_problem_cache():
+    """
+    Return the ParsedProblemCache shared by the problems of this process, or
+    None if settings.CAPA_PARSED_PROBLEM_CACHE_SIZE is 0 or missing.
+    """
+    global _PARSED_PROBLEM_CACHE  # pylint: disable=global-statement
+    size = getattr(settings, 'CAPA_PARSED_PROBLEM_CACHE_SIZE', 0)
+    if not size:
+        return None
+    if _PARSED_PROBLEM_CACHE is None or _PARSED_PROBLEM_CACHE.max_size != size:
+        _PARSED_PROBLEM_CACHE = ParsedProblemCache(size)
+    return _PARSED_PROBLEM_CACHE
+
+
 class Randomization(String):
     """
     Define a field to store how to randomize a problem.
@@ -321,7 +338,8 @@ class CapaMixin(CapaFields):
             seed=self.runtime.seed,      # Why do we do this if we have self.seed?
             STATIC_URL=self.runtime.STATIC_URL,
             xqueue=self.runtime.xqueue,
-            matlab_api_key=self.matlab_api_key
+            matlab_api_key=self.matlab_api_key,
+            parsed_problem_cache=parsed_problem_cache(),
         )
 
         return LoncapaProblem(
@@ -9,12 +9,17 @@ import logging
 from .content import StaticContent, ContentStore, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from fs.osfs import OSFS
+from fs import path as fspath
+from multiprocessing.pool import ThreadPool
 import os
 import json
 from bson.son import SON
 from opaque_keys.edx.keys import AssetKey
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 
+# Number of assets which are exported concurrently
+EXPORT_WORKERS = 4
+
 
 class MongoContentStore(ContentStore):
 
@@ -102,7 +107,8 @@ class MongoContentStore(ContentStore):
                     location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
                     thumbnail_location=thumbnail_location,
                     import_path=getattr(fp, 'import_path', None),
-                    length=fp.length, locked=getattr(fp, 'locked', False)
+                    length=fp.length, locked=getattr(fp, 'locked', False),
+                    content_digest=getattr(fp, 'md5', None)
                 )
             else:
                 with self.fs.get(content_id) as fp:
@@ -116,7 +122,8 @@ class MongoContentStore(ContentStore):
                         location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
                         thumbnail_location=thumbnail_location,
                         import_path=getattr(fp, 'import_path', None),
-                        length=fp.length, locked=getattr(fp, 'locked', False)
+                        length=fp.length, locked=getattr(fp, 'locked', False),
+                        content_digest=getattr(fp, 'md5', None)
                     )
         except NoFile:
             if throw_on_not_found:
@@ -125,18 +132,27 @@ class MongoContentStore(ContentStore):
                 return None
 
     def export(self, location, output_directory):
-        content = self.find(location)
-
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
-
         if not os.path.exists(output_directory):
             os.makedirs(output_directory)
 
-        disk_fs = OSFS(output_directory)
+        self.export_to_fs(location, OSFS(output_directory))
+
+    def export_to_fs(self, location, export_fs):
+        """
+        Export the asset at location into the pyfilesystem export_fs, streaming its data out of GridFS
+        rather than reading it all into memory.
+        """
+        content = self.find(location, as_stream=True)
+        try:
+            asset_dir = os.path.dirname(content.import_path) if content.import_path is not None else ''
+            if asset_dir:
+                export_fs.makedir(asset_dir, recursive=True, allow_recreate=True)
 
-        with disk_fs.open(content.name, 'wb') as asset_file:
-            asset_file.write(content.data)
+            with export_fs.open(fspath.join(asset_dir, content.name), 'wb') as asset_file:
+                for chunk in content.stream_data():
+                    asset_file.write(chunk)
+        finally:
+            content.close()
 
     def export_all_for_course(self, course_key, output_directory, assets_policy_file):
         """
@@ -149,10 +165,28 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
+        if not os.path.exists(output_directory):
+            os.makedirs(output_directory)
+
+        self.export_all_for_course_to_fs(
+            course_key,
+            OSFS(output_directory),
+            OSFS(os.path.dirname(assets_policy_file)),
+            os.path.basename(assets_policy_file),
+        )
+
+    def export_all_for_course_to_fs(
+            self, course_key, static_fs, policies_fs, policy_filename='assets.json', num_workers=EXPORT_WORKERS
+    ):
+        """
+        Export all of this course's assets into the pyfilesystem static_fs, using a pool of num_workers
+        threads. Export all of the assets' attributes to the policy file policy_filename in policies_fs.
+        """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
-        for asset in assets:
+        pool = ThreadPool(num_workers)
+        try:
             # TODO: On 6/19/14, I had to put a try/except around this
             # to export a course. The course failed on JSON files in
             # the /static/ directory placed in it with an import.
@@ -161,12 +195,22 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            exports = pool.imap_unordered(
+                lambda asset_key: self.export_to_fs(asset_key, static_fs),
+                [asset['asset_key'] for asset in assets]
+            )
+            for __ in exports:
+                pass
+        finally:
+            pool.close()
+            pool.join()
+
+        for asset in assets:
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
 
-        with open(assets_policy_file, 'w') as f:
+        with policies_fs.open(policy_filename, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
     def get_all_content_thumbnails_for_course(self, course_key):
@@ -15,6 +15,8 @@ from lazy import lazy
 from xmodule.seq_module import SequenceDescriptor, SequenceModule
 from xmodule.graders import grader_from_conf
 from xmodule.tabs import CourseTabList
+from xmodule.modulestore.inheritance import InheritanceMixin, GroupAccessDict
+from xmodule.partitions.partitions import NoSuchUserPartitionError
 import json
 
 from xblock.fields import Scope, List, String, Dict, Boolean, Integer, Float
@@ -687,6 +689,64 @@ class CourseFields(object):
     )
 
 
+def _add_timezone_string(date_time):
+    """
+    Adds 'UTC' string to the end of start/end date and time texts.
+    """
+    return date_time + u" UTC"
+
+
+def course_start_datetime_text(course, i18n, format_string="SHORT_DATE"):
+    """
+    Returns the desired text corresponding the start date and time in UTC of `course` (a CourseDescriptor or a
+    CourseSummary), translated with the i18n service `i18n`.  Prefers .advertised_start, then falls back to .start
+    """
+    _ = i18n.ugettext
+    strftime = i18n.strftime
+
+    def try_parse_iso_8601(text):
+        try:
+            result = Date().from_json(text)
+            if result is None:
+                result = text.title()
+            else:
+                result = strftime(result, format_string)
+                if format_string == "DATE_TIME":
+                    result = _add_timezone_string(result)
+        except ValueError:
+            result = text.title()
+
+        return result
+
+    if isinstance(course.advertised_start, basestring):
+        return try_parse_iso_8601(course.advertised_start)
+    elif course.start_date_is_still_default:
+        # Translators: TBD stands for 'To Be Determined' and is used when a course
+        # does not yet have an announced start date.
+        return _('TBD')
+    else:
+        when = course.advertised_start or course.start
+
+        if format_string == "DATE_TIME":
+            return _add_timezone_string(strftime(when, format_string))
+
+        return strftime(when, format_string)
+
+
+def course_end_datetime_text(course, i18n, format_string="SHORT_DATE"):
+    """
+    Returns the end date or date_time of `course` (a CourseDescriptor or a CourseSummary) formatted as a string
+    with the i18n service `i18n`.
+
+    If the course does not have an end date set (course.end is None), an empty string will be returned.
+    """
+    if course.end is None:
+        return ''
+    else:
+        date_time = i18n.strftime(course.end, format_string)
+        return date_time if format_string == "SHORT_DATE" else _add_timezone_string(date_time)
+
+
 class CourseDescriptor(CourseFields, SequenceDescriptor):
     module_class = SequenceModule
 
@@ -1100,37 +1160,7 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
         Returns the desired text corresponding the course's start date and time in UTC.  Prefers .advertised_start,
         then falls back to .start
         """
-        i18n = self.runtime.service(self, "i18n")
-        _ = i18n.ugettext
-        strftime = i18n.strftime
-
-        def try_parse_iso_8601(text):
-            try:
-                result = Date().from_json(text)
-                if result is None:
-                    result = text.title()
-                else:
-                    result = strftime(result, format_string)
-                    if format_string == "DATE_TIME":
-                        result = self._add_timezone_string(result)
-            except ValueError:
-                result = text.title()
-
-            return result
-
-        if isinstance(self.advertised_start, basestring):
-            return try_parse_iso_8601(self.advertised_start)
-        elif self.start_date_is_still_default:
-            # Translators: TBD stands for 'To Be Determined' and is used when a course
-            # does not yet have an announced start date.
-            return _('TBD')
-        else:
-            when = self.advertised_start or self.start
-
-            if format_string == "DATE_TIME":
-                return self._add_timezone_string(strftime(when, format_string))
-
-            return strftime(when, format_string)
+        return course_start_datetime_text(self, self.runtime.service(self, "i18n"), format_string)
 
     @property
     def start_date_is_still_default(self):
@@ -1146,18 +1176,7 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
 
         If the course does not have an end date set (course.end is None), an empty string will be returned.
         """
-        if self.end is None:
-            return ''
-        else:
-            strftime = self.runtime.service(self, "i18n").strftime
-            date_time = strftime(self.end, format_string)
-            return date_time if format_string == "SHORT_DATE" else self._add_timezone_string(date_time)
-
-    def _add_timezone_string(self, date_time):
-        """
-        Adds 'UTC' string to the end of start/end date and time texts.
-        """
-        return date_time + u" UTC"
+        return course_end_datetime_text(self, self.runtime.service(self, "i18n"), format_string)
 
     @property
     def forum_posts_allowed(self):
@@ -1213,3 +1232,157 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
             self.video_upload_pipeline is not None and
             'course_video_upload_token' in self.video_upload_pipeline
         )
+
+
+class _LmsCourseFields(object):
+    """
+    The fields of courses that the LMS mixes into every block (see
+    lms_xblock.mixin.LmsBlockMixin), which course summaries read.
+    """
+    ispublic = Boolean(scope=Scope.settings)
+    group_access = GroupAccessDict(default={}, scope=Scope.settings)
+
+
+class CourseSummary(object):
+    """
+    The fields of a course that are needed to list it (e.g. on the student
+    dashboard) and to check access to it, read straight from the modulestore
+    without constructing the CourseDescriptor.  has_access accepts a summary
+    in place of its course.  See ModuleStoreRead.get_course_summaries.
+    """
+    # The settings fields of the course that are summarized
+    summary_fields = (
+        'display_name', 'display_coursenumber', 'display_organization',
+        'start', 'end', 'advertised_start', 'course_image', 'static_asset_path',
+        'visible_to_staff_only', 'days_early_for_beta', 'user_partitions', 'group_access', 'ispublic',
+        'invitation_only', 'pre_requisite_courses', 'mobile_available', 'catalog_visibility',
+        'enrollment_start', 'enrollment_end', 'enrollment_domain',
+        'certificates_display_behavior', 'certificates_show_before_end', 'end_of_course_survey_url',
+        'cert_name_short', 'cert_name_long',
+    )
+
+    # Courses have the class tags of CourseDescriptor, which has_access checks
+    _class_tags = CourseDescriptor._class_tags
+
+    def __init__(self, location, **fields):
+        self.location = location
+        for field_name in self.summary_fields:
+            setattr(self, field_name, fields.get(field_name, self._field(field_name).default))
+
+    @staticmethod
+    def _field(field_name):
+        """
+        Return the Field that the course field `field_name` is stored as.
+        """
+        for fields in (CourseFields, InheritanceMixin, _LmsCourseFields):
+            if hasattr(fields, field_name):
+                return getattr(fields, field_name)
+        raise AttributeError(field_name)
+
+    @classmethod
+    def from_json(cls, location, json_fields):
+        """
+        Summarize the course whose root block is at `location` from the json
+        values of its fields, as they are stored in the modulestore.  Fields
+        that aren't set get their defaults.
+        """
+        fields = {}
+        for field_name in cls.summary_fields:
+            if json_fields.get(field_name) is not None:
+                fields[field_name] = cls._field(field_name).from_json(json_fields[field_name])
+        return cls(location, **fields)
+
+    @classmethod
+    def from_course(cls, course):
+        """
+        Summarize the CourseDescriptor `course`.  The fields that aren't mixed
+        into it (e.g. those of the LMS outside of the LMS) get their defaults.
+        """
+        return cls(course.location, **{
+            field_name: getattr(course, field_name)
+            for field_name in cls.summary_fields if hasattr(course, field_name)
+        })
+
+    @property
+    def id(self):  # pylint: disable=invalid-name
+        return self.location.course_key
+
+    @property
+    def number(self):
+        return self.location.course
+
+    @property
+    def org(self):
+        return self.location.org
+
+    @property
+    def display_name_with_default(self):
+        """
+        Return the display name of the course, or its run if it has none.
+        """
+        name = self.display_name
+        if name is None:
+            name = self.location.name.replace('_', ' ')
+        return name.replace('<', '&lt;').replace('>', '&gt;')
+
+    @property
+    def display_number_with_default(self):
+        """
+        Return the display course number if it has been specified, otherwise the course's number.
+        """
+        return self.display_coursenumber or self.number
+
+    @property
+    def display_org_with_default(self):
+        """
+        Return the display organization if it has been specified, otherwise the course's org.
+        """
+        return self.display_organization or self.org
+
+    @property
+    def start_date_is_still_default(self):
+        """
+        Checks if the start date set for the course is still default, i.e. .start has not been modified,
+        and .advertised_start has not been set.
+        """
+        return self.advertised_start is None and self.start == CourseFields.start.default
+
+    @property
+    def merged_group_access(self):
+        """
+        The group_access rules of the course.  A course has no parents whose
+        rules would be merged into its own (see LmsBlockMixin.merged_group_access).
+        """
+        return self.group_access or {}
+
+    def _get_user_partition(self, user_partition_id):
+        """
+        Returns the user partition of the course with the specified id.  Raises
+        `NoSuchUserPartitionError` if the lookup fails.
+        """
+        for user_partition in self.user_partitions:
+            if user_partition.id == user_partition_id:
+                return user_partition
+
+        raise NoSuchUserPartitionError("could not find a UserPartition with ID [{}]".format(user_partition_id))
+
+    def may_certify(self):
+        """
+        Return True if it is acceptable to show the student a certificate download link
+        """
+        show_early = (
+            self.certificates_display_behavior in ('early_with_info', 'early_no_info') or
+            self.certificates_show_before_end
+        )
+        return show_early or self.has_ended()
+
+    def has_started(self):
+        return datetime.now(UTC()) > self.start
+
+    def has_ended(self):
+        """
+        Returns True if the current time is after the course end date, if it has one.
+        """
+        if self.end is None:
+            return False
+        return datetime.now(UTC()) > self.end
@@ -22,7 +22,7 @@ from abc import ABCMeta, abstractmethod
 from contracts import contract, new_contract
 from xblock.plugin import default_select
 
-from .exceptions import InvalidLocationError, InsufficientSpecificationError
+from .exceptions import InvalidLocationError, InsufficientSpecificationError, ItemNotFoundError
 from xmodule.errortracker import make_error_tracker
 from xmodule.assetstore import AssetMetadata
 from opaque_keys.edx.keys import CourseKey, UsageKey, AssetKey
@@ -992,6 +992,29 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
                 None
             )
 
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        Returns a dict mapping those of the given course keys whose courses exist
+        (and loaded without errors) to :class:`~xmodule.course_module.CourseSummary`s
+        of their courses.
+
+        Default impl--summarize each course's descriptor.  Stores that can read
+        the summarized fields without constructing the descriptors, or summarize
+        many courses in one query, override this.
+        """
+        from xmodule.course_module import CourseSummary
+        from xmodule.error_module import ErrorDescriptor
+
+        summaries = {}
+        for course_key in course_keys:
+            try:
+                course = self.get_course(course_key, depth=0, **kwargs)
+            except ItemNotFoundError:
+                continue
+            if course is not None and not isinstance(course, ErrorDescriptor):
+                summaries[course_key] = CourseSummary.from_course(course)
+        return summaries
+
     def has_published_version(self, xblock):
         """
         Returns True since this is a read-only store.
@@ -81,6 +81,28 @@ class ModuleStoreDraftAndPublished(BranchSettingMixin):
     def has_changes(self, xblock):
         raise NotImplementedError
 
+    def get_subtree_changes(self, xblock):
+        """
+        Returns a dict which maps the location of xblock, and of each of its descendants, to
+        whether has_changes is true for it.
+
+        Stores should override this to work it out in a single pass over the subtree, rather
+        than checking the subtree of every block in it.
+        """
+        subtree_changes = {}
+
+        def add_changes(block):
+            """
+            Adds the changes of block and of its descendants to subtree_changes.
+            """
+            subtree_changes[block.location] = self.has_changes(block)
+            if block.has_children:
+                for child in block.get_children():
+                    add_changes(child)
+
+        add_changes(xblock)
+        return subtree_changes
+
     @abstractmethod
     def publish(self, location, user_id):
         raise NotImplementedError
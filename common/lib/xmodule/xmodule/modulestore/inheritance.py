@@ -26,6 +26,17 @@ class UserPartitionList(List):
                 for user_partition in values]
 
 
+class GroupAccessDict(Dict):
+    """Special Dict class for serializing the group_access field"""
+    def from_json(self, access_dict):
+        if access_dict is not None:
+            return {int(k): access_dict[k] for k in access_dict}
+
+    def to_json(self, access_dict):
+        if access_dict is not None:
+            return {unicode(k): access_dict[k] for k in access_dict}
+
+
 class InheritanceMixin(XBlockMixin):
     """Field definitions for inheritable fields."""
 
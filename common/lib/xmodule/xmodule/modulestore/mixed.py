@@ -6,6 +6,7 @@ In this way, courses can be served up both - say - XMLModuleStore or MongoModule
 """
 
 import logging
+from collections import defaultdict
 from contextlib import contextmanager
 import itertools
 import functools
@@ -321,6 +322,38 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except ItemNotFoundError:
             return None
 
+    @strip_key
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        Returns a dict mapping those of the given course keys whose courses exist
+        to CourseSummaries of them.  Each store is asked once, for all of the
+        courses mapped to it and those not yet found in an earlier store.
+
+        :param course_keys: an iterable of CourseKeys
+        """
+        keys_by_store = defaultdict(list)
+        unmapped_keys = []
+        for course_key in course_keys:
+            assert isinstance(course_key, CourseKey)
+            mapping = self.mappings.get(self._clean_course_id_for_mapping(course_key))
+            if mapping is not None:
+                keys_by_store[mapping].append(course_key)
+            else:
+                unmapped_keys.append(course_key)
+
+        summaries = {}
+        for store in self.modulestores:
+            store_keys = keys_by_store.pop(store, []) + unmapped_keys
+            if not store_keys:
+                continue
+            store_summaries = store.get_course_summaries(store_keys, **kwargs)
+            for course_key in store_summaries:
+                if course_key in unmapped_keys:
+                    unmapped_keys.remove(course_key)
+                    self.mappings[self._clean_course_id_for_mapping(course_key)] = store
+            summaries.update(store_summaries)
+        return summaries
+
     @strip_key
     @contract(library_key='LibraryLocator')
     def get_library(self, library_key, depth=0, **kwargs):
@@ -846,6 +879,14 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(xblock.location.course_key, 'has_changes')
         return store.has_changes(xblock)
 
+    def get_subtree_changes(self, xblock):
+        """
+        Returns a dict which maps the location of xblock, and of each of its descendants, to
+        whether it has unpublished changes
+        """
+        store = self._verify_modulestore_support(xblock.location.course_key, 'get_subtree_changes')
+        return store.get_subtree_changes(xblock)
+
     def _verify_modulestore_support(self, course_key, method):
         """
         Finds and returns the store that contains the course for the given location, and verifying
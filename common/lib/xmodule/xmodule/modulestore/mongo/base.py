@@ -15,7 +15,6 @@ structure:
 import pymongo
 import sys
 import logging
-import copy
 import re
 from uuid import uuid4
 
@@ -39,6 +38,7 @@ from xblock.fields import Scope, ScopeIds, Reference, ReferenceList, ReferenceVa
 from xblock.runtime import KvsFieldData
 
 from xmodule.assetstore import AssetMetadata, CourseAssetsFromStorage
+from xmodule.course_module import CourseSummary
 from xmodule.error_module import ErrorDescriptor
 from xmodule.errortracker import null_error_tracker, exc_info_to_str
 from xmodule.exceptions import HeartbeatFailure
@@ -89,6 +89,102 @@ class InvalidWriteError(Exception):
     pass
 
 
+class MetadataInheritanceTree(object):
+    """
+    The metadata that the blocks of a course inherit, and the parent of each
+    block, for one branch.
+
+    Only the inheritable metadata set on each container is stored, along with
+    each block's parent; what a block inherits is resolved by walking up the
+    parents, and memoized per container. That keeps the pickled form (which is
+    cached in the metadata_inheritance_cache_subsystem) small, and lets a
+    change to one container's metadata be applied without recomputing the
+    whole tree.
+
+    Blocks are identified by their published location, as unicode strings.
+    """
+    def __init__(self, branch, metadata, children, parents):
+        """
+        branch: the branch setting the tree was computed for
+        metadata: dict of container url -> its own inheritable metadata
+        children: dict of container url -> list of its children's urls
+        parents: dict of url -> url of its parent, for every block but the root
+        """
+        self.branch = branch
+        self._metadata = metadata
+        self._children = children
+        self._parents = parents
+        # container url -> metadata inherited by (and set on) the container
+        self._inherited = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_inherited']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._inherited = {}
+
+    def __len__(self):
+        return len(self._parents)
+
+    def __nonzero__(self):
+        # A tree is never empty, even if it has no blocks but the root, so it
+        # isn't mistaken for a missing one when it's looked up in a cache
+        return True
+
+    def get(self, url, default=None):
+        """
+        Return the metadata that the block at `url` inherits, with its parent
+        under the 'parent' key (as {branch: parent url}), or `default` if the
+        block isn't in the tree.
+
+        Containers' own metadata is included, as if they inherited it.
+        """
+        parent = self._parents.get(url)
+        if parent is None:
+            return default
+        inherited = dict(self._inherited_by(url if url in self._metadata else parent))
+        inherited['parent'] = {self.branch: parent}
+        return inherited
+
+    def _inherited_by(self, url):
+        """
+        Return the metadata inherited by the container at `url`, merged with its own.
+        """
+        # Find the closest ancestor whose metadata is already resolved
+        unresolved = []
+        while url is not None and url not in self._inherited:
+            unresolved.append(url)
+            url = self._parents.get(url)
+        inherited = self._inherited[url] if url is not None else {}
+
+        for container in reversed(unresolved):
+            inherited = dict(inherited)
+            inherited.update(self._metadata.get(container, {}))
+            self._inherited[container] = inherited
+        return inherited
+
+    def update_container(self, url, metadata, children):
+        """
+        Replace the inheritable metadata of the container at `url`.
+
+        Only changes to metadata can be applied: return False, leaving the tree
+        unchanged, if the container isn't in the tree or its children changed.
+        """
+        if url not in self._metadata or set(children) != set(self._children[url]):
+            return False
+
+        self._metadata[url] = {
+            field_name: value for field_name, value in metadata.iteritems()
+            if field_name in InheritanceMixin.fields
+        }
+        # Any container below this one may have inherited the old values
+        self._inherited.clear()
+        return True
+
+
 class MongoKeyValueStore(InheritanceKeyValueStore):
     """
     A KeyValueStore that maps keyed data access to one of the 3 data areas
@@ -678,38 +774,24 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             if location.category == 'course':
                 root = location_url
 
-        # now traverse the tree and compute down the inherited metadata
-        metadata_to_inherit = {}
-
-        def _compute_inherited_metadata(url):
-            """
-            Helper method for computing inherited metadata for a specific location url
-            """
-            my_metadata = results_by_url[url].get('metadata', {})
-
-            # go through all the children and recurse, but only if we have
-            # in the result set. Remember results will not contain leaf nodes
-            for child in results_by_url[url].get('definition', {}).get('children', []):
-                if child in results_by_url:
-                    new_child_metadata = copy.deepcopy(my_metadata)
-                    new_child_metadata.update(results_by_url[child].get('metadata', {}))
-                    results_by_url[child]['metadata'] = new_child_metadata
-                    metadata_to_inherit[child] = new_child_metadata
-                    _compute_inherited_metadata(child)
-                else:
-                    # this is likely a leaf node, so let's record what metadata we need to inherit
-                    metadata_to_inherit[child] = my_metadata.copy()
-                # WARNING: 'parent' is not part of inherited metadata, but
-                # we're piggybacking on this recursive traversal to grab
-                # and cache the child's parent, as a performance optimization.
-                # The 'parent' key will be popped out of the dictionary during
-                # CachingDescriptorSystem.load_item
-                metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
-
+        # now traverse the tree from the root, recording the parent of each block and
+        # the metadata of each container. Remember results will not contain leaf nodes
+        metadata = {}
+        children = {}
+        parents = {}
         if root is not None:
-            _compute_inherited_metadata(root)
-
-        return metadata_to_inherit
+            metadata[root] = results_by_url[root].get('metadata', {})
+            to_visit = [root]
+            while to_visit:
+                url = to_visit.pop()
+                children[url] = list(results_by_url[url].get('definition', {}).get('children', []))
+                for child in children[url]:
+                    parents[child] = url
+                    if child in results_by_url and child not in metadata:
+                        metadata[child] = results_by_url[child].get('metadata', {})
+                        to_visit.append(child)
+
+        return MetadataInheritanceTree(self.get_branch_setting(), metadata, children, parents)
 
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
@@ -752,21 +834,50 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         return tree
 
-    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
+    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None, changed_item=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
         for location
 
         If given a runtime, it replaces the cached_metadata in that runtime. NOTE: failure to provide
         a runtime may mean that some objects report old values for inherited data.
+
+        If the refresh is due to a single item being saved, `changed_item` is a tuple
+        (location, metadata, children) of what was saved, which is used to update the cached
+        tree in place when possible, rather than computing it again.
         """
         course_id = course_id.for_branch(None)
         if not self._is_in_bulk_operation(course_id):
-            # below is done for side effects when runtime is None
-            cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+            cached_metadata = None
+            if changed_item is not None:
+                cached_metadata = self._update_cached_metadata_inheritance_tree(course_id, *changed_item)
+            if cached_metadata is None:
+                # below is done for side effects when runtime is None
+                cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
             if runtime:
                 runtime.cached_metadata = cached_metadata
 
+    def _update_cached_metadata_inheritance_tree(self, course_id, location, metadata, children):
+        """
+        Update the cached metadata inheritance tree for the saved item at `location`, and return
+        it, or return None if the tree has to be computed again.
+        """
+        tree = self._get_cached_metadata_inheritance_tree(course_id)
+        if not isinstance(tree, MetadataInheritanceTree):
+            # cached by an older version of this modulestore
+            return None
+
+        if children is None:
+            # What leaves inherit only depends on their containers
+            return tree
+
+        if not tree.update_container(unicode(as_published(location)), metadata, children):
+            return None
+
+        if self.metadata_inheritance_cache_subsystem is not None:
+            self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+        return tree
+
     def _clean_item_data(self, item):
         """
         Renames the '_id' field in item to 'location'
@@ -945,6 +1056,31 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         except ItemNotFoundError:
             return None
 
+    @autoretry_read()
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        Summarize the courses with the given keys from the metadata of their
+        course items, fetched in one round-trip.
+        """
+        locations = {}
+        for course_key in course_keys:
+            if isinstance(course_key, LibraryLocator) or not course_key.deprecated:
+                continue  # Only deprecated (org/course/run) keys can be stored in this modulestore
+            full_key = self.fill_in_run(course_key)
+            location = full_key.make_usage_key('course', full_key.run)
+            locations[(location.org, location.course, location.name)] = (course_key, location)
+        if not locations:
+            return {}
+
+        query = {'_id': {'$in': [location.to_deprecated_son() for __, location in locations.itervalues()]}}
+        fields = {'_id': True}
+        fields.update(('metadata.{}'.format(field_name), True) for field_name in CourseSummary.summary_fields)
+        summaries = {}
+        for item in self.collection.find(query, fields=fields):
+            course_key, location = locations[(item['_id']['org'], item['_id']['course'], item['_id']['name'])]
+            summaries[course_key] = CourseSummary.from_json(location, item.get('metadata', {}))
+        return summaries
+
     def has_course(self, course_key, ignore_case=False, **kwargs):
         """
         Returns the course_id of the course if it was found, else None
@@ -1349,7 +1485,10 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             xblock._edit_info = payload['edit_info']
 
             # recompute (and update) the metadata inheritance tree which is cached
-            self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
+            self.refresh_cached_metadata_inheritance_tree(
+                xblock.scope_ids.usage_id.course_key, xblock.runtime,
+                changed_item=(xblock.location, payload['metadata'], payload.get('definition.children'))
+            )
             # fire signal that we've written to DB
         except ItemNotFoundError:
             if not allow_not_found:
@@ -632,6 +632,34 @@ class DraftModuleStore(MongoModuleStore):
         else:
             return False
 
+    def get_subtree_changes(self, xblock):
+        """
+        Returns a dict which maps the location of xblock, and of each of its descendants, to
+        has_changes of it, working up from the leaves so that each block is only visited once.
+        """
+        subtree_changes = {}
+
+        def add_changes(block):
+            """
+            Adds the changes of block and of its descendants to subtree_changes, and returns
+            those of block.
+            """
+            children = block.get_children() if block.has_children else []
+            # visit every child, even under a draft, so that all of the subtree is mapped
+            children_changed = [add_changes(child) for child in children]
+            if getattr(block, 'is_draft', False):
+                has_changes = True
+            elif block.has_children:
+                # as in has_changes, dangling pointers imply a change
+                has_changes = len(block.children) > len(children) or any(children_changed)
+            else:
+                has_changes = False
+            subtree_changes[block.location] = has_changes
+            return has_changes
+
+        add_changes(xblock)
+        return subtree_changes
+
     def publish(self, location, user_id, **kwargs):
         """
         Publish the subtree rooted at location to the live course and remove the drafts.
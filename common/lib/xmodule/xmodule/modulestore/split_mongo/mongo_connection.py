@@ -1,7 +1,11 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
+import cPickle as pickle
 import re
+import threading
+import zlib
+from collections import OrderedDict
 from mongodb_proxy import autoretry_read, MongoProxy
 import pymongo
 
@@ -12,8 +16,12 @@ from contracts import check
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore.split_mongo import BlockKey
 import datetime
+import logging
 import pytz
 
+log = logging.getLogger(__name__)
+
+
 
 def structure_from_mongo(structure):
     """
@@ -66,17 +74,170 @@ def structure_to_mongo(structure):
     return new_structure
 
 
+class StructureCache(object):
+    """
+    LRU cache of decoded structures, keyed by their version guid (``_id``).
+
+    Structures are never modified once they have been saved, so entries never
+    need to be invalidated, and the cache can be shared by every request (and
+    thread) in the process. Callers must treat the structures they get from it
+    as read-only, as they already do with structures from the database (see
+    ``SplitMongoModuleStore.version_structure``).
+
+    The size of a structure is estimated by the length of its pickled form.
+    Least recently used structures are evicted once the total size of the
+    cached structures exceeds ``max_size`` bytes.
+
+    If a ``shared_cache`` (such as a memcached-backed django cache) is given,
+    structures missing from memory are looked up there before going to the
+    database. They are stored there pickled and zlib-compressed.
+    """
+    def __init__(self, max_size, shared_cache=None):
+        self.max_size = max_size
+        self.shared_cache = shared_cache
+        self._lock = threading.RLock()
+        self._structures = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _shared_key(key):
+        """
+        Return the key to use for the structure with the given ``_id`` in the
+        shared cache.
+        """
+        return u'split-structure-{}'.format(key)
+
+    def get(self, key):
+        """
+        Return the structure whose ``_id`` is ``key``, or None if it isn't cached.
+        """
+        with self._lock:
+            entry = self._structures.pop(key, None)
+            if entry is not None:
+                # Re-insert to mark the structure as the most recently used
+                self._structures[key] = entry
+                self.hits += 1
+                return entry[0]
+
+        if self.shared_cache is not None:
+            data = self.shared_cache.get(self._shared_key(key))
+            if data is not None:
+                pickled = zlib.decompress(data)
+                structure = pickle.loads(pickled)
+                self._add(key, structure, len(pickled))
+                with self._lock:
+                    self.shared_hits += 1
+                return structure
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, structure):
+        """
+        Cache ``structure`` under its ``_id``, ``key``.
+        """
+        pickled = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
+        self._add(key, structure, len(pickled))
+        if self.shared_cache is not None:
+            # Level 1 is the fastest, with only slightly larger results.
+            # Structures that are too big for the shared cache are simply
+            # not stored there.
+            self.shared_cache.set(self._shared_key(key), zlib.compress(pickled, 1))
+
+    def _add(self, key, structure, size):
+        """
+        Add ``structure`` to the in-memory cache, evicting the least recently
+        used structures until the cache fits in ``max_size`` again.
+        """
+        if size > self.max_size:
+            log.warning(u"Structure %s (%d bytes) is too big to be cached", key, size)
+            return
+
+        with self._lock:
+            previous = self._structures.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._structures[key] = (structure, size)
+            self.size += size
+            while self.size > self.max_size:
+                __, (__, evicted_size) = self._structures.popitem(last=False)
+                self.size -= evicted_size
+
+    def clear(self):
+        """
+        Empty the in-memory cache. The shared cache, if any, is left untouched.
+        """
+        with self._lock:
+            self._structures.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        Return a dict of statistics about the cache's usage.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'entries': len(self._structures),
+                'size': self.size,
+                'max_size': self.max_size,
+            }
+
+
+_structure_cache = None
+_structure_cache_lock = threading.Lock()
+
+
+def _get_shared_structure_cache():
+    """
+    Return the django cache named 'course_structure_cache', or None if there
+    is no such cache (or django isn't configured).
+    """
+    try:
+        from django.core.cache import get_cache, InvalidCacheBackendError
+    except ImportError:
+        return None
+
+    try:
+        return get_cache('course_structure_cache')
+    except InvalidCacheBackendError:
+        return None
+
+
+def get_structure_cache(max_size):
+    """
+    Return the process-wide StructureCache, creating it on first use with the
+    given ``max_size``.
+    """
+    global _structure_cache  # pylint: disable=global-statement
+    with _structure_cache_lock:
+        if _structure_cache is None:
+            _structure_cache = StructureCache(max_size, _get_shared_structure_cache())
+        return _structure_cache
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_cache=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        If a ``structure_cache`` (a :class:`StructureCache`) is given, structures
+        are looked up there before being fetched from the database.
         """
+        self.structure_cache = structure_cache
+
         self.database = MongoProxy(
             pymongo.database.Database(
                 pymongo.MongoClient(
@@ -118,7 +279,14 @@ class MongoConnection(object):
         """
         Get the structure from the persistence mechanism whose id is the given key
         """
-        return structure_from_mongo(self.structures.find_one({'_id': key}))
+        if self.structure_cache is None:
+            return structure_from_mongo(self.structures.find_one({'_id': key}))
+
+        structure = self.structure_cache.get(key)
+        if structure is None:
+            structure = structure_from_mongo(self.structures.find_one({'_id': key}))
+            self.structure_cache.set(key, structure)
+        return structure
 
     @autoretry_read()
     def find_structures_by_id(self, ids):
@@ -128,7 +296,24 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        return [structure_from_mongo(structure) for structure in self.structures.find({'_id': {'$in': ids}})]
+        if self.structure_cache is None:
+            return [structure_from_mongo(structure) for structure in self.structures.find({'_id': {'$in': ids}})]
+
+        structures = []
+        missing_ids = []
+        for structure_id in ids:
+            structure = self.structure_cache.get(structure_id)
+            if structure is None:
+                missing_ids.append(structure_id)
+            else:
+                structures.append(structure)
+
+        if missing_ids:
+            for structure in self.structures.find({'_id': {'$in': missing_ids}}):
+                structure = structure_from_mongo(structure)
+                self.structure_cache.set(structure['_id'], structure)
+                structures.append(structure)
+        return structures
 
     @autoretry_read()
     def find_structures_derived_from(self, ids):
@@ -206,6 +391,43 @@ class MongoConnection(object):
 
         return self.course_index.find(query)
 
+    @autoretry_read()
+    def find_course_indexes(self, keys):
+        """
+        Return the course_indexes of all of the given course keys that have one.
+        """
+        query = {'$or': [
+            {key_attr: getattr(key, key_attr) for key_attr in ('org', 'course', 'run')}
+            for key in keys
+        ]}
+        return list(self.course_index.find(query))
+
+    @autoretry_read()
+    def find_root_blocks(self, ids, block_type):
+        """
+        Return a dict mapping each of the structure ids in ``ids`` that exists to
+        its root (a BlockKey) and root block, without fetching the rest of the
+        structures.  Only the first block of type ``block_type`` is fetched, so
+        the root block is None if the root is of another type.
+
+        Arguments:
+            ids (list): A list of structure ids
+            block_type (str): The type of the root blocks
+        """
+        root_blocks = {}
+        structures = self.structures.find(
+            {'_id': {'$in': ids}},
+            fields={'root': True, 'blocks': {'$elemMatch': {'block_type': block_type}}},
+        )
+        for structure in structures:
+            root = BlockKey(*structure['root'])
+            root_block = next(
+                (block for block in structure.get('blocks', []) if block['block_id'] == root.id),
+                None
+            )
+            root_blocks[structure['_id']] = (root, root_block)
+        return root_blocks
+
     def insert_course_index(self, course_index):
         """
         Create the course_index in the db
@@ -78,10 +78,11 @@ from xmodule.modulestore import (
 
 from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError, get_structure_cache
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.course_module import CourseSummary
 from xmodule.error_module import ErrorDescriptor
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from types import NoneType
 from xmodule.assetstore import AssetMetadata
 
@@ -109,6 +110,12 @@ log = logging.getLogger(__name__)
 # When blacklists are this, all children should be excluded
 EXCLUDE_ALL = '*'
 
+# Maximum number of structures whose parent index is kept in memory
+PARENT_INDEX_CACHE_SIZE = 32
+
+# Maximum number of structures whose course summary fields are kept in memory
+COURSE_SUMMARY_CACHE_SIZE = 1000
+
 
 new_contract('BlockUsageLocator', BlockUsageLocator)
 new_contract('BlockKey', BlockKey)
@@ -608,20 +615,33 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, **kwargs):
+                 services=None, structure_cache_size=None, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param structure_cache_size: if set, structures are kept in a process-wide cache of (at most)
+            that many bytes, shared by all split modulestores, rather than being fetched from the
+            database each time they're needed.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
 
-        self.db_connection = MongoConnection(**doc_store_config)
+        structure_cache = get_structure_cache(structure_cache_size) if structure_cache_size else None
+        self.db_connection = MongoConnection(structure_cache=structure_cache, **doc_store_config)
         self.db = self.db_connection.database
 
         # Code review question: How should I expire entries?
         # _add_cache could use a lru mechanism to control the cache size?
         self.thread_cache = threading.local()
 
+        # LRU of the parent indexes of saved structures, keyed by version guid. See _get_parent_index.
+        self._parent_indexes = OrderedDict()
+        self._parent_indexes_lock = threading.Lock()
+
+        # LRU of the root and summary fields of saved structures, keyed by version guid.
+        # See get_course_summaries.
+        self._course_summary_fields = OrderedDict()
+        self._course_summary_fields_lock = threading.Lock()
+
         if default_class is not None:
             module_path, __, class_name = default_class.rpartition('.')
             class_ = getattr(import_module(module_path), class_name)
@@ -664,6 +684,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         connection = self.db.connection
         connection.drop_database(self.db.name)
         connection.close()
+        if self.db_connection.structure_cache is not None:
+            self.db_connection.structure_cache.clear()
 
     def cache_items(self, system, base_block_ids, course_key, depth=0, lazy=True):
         '''
@@ -892,6 +914,111 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         return self._get_structures_for_branch_and_locator(branch, self._create_library_locator, **kwargs)
 
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        Summarize the courses with the given keys (which must name their branches)
+        from the fields of their root blocks, without loading the courses.
+
+        The indexes of all of the courses are read in one query, and the root blocks
+        of those of their structures which haven't been summarized before in another.
+        The summaries are cached by structure version, so courses aren't read again
+        until they're changed.
+        """
+        course_keys = [
+            course_key for course_key in course_keys
+            if isinstance(course_key, CourseLocator) and not course_key.deprecated and
+            not isinstance(course_key, LibraryLocator) and course_key.branch is not None
+        ]
+        if not course_keys:
+            return {}
+
+        indexes = {}
+        unindexed_keys = []
+        for course_key in course_keys:
+            if self._is_in_bulk_operation(course_key):
+                indexes[course_key] = self._get_bulk_ops_record(course_key).index
+            else:
+                unindexed_keys.append(course_key)
+        if unindexed_keys:
+            found_indexes = {
+                (index['org'], index['course'], index['run']): index
+                for index in self.db_connection.find_course_indexes(unindexed_keys)
+            }
+            for course_key in unindexed_keys:
+                indexes[course_key] = found_indexes.get((course_key.org, course_key.course, course_key.run))
+
+        version_guids = {}
+        for course_key, index in indexes.iteritems():
+            if index is None or course_key.branch not in index['versions']:
+                continue
+            version_guid = index['versions'][course_key.branch]
+            if course_key.version_guid is not None and course_key.version_guid != version_guid:
+                continue
+            version_guids[course_key] = version_guid
+
+        summary_fields = self._get_course_summary_fields(version_guids)
+        summaries = {}
+        for course_key, version_guid in version_guids.iteritems():
+            if version_guid in summary_fields:
+                root, fields = summary_fields[version_guid]
+                location = course_key.replace(version_guid=version_guid).make_usage_key(root.type, root.id)
+                summaries[course_key] = CourseSummary.from_json(location, fields)
+        return summaries
+
+    def _get_course_summary_fields(self, version_guids):
+        """
+        Return a dict mapping the version guids of those of the structures of the
+        course keys in ``version_guids`` that exist and have course roots to their
+        (root BlockKey, summarized root fields).
+        """
+        summary_fields = {}
+        missing_ids = set()
+        with self._course_summary_fields_lock:
+            for version_guid in version_guids.itervalues():
+                entry = self._course_summary_fields.pop(version_guid, None)
+                if entry is not None:
+                    # Re-insert to mark the entry as the most recently used
+                    self._course_summary_fields[version_guid] = entry
+                    summary_fields[version_guid] = entry
+                else:
+                    missing_ids.add(version_guid)
+
+        # Structures in bulk operations may not be saved yet, and can still change, so they aren't cached
+        for course_key, version_guid in version_guids.iteritems():
+            if version_guid in missing_ids and self._is_in_bulk_operation(course_key):
+                missing_ids.discard(version_guid)
+                structure = self.get_structure(course_key, version_guid)
+                if structure is not None and structure['root'].type == 'course':
+                    summary_fields[version_guid] = self._summarize_root(
+                        structure['root'], structure['blocks'].get(structure['root'])
+                    )
+
+        if not missing_ids:
+            return summary_fields
+
+        root_blocks = self.db_connection.find_root_blocks(list(missing_ids), 'course')
+        with self._course_summary_fields_lock:
+            for version_guid, (root, root_block) in root_blocks.iteritems():
+                if root.type != 'course' or root_block is None:
+                    continue
+                entry = self._summarize_root(root, root_block)
+                summary_fields[version_guid] = entry
+                self._course_summary_fields[version_guid] = entry
+            while len(self._course_summary_fields) > COURSE_SUMMARY_CACHE_SIZE:
+                self._course_summary_fields.popitem(last=False)
+        return summary_fields
+
+    @staticmethod
+    def _summarize_root(root, root_block):
+        """
+        Return the (root, fields) entry for a course summary of a structure.
+        """
+        fields = root_block['fields'] if root_block is not None else {}
+        return root, {
+            field_name: fields[field_name]
+            for field_name in CourseSummary.summary_fields if field_name in fields
+        }
+
     def make_course_key(self, org, course, run):
         """
         Return a valid :class:`~opaque_keys.edx.keys.CourseKey` for this modulestore
@@ -1070,7 +1197,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        parent_ids = self._get_parents(locator.course_key, BlockKey.from_usage_key(locator), course.structure)
         if len(parent_ids) == 0:
             return None
         # find alphabetically least
@@ -2076,7 +2203,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             for subtree_root in subtree_list:
                 if BlockKey.from_usage_key(subtree_root) != source_structure['root']:
                     # find the parents and put root in the right sequence
-                    parents = self._get_parents_from_structure(BlockKey.from_usage_key(subtree_root), source_structure)
+                    parents = self._get_parents(source_course, BlockKey.from_usage_key(subtree_root), source_structure)
                     for parent in parents:
                         if parent not in destination_blocks:
                             raise ItemNotFoundError(parent)
@@ -2298,7 +2425,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             new_structure = self.version_structure(usage_locator.course_key, original_structure, user_id)
             new_blocks = new_structure['blocks']
             new_id = new_structure['_id']
-            parent_block_keys = self._get_parents_from_structure(block_key, original_structure)
+            parent_block_keys = self._get_parents(usage_locator.course_key, block_key, original_structure)
             for parent_block_key in parent_block_keys:
                 parent_block = new_blocks[parent_block_key]
                 parent_block['fields']['children'].remove(block_key)
@@ -2799,6 +2926,55 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             if block_key in value['fields'].get('children', [])
         ]
 
+    @contract(block_key=BlockKey)
+    def _get_parents(self, course_key, block_key, structure):
+        """
+        Same as _get_parents_from_structure, but uses the parent index of
+        ``structure`` (the structure of ``course_key``) when it has one.
+        """
+        parent_index = self._get_parent_index(course_key, structure)
+        if parent_index is None:
+            return self._get_parents_from_structure(block_key, structure)
+        # Return a copy, so that callers can't alter the cached index
+        return list(parent_index.get(block_key, []))
+
+    def _get_parent_index(self, course_key, structure):
+        """
+        Return a dict which maps the BlockKey of each block in ``structure`` that
+        has a parent to the list of its parents' BlockKeys, in the same order
+        as _get_parents_from_structure would find them.
+
+        Saved structures never change, so their index is built once and cached
+        by version guid. Returns None for structures which are being edited
+        in an active bulk operation on ``course_key``, as those can still change.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        version_guid = structure['_id']
+        if bulk_write_record.active and version_guid not in bulk_write_record.structures_in_db:
+            return None
+
+        with self._parent_indexes_lock:
+            parent_index = self._parent_indexes.pop(version_guid, None)
+            if parent_index is not None:
+                # Re-insert to mark the index as the most recently used
+                self._parent_indexes[version_guid] = parent_index
+                return parent_index
+
+        parent_index = defaultdict(list)
+        for parent_block_key, value in structure['blocks'].iteritems():
+            for child in value['fields'].get('children', []):
+                parents = parent_index[BlockKey(*child)]
+                # A block may list the same child more than once
+                if not parents or parents[-1] != parent_block_key:
+                    parents.append(parent_block_key)
+        parent_index = dict(parent_index)
+
+        with self._parent_indexes_lock:
+            self._parent_indexes[version_guid] = parent_index
+            while len(self._parent_indexes) > PARENT_INDEX_CACHE_SIZE:
+                self._parent_indexes.popitem(last=False)
+        return parent_index
+
     def _sync_children(self, source_parent, destination_parent, new_child):
         """
         Reorder destination's children to the same as source's and remove any no longer in source.
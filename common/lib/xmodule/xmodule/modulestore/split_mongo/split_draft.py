@@ -57,6 +57,20 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         course_id = self._map_revision_to_branch(course_id)
         return super(DraftVersioningModuleStore, self).get_course(course_id, depth=depth, **kwargs)
 
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        Summarizes the courses on the branches of their keys, or on the Draft or
+        Published branch depending on the branch setting.
+        """
+        branch_keys = {
+            self._map_revision_to_branch(course_key): course_key
+            for course_key in course_keys
+            # Other keys can't possibly be stored in this modulestore
+            if isinstance(course_key, CourseLocator) and not course_key.deprecated
+        }
+        summaries = super(DraftVersioningModuleStore, self).get_course_summaries(branch_keys.keys(), **kwargs)
+        return {branch_keys[branch_key]: summary for branch_key, summary in summaries.iteritems()}
+
     def get_library(self, library_id, depth=0, **kwargs):
         library_id = self._map_revision_to_branch(library_id)
         return super(DraftVersioningModuleStore, self).get_library(library_id, depth=depth, **kwargs)
@@ -328,6 +342,38 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
 
+    def get_subtree_changes(self, xblock):
+        """
+        Returns a dict which maps the location of xblock, and of each of its descendants, to
+        has_changes of it, comparing each block's draft and published versions only once.
+        """
+        course_key = xblock.location.course_key
+        draft_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.draft)).structure
+        published_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.published)).structure
+        subtree_changes = {}
+
+        def add_changes(block_key):
+            """
+            Adds the changes of the block and of its descendants to subtree_changes, and returns
+            those of the block.
+            """
+            draft_block = self._get_block_from_structure(draft_course, block_key)
+            published_block = self._get_block_from_structure(published_course, block_key)
+            children = draft_block.setdefault('fields', {}).get('children', []) if draft_block is not None else []
+            # visit every child, even under a changed block, so that all of the subtree is mapped
+            children_changed = [add_changes(child_block_key) for child_block_key in children]
+            has_changes = (
+                draft_block is None or  # temporary fix for bad pointers TNL-1141
+                published_block is None or
+                self._get_version(draft_block) != self._get_version(published_block) or
+                any(children_changed)
+            )
+            subtree_changes[course_key.make_usage_key(block_key.type, block_key.id)] = has_changes
+            return has_changes
+
+        add_changes(BlockKey.from_usage_key(xblock.location))
+        return subtree_changes
+
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
@@ -0,0 +1,111 @@
+"""
+Tests of the metadata inheritance tree of the old Mongo modulestore.
+"""
+import cPickle as pickle
+import unittest
+
+from xmodule.modulestore.mongo.base import MetadataInheritanceTree
+
+
+COURSE = u'i4x://org/course/course/run'
+CHAPTER = u'i4x://org/course/chapter/chapter'
+SEQUENTIAL = u'i4x://org/course/sequential/sequential'
+PROBLEM = u'i4x://org/course/problem/problem'
+HTML = u'i4x://org/course/html/html'
+
+
+def _tree():
+    """
+    Return the tree of a course with a chapter, a sequential, and two leaves.
+    """
+    return MetadataInheritanceTree(
+        'draft-preferred',
+        {
+            COURSE: {'graceperiod': '1 day', 'showanswer': 'always'},
+            CHAPTER: {'start': '2014-01-01T00:00'},
+            SEQUENTIAL: {'showanswer': 'never'},
+        },
+        {
+            COURSE: [CHAPTER, HTML],
+            CHAPTER: [SEQUENTIAL],
+            SEQUENTIAL: [PROBLEM],
+        },
+        {
+            CHAPTER: COURSE,
+            HTML: COURSE,
+            SEQUENTIAL: CHAPTER,
+            PROBLEM: SEQUENTIAL,
+        },
+    )
+
+
+class TestMetadataInheritanceTree(unittest.TestCase):
+    """
+    Tests of MetadataInheritanceTree.
+    """
+    def test_inherited_metadata(self):
+        tree = _tree()
+        self.assertEqual(
+            tree.get(PROBLEM),
+            {
+                'graceperiod': '1 day',
+                'showanswer': 'never',
+                'start': '2014-01-01T00:00',
+                'parent': {'draft-preferred': SEQUENTIAL},
+            }
+        )
+        self.assertEqual(
+            tree.get(HTML),
+            {'graceperiod': '1 day', 'showanswer': 'always', 'parent': {'draft-preferred': COURSE}}
+        )
+        self.assertEqual(
+            tree.get(CHAPTER),
+            {
+                'graceperiod': '1 day',
+                'showanswer': 'always',
+                'start': '2014-01-01T00:00',
+                'parent': {'draft-preferred': COURSE},
+            }
+        )
+
+    def test_root_and_unknown_blocks(self):
+        tree = _tree()
+        self.assertIsNone(tree.get(COURSE))
+        self.assertEqual(tree.get(u'i4x://org/course/html/missing', {}), {})
+        self.assertEqual(len(tree), 4)
+
+    def test_returned_metadata_is_a_copy(self):
+        tree = _tree()
+        tree.get(PROBLEM).pop('parent')
+        tree.get(PROBLEM)['showanswer'] = 'always'
+        self.assertEqual(tree.get(PROBLEM)['showanswer'], 'never')
+        self.assertIn('parent', tree.get(PROBLEM))
+
+    def test_pickle(self):
+        tree = _tree()
+        tree.get(PROBLEM)
+        unpickled = pickle.loads(pickle.dumps(tree, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(unpickled._inherited, {})  # pylint: disable=protected-access
+        for url in (CHAPTER, SEQUENTIAL, PROBLEM, HTML):
+            self.assertEqual(unpickled.get(url), tree.get(url))
+
+    def test_update_container(self):
+        tree = _tree()
+        tree.get(PROBLEM)
+        self.assertTrue(tree.update_container(
+            CHAPTER, {'start': '2015-01-01T00:00', 'display_name': 'Chapter'}, [SEQUENTIAL]
+        ))
+        self.assertEqual(tree.get(PROBLEM)['start'], '2015-01-01T00:00')
+        # Metadata that isn't inherited isn't kept
+        self.assertNotIn('display_name', tree.get(SEQUENTIAL))
+
+    def test_update_container_with_new_children(self):
+        tree = _tree()
+        self.assertFalse(tree.update_container(CHAPTER, {'start': '2015-01-01T00:00'}, []))
+        self.assertFalse(tree.update_container(PROBLEM, {'start': '2015-01-01T00:00'}, []))
+        self.assertEqual(tree.get(PROBLEM)['start'], '2014-01-01T00:00')
+
+    def test_tree_of_empty_course_is_true(self):
+        tree = MetadataInheritanceTree('draft-preferred', {COURSE: {}}, {COURSE: []}, {})
+        self.assertEqual(len(tree), 0)
+        self.assertTrue(tree)
@@ -557,6 +557,25 @@ class TestMixedModuleStore(CourseComparisonTest):
         for key in locations:
             self.assertFalse(self._has_changes(locations[key]))
 
+    @ddt.data('draft', 'split')
+    def test_get_subtree_changes(self, default_ms):
+        """
+        Tests that get_subtree_changes() maps every block of the subtree to its has_changes()
+        """
+        locations = self.setup_has_changes(default_ms)
+        child = self.store.get_item(locations['child'])
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        grandparent = self.store.get_item(locations['grandparent'], depth=None)
+        subtree_changes = self.store.get_subtree_changes(grandparent)
+        for key in locations:
+            self.assertEqual(
+                subtree_changes[self.store.get_item(locations[key]).location], self._has_changes(locations[key])
+            )
+        self.assertTrue(subtree_changes[grandparent.location])
+        self.assertFalse(subtree_changes[self.store.get_item(locations['parent_sibling']).location])
+
     @ddt.data('draft', 'split')
     def test_has_changes_publish_ancestors(self, default_ms):
         """
@@ -840,6 +859,35 @@ class TestMixedModuleStore(CourseComparisonTest):
             published_courses = self.store.get_courses(remove_branch=True)
         self.assertEquals([c.id for c in draft_courses], [c.id for c in published_courses])
 
+    # Draft: 1) the course items of all of the courses
+    # Split: 1) active_versions, 2) root blocks of the structures (then cached)
+    @ddt.data(('draft', [1, 1]), ('split', [2, 1]))
+    @ddt.unpack
+    def test_get_course_summaries(self, default_ms, max_finds):
+        self.initdb(default_ms)
+        course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        xml_course_key = self.course_locations[self.XML_COURSEID1].course_key
+        missing_course_key = self.store.make_course_key('foo', 'bar', '2012_Fall')
+        course = self.store.get_course(course_key)
+
+        for max_find in max_finds:
+            with check_mongo_calls(max_find, 0):
+                summaries = self.store.get_course_summaries([course_key, xml_course_key, missing_course_key])
+            self.assertEqual(set(summaries), {course_key, xml_course_key})
+
+            summary = summaries[course_key]
+            self.assertEqual(summary.id, course.id)
+            self.assertEqual(summary.location, course.location)
+            self.assertEqual(summary.display_name_with_default, course.display_name_with_default)
+            self.assertEqual(summary.display_number_with_default, course.display_number_with_default)
+            self.assertEqual(summary.start, course.start)
+            self.assertEqual(summary.course_image, course.course_image)
+            self.assertEqual(summary.visible_to_staff_only, course.visible_to_staff_only)
+            self.assertEqual(summary.user_partitions, course.user_partitions)
+            self.assertEqual(summary.pre_requisite_courses, course.pre_requisite_courses)
+            self.assertEqual(summary.may_certify(), course.may_certify())
+            self.assertEqual(summaries[xml_course_key].display_name, 'Toy Course')
+
     def test_xml_get_courses(self):
         """
         Test that the xml modulestore only loaded the courses from the maps.
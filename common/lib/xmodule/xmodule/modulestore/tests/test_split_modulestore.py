@@ -10,6 +10,7 @@ import unittest
 import uuid
 
 from contracts import contract
+from mock import patch
 from nose.plugins.attrib import attr
 
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -945,6 +946,34 @@ class SplitModuleItemTests(SplitModuleTest):
         parent = modulestore().get_parent_location(locator)
         self.assertIsNone(parent)
 
+    def test_get_parents_uses_index(self):
+        """
+        get_parent_location looks parents up in the structure's parent index
+        rather than scanning the structure's blocks.
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        with patch.object(modulestore(), '_get_parents_from_structure') as mock_scan:
+            for block_id in ('chapter1', 'chapter2', 'chapter3'):
+                parent = modulestore().get_parent_location(course_key.make_usage_key('chapter', block_id))
+                self.assertEqual(parent.block_id, 'head12345')
+            self.assertFalse(mock_scan.called)
+
+    def test_get_parents_in_bulk_operation(self):
+        """
+        get_parent_location finds the parents of blocks added to a structure
+        which is being edited in a bulk operation, and then to the saved structure.
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        chapter = course_key.make_usage_key('chapter', 'chapter1')
+        with modulestore().bulk_operations(course_key):
+            # Build the index of the structure before it's edited
+            modulestore().get_parent_location(chapter)
+            sequential = modulestore().create_child(self.user_id, chapter, 'sequential', block_id='new_sequential')
+            self.assertEqual(modulestore().get_parent_location(sequential.location).block_id, 'chapter1')
+        self.assertEqual(
+            modulestore().get_parent_location(sequential.location.version_agnostic()).block_id, 'chapter1'
+        )
+
     def test_get_children(self):
         """
         Test the existing get_children method on xdescriptors
@@ -0,0 +1,106 @@
+"""
+Tests for the process-wide cache of split modulestore structures.
+"""
+import cPickle as pickle
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import StructureCache
+
+
+def _structure():
+    """
+    Return a minimal structure with a new version guid.
+    """
+    root = BlockKey('course', 'course')
+    return {
+        '_id': ObjectId(),
+        'root': root,
+        'blocks': {root: {'block_type': 'course', 'fields': {}}},
+    }
+
+
+def _size(structure):
+    """
+    Return the size that StructureCache accounts for ``structure``.
+    """
+    return len(pickle.dumps(structure, pickle.HIGHEST_PROTOCOL))
+
+
+class DictCache(object):
+    """
+    Stand-in for a django cache, backed by a dict.
+    """
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class TestStructureCache(unittest.TestCase):
+    """
+    Tests of StructureCache.
+    """
+    def test_hits_and_misses(self):
+        cache = StructureCache(10 * 1024 * 1024)
+        structure = _structure()
+
+        self.assertIsNone(cache.get(structure['_id']))
+        cache.set(structure['_id'], structure)
+        self.assertIs(cache.get(structure['_id']), structure)
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['size'], _size(structure))
+
+    def test_least_recently_used_are_evicted(self):
+        structures = [_structure() for _ in range(3)]
+        cache = StructureCache(2 * max(_size(structure) for structure in structures))
+
+        cache.set(structures[0]['_id'], structures[0])
+        cache.set(structures[1]['_id'], structures[1])
+        # Use the first structure, so that the second one is evicted
+        cache.get(structures[0]['_id'])
+        cache.set(structures[2]['_id'], structures[2])
+
+        self.assertIsNotNone(cache.get(structures[0]['_id']))
+        self.assertIsNone(cache.get(structures[1]['_id']))
+        self.assertIsNotNone(cache.get(structures[2]['_id']))
+        self.assertLessEqual(cache.stats()['size'], cache.max_size)
+
+    def test_structure_too_big(self):
+        structure = _structure()
+        cache = StructureCache(_size(structure) - 1)
+        cache.set(structure['_id'], structure)
+        self.assertIsNone(cache.get(structure['_id']))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_shared_cache(self):
+        shared_cache = DictCache()
+        structure = _structure()
+        StructureCache(10 * 1024 * 1024, shared_cache).set(structure['_id'], structure)
+
+        # Another process finds the structure in the shared cache
+        cache = StructureCache(10 * 1024 * 1024, shared_cache)
+        self.assertEqual(cache.get(structure['_id']), structure)
+        self.assertEqual(cache.stats()['shared_hits'], 1)
+
+        # and then keeps it in memory
+        cache.get(structure['_id'])
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_clear(self):
+        cache = StructureCache(10 * 1024 * 1024)
+        structure = _structure()
+        cache.set(structure['_id'], structure)
+        cache.clear()
+        self.assertIsNone(cache.get(structure['_id']))
+        self.assertEqual(cache.stats()['size'], 0)
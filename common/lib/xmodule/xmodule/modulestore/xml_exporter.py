@@ -11,12 +11,19 @@ from xmodule.assetstore import AssetMetadata
 from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
+from fs.base import FS
+from fs.errors import DestinationExistsError, ParentDirectoryMissingError, UnsupportedError
 from fs.osfs import OSFS
+from fs.path import normpath, relpath, dirname
 from json import dumps
 import json
 import os
 from path import path
 import shutil
+import tarfile
+from tempfile import SpooledTemporaryFile
+import threading
+import time
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 from opaque_keys.edx.locator import CourseLocator
 
@@ -27,6 +34,133 @@ EXPORT_VERSION_KEY = "export_format"
 
 DEFAULT_CONTENT_FIELDS = ['metadata', 'data']
 
+# Files written to a TarExportFS which are larger than this are spooled to disk until they are added to the tar
+TAR_EXPORT_SPOOL_SIZE = 1024 * 1024
+
+
+class TarExportFS(FS):
+    """
+    A write-only pyfilesystem which adds the files written to it to a tar archive (which may
+    be opened in stream mode). Each file is spooled until it is closed, when it is added to
+    the archive, so several files may be written concurrently.
+    """
+    def __init__(self, tar_file):
+        super(TarExportFS, self).__init__(thread_synchronize=False)
+        self.tar_file = tar_file
+        self._dirs = set([''])
+        self._files = set()
+        self._lock = threading.Lock()
+
+    def _add_member(self, tar_path, member_type, fileobj=None, size=0):
+        """
+        Adds a member to the tar archive. Must be called with self._lock held.
+        """
+        tar_info = tarfile.TarInfo(tar_path)
+        tar_info.type = member_type
+        tar_info.mode = 0755 if member_type == tarfile.DIRTYPE else 0644
+        tar_info.mtime = time.time()
+        tar_info.size = size
+        self.tar_file.addfile(tar_info, fileobj)
+
+    def add_file(self, fs_path, fileobj):
+        """
+        Adds the data of the seekable fileobj to the archive as the file at fs_path.
+        """
+        tar_path = relpath(normpath(fs_path))
+        size = fileobj.tell()
+        fileobj.seek(0)
+        with self._lock:
+            self._add_member(tar_path, tarfile.REGTYPE, fileobj, size)
+            self._files.add(tar_path)
+
+    def makedir(self, fs_path, recursive=False, allow_recreate=False):
+        tar_path = relpath(normpath(fs_path))
+        with self._lock:
+            if tar_path in self._dirs:
+                if not allow_recreate:
+                    raise DestinationExistsError(fs_path)
+                return
+            missing_dirs = [tar_path]
+            while dirname(missing_dirs[-1]) not in self._dirs:
+                if not recursive:
+                    raise ParentDirectoryMissingError(fs_path)
+                missing_dirs.append(dirname(missing_dirs[-1]))
+            for missing_dir in reversed(missing_dirs):
+                self._add_member(missing_dir, tarfile.DIRTYPE)
+                self._dirs.add(missing_dir)
+
+    def isdir(self, fs_path):
+        return relpath(normpath(fs_path)) in self._dirs
+
+    def isfile(self, fs_path):
+        return relpath(normpath(fs_path)) in self._files
+
+    def open(self, fs_path, mode='r', **kwargs):
+        if 'w' not in mode:
+            raise UnsupportedError('open for reading or appending', path=fs_path)
+        if not self.isdir(dirname(relpath(normpath(fs_path)))):
+            raise ParentDirectoryMissingError(fs_path)
+        return TarExportFile(self, fs_path)
+
+    def listdir(self, fs_path='./', *args, **kwargs):
+        raise UnsupportedError('list directory', path=fs_path)
+
+    def remove(self, fs_path):
+        raise UnsupportedError('remove file', path=fs_path)
+
+    def removedir(self, fs_path, *args, **kwargs):
+        raise UnsupportedError('remove directory', path=fs_path)
+
+    def rename(self, src, dst):
+        raise UnsupportedError('rename', path=src)
+
+    def getinfo(self, fs_path):
+        raise UnsupportedError('get resource info', path=fs_path)
+
+
+class TarExportFile(object):
+    """
+    A file being written to a TarExportFS, which is added to its archive when it's closed.
+    """
+    def __init__(self, tar_fs, fs_path):
+        self.tar_fs = tar_fs
+        self.fs_path = fs_path
+        self.spool = SpooledTemporaryFile(max_size=TAR_EXPORT_SPOOL_SIZE)
+
+    def write(self, data):
+        """
+        Writes data to the file.
+        """
+        self.spool.write(data)
+
+    def writelines(self, lines):
+        """
+        Writes each of lines to the file.
+        """
+        self.spool.writelines(lines)
+
+    def flush(self):
+        """
+        The file is only flushed to the archive when it's closed.
+        """
+        pass
+
+    def close(self):
+        """
+        Adds the file to the archive.
+        """
+        if not self.spool.closed:
+            try:
+                self.tar_fs.add_file(self.fs_path, self.spool)
+            finally:
+                self.spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
 def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     """
@@ -38,13 +172,39 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     `root_dir`: The directory to write the exported xml to
     `course_dir`: The name of the directory inside `root_dir` to write the course content to
     """
+    export_to_fs(modulestore, contentstore, course_key, OSFS(root_dir).makeopendir(course_dir))
+
+
+def export_to_tar_file(modulestore, contentstore, course_key, fileobj, course_dir):
+    """
+    Export all modules from `modulestore` and content from `contentstore` as a gzipped tar archive of xml,
+    which is streamed into `fileobj` as the course is exported, without writing it out to a directory first.
+
+    `modulestore`: A `ModuleStore` object that is the source of the modules to export
+    `contentstore`: A `ContentStore` object that is the source of the content to export, can be None
+    `course_key`: The `CourseKey` of the `CourseModuleDescriptor` to export
+    `fileobj`: The file object to write the archive to
+    `course_dir`: The name of the directory inside the archive to write the course content to
+    """
+    with tarfile.open(fileobj=fileobj, mode='w|gz') as tar_file:
+        export_to_fs(modulestore, contentstore, course_key, TarExportFS(tar_file).makeopendir(course_dir))
+
+
+def export_to_fs(modulestore, contentstore, course_key, export_fs):
+    """
+    Export all modules from `modulestore` and content from `contentstore` as xml into the pyfilesystem
+    `export_fs`. Each module writes out its xml files as it is exported.
+
+    `modulestore`: A `ModuleStore` object that is the source of the modules to export
+    `contentstore`: A `ContentStore` object that is the source of the content to export, can be None
+    `course_key`: The `CourseKey` of the `CourseModuleDescriptor` to export
+    `export_fs`: The filesystem to write the course content to
+    """
 
     with modulestore.bulk_operations(course_key):
 
         course = modulestore.get_course(course_key, depth=None)  # None means infinite
-        fsm = OSFS(root_dir)
-        export_fs = course.runtime.export_fs = fsm.makeopendir(course_dir)
-        root_course_dir = root_dir + '/' + course_dir
+        course.runtime.export_fs = export_fs
 
         root = lxml.etree.Element('unknown')
 
@@ -60,26 +220,21 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
             lxml.etree.ElementTree(root).write(course_xml)
 
         # Export the modulestore's asset metadata.
-        asset_dir = root_course_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_fs = export_fs.makeopendir(AssetMetadata.EXPORTED_ASSET_DIR)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = modulestore.get_all_asset_metadata(course_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
+        with asset_fs.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file)
 
         # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if contentstore:
-            contentstore.export_all_for_course(
-                course_key,
-                root_course_dir + '/static/',
-                root_course_dir + '/policies/assets.json',
-            )
+            static_fs = export_fs.makeopendir('static')
+            contentstore.export_all_for_course_to_fs(course_key, static_fs, policies_dir, 'assets.json')
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -94,10 +249,7 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_course_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    with static_fs.makeopendir('images').open('course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
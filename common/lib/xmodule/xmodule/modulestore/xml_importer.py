@@ -20,12 +20,14 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, a)   |  (a, a) | (x, a) | (x, x) | (x, y) | (a, x)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
+import hashlib
 import logging
 import os
 import mimetypes
 from path import path
 import json
 import re
+from multiprocessing.pool import ThreadPool
 from lxml import etree
 
 from .xml import XMLModuleStore, ImportSystem
@@ -50,10 +52,26 @@ from xmodule.modulestore.store_utilities import draft_node_constructor, get_draf
 log = logging.getLogger(__name__)
 
 
+# Number of static files which are imported concurrently
+STATIC_CONTENT_IMPORT_WORKERS = 4
+# Static files larger than this are streamed into the contentstore rather than read into memory
+STATIC_CONTENT_STREAMING_THRESHOLD = 1024 * 1024
+# Size of the blocks in which static files are hashed and streamed
+STATIC_CONTENT_CHUNK_SIZE = 256 * 1024
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_course_id, subpath='static', verbose=False):
+        target_course_id, subpath='static', verbose=False, num_workers=STATIC_CONTENT_IMPORT_WORKERS):
+    """
+    Imports the files under course_data_path/subpath into static_content_store as
+    assets of target_course_id, and returns a dict which maps the path of each
+    file to its asset key.
 
+    Files whose content is the same as that of an asset already in the store
+    (e.g. from a previous import of the course) are not saved again. The others
+    are read, thumbnailed and saved by a pool of num_workers threads.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -72,6 +90,12 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
+    existing_assets = {
+        asset['asset_key'].name: asset
+        for asset in static_content_store.get_all_content_for_course(target_course_id)[0]
+    }
+
+    static_files = []
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
 
@@ -82,20 +106,6 @@ def import_static_content(
                     log.debug('skipping static content %s...', content_path)
                 continue
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
-
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
-
             # strip away leading path from the name
             fullname_with_subpath = content_path.replace(static_dir, '')
             if fullname_with_subpath.startswith('/'):
@@ -110,30 +120,128 @@ def import_static_content(
             # Check extracted contentType in list of all valid mimetypes
             if not mime_type or mime_type not in mimetypes_list:
                 mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+            content_fields = {
+                'loc': asset_key,
+                'name': displayname,
+                'content_type': mime_type,
+                'import_path': fullname_with_subpath,
+                'locked': locked,
+            }
+            static_files.append((content_path, content_fields, existing_assets.get(asset_key.name)))
+
+    def import_static_file(static_file):
+        """
+        Imports a single static file, passing the exceptions it raises to the caller of imap.
+        """
+        content_path, content_fields, existing_asset = static_file
+        return _import_static_file(static_content_store, content_path, content_fields, existing_asset, verbose)
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+    pool = ThreadPool(num_workers)
+    try:
+        for content_fields in pool.imap_unordered(import_static_file, static_files):
+            if content_fields is not None:
+                # store the remapping information which will be needed
+                # to subsitute in the module data
+                remap_dict[content_fields['import_path']] = content_fields['loc']
+    finally:
+        pool.close()
+        pool.join()
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+    return remap_dict
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
 
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+def _import_static_file(static_content_store, content_path, content_fields, existing_asset, verbose):
+    """
+    Saves the file at content_path into static_content_store as the StaticContent with
+    the given fields, unless its data is the same as that of existing_asset (the
+    attributes of the asset already in the store at its location, if any).
 
-    return remap_dict
+    Returns the content_fields, or None if the file is to be skipped.
+    """
+    try:
+        length = os.path.getsize(content_path)
+        if (
+                existing_asset is not None and existing_asset.get('length') == length and
+                existing_asset.get('md5') == _static_file_md5(content_path)
+        ):
+            if verbose:
+                log.debug('static content %s is unchanged...', content_path)
+            _update_static_content_attrs(static_content_store, content_fields, existing_asset)
+            return content_fields
+
+        if verbose:
+            log.debug('importing static content %s...', content_path)
+
+        if length > STATIC_CONTENT_STREAMING_THRESHOLD:
+            data = _read_static_file(content_path)
+        else:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+    except (IOError, OSError):
+        if os.path.basename(content_path).startswith('._'):
+            # OS X "companion files". See
+            # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+            return None
+        # Not a 'hidden file', then re-raise exception
+        raise
+
+    content = StaticContent(data=data, length=length, **content_fields)
+
+    # first let's save a thumbnail so we can get back a thumbnail location
+    thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(
+        content, tempfile_path=content_path
+    )
+
+    if thumbnail_content is not None:
+        content.thumbnail_location = thumbnail_location
+
+    # then commit the content
+    try:
+        static_content_store.save(content)
+    except Exception as err:
+        log.exception(u'Error importing {0}, error={1}'.format(
+            content.import_path, err
+        ))
+
+    return content_fields
+
+
+def _update_static_content_attrs(static_content_store, content_fields, existing_asset):
+    """
+    Updates the attributes of the existing_asset whose data is the same as that of the
+    imported file, but whose attributes may differ (e.g. if the policy was edited).
+    """
+    attrs = {
+        'displayname': content_fields['name'],
+        'contentType': content_fields['content_type'],
+        'import_path': content_fields['import_path'],
+        'locked': content_fields['locked'],
+    }
+    changed_attrs = {
+        attr: value for attr, value in attrs.iteritems()
+        if existing_asset.get(attr) != value
+    }
+    if changed_attrs:
+        static_content_store.set_attrs(content_fields['loc'], changed_attrs)
+
+
+def _read_static_file(content_path):
+    """
+    Yields the data of the file at content_path in chunks.
+    """
+    with open(content_path, 'rb') as static_file:
+        for chunk in iter(lambda: static_file.read(STATIC_CONTENT_CHUNK_SIZE), ''):
+            yield chunk
+
+
+def _static_file_md5(content_path):
+    """
+    Returns the hex md5 digest of the file at content_path, which is what GridFS computes for its files.
+    """
+    md5 = hashlib.md5()
+    for chunk in _read_static_file(content_path):
+        md5.update(chunk)
+    return md5.hexdigest()
 
 
 def import_from_xml(
@@ -176,117 +284,140 @@ def import_from_xml(
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
 
-    xml_module_store = XMLModuleStore(
-        data_dir,
-        default_class=default_class,
-        course_dirs=course_dirs,
-        load_error_modules=load_error_modules,
-        xblock_mixins=store.xblock_mixins,
-        xblock_select=store.xblock_select,
-    )
+    # The static content of a single course whose destination is known up front
+    # doesn't depend on the modules, so import it while the course's xml is parsed
+    # and its modules are imported.
+    static_import = None
+    if target_course_id is not None and course_dirs and len(course_dirs) == 1 and not create_course_if_not_present:
+        static_pool = ThreadPool(1)
+        static_import = static_pool.apply_async(
+            _import_static_content_wrapper,
+            (static_content_store, do_import_static, path(data_dir) / course_dirs[0], target_course_id, verbose)
+        )
+        static_pool.close()
+
+    try:
+        xml_module_store = XMLModuleStore(
+            data_dir,
+            default_class=default_class,
+            course_dirs=course_dirs,
+            load_error_modules=load_error_modules,
+            xblock_mixins=store.xblock_mixins,
+            xblock_select=store.xblock_select,
+        )
 
-    # If we're going to remap the course_id, then we can only do that with
-    # a single course
-    if target_course_id:
-        assert(len(xml_module_store.modules) == 1)
+        # If we're going to remap the course_id, then we can only do that with
+        # a single course
+        if target_course_id:
+            assert(len(xml_module_store.modules) == 1)
 
-    new_courses = []
-    for course_key in xml_module_store.modules.keys():
-        if target_course_id is not None:
-            dest_course_id = target_course_id
-        else:
-            dest_course_id = store.make_course_key(course_key.org, course_key.course, course_key.run)
-
-        runtime = None
-        # Creates a new course if it doesn't already exist
-        if create_course_if_not_present and not store.has_course(dest_course_id, ignore_case=True):
-            try:
-                new_course = store.create_course(dest_course_id.org, dest_course_id.course, dest_course_id.run, user_id)
-                runtime = new_course.runtime
-            except DuplicateCourseError:
-                # course w/ same org and course exists
-                log.debug(
-                    "Skipping import of course with id, %s,"
-                    "since it collides with an existing one", dest_course_id
+        new_courses = []
+        for course_key in xml_module_store.modules.keys():
+            if target_course_id is not None:
+                dest_course_id = target_course_id
+            else:
+                dest_course_id = store.make_course_key(course_key.org, course_key.course, course_key.run)
+
+            runtime = None
+            # Creates a new course if it doesn't already exist
+            if create_course_if_not_present and not store.has_course(dest_course_id, ignore_case=True):
+                try:
+                    new_course = store.create_course(
+                        dest_course_id.org, dest_course_id.course, dest_course_id.run, user_id
+                    )
+                    runtime = new_course.runtime
+                except DuplicateCourseError:
+                    # course w/ same org and course exists
+                    log.debug(
+                        "Skipping import of course with id, %s,"
+                        "since it collides with an existing one", dest_course_id
+                    )
+                    continue
+
+            with store.bulk_operations(dest_course_id):
+                source_course = xml_module_store.get_course(course_key)
+                # STEP 1: find and import course module
+                course, course_data_path = _import_course_module(
+                    store, runtime, user_id,
+                    data_dir, course_key, dest_course_id, source_course,
+                    do_import_static, verbose
                 )
-                continue
+                new_courses.append(course)
 
-        with store.bulk_operations(dest_course_id):
-            source_course = xml_module_store.get_course(course_key)
-            # STEP 1: find and import course module
-            course, course_data_path = _import_course_module(
-                store, runtime, user_id,
-                data_dir, course_key, dest_course_id, source_course,
-                do_import_static, verbose
-            )
-            new_courses.append(course)
+                # STEP 2: import static content, unless it is already being imported
+                if static_import is None:
+                    _import_static_content_wrapper(
+                        static_content_store, do_import_static, course_data_path, dest_course_id, verbose
+                    )
 
-            # STEP 2: import static content
-            _import_static_content_wrapper(
-                static_content_store, do_import_static, course_data_path, dest_course_id, verbose
-            )
+                # Import asset metadata stored in XML.
+                _import_course_asset_metadata(store, course_data_path, dest_course_id, raise_on_failure)
+
+                # STEP 3: import PUBLISHED items
+                # now loop through all the modules depth first and then orphans
+                with store.branch_setting(ModuleStoreEnum.Branch.published_only, dest_course_id):
+                    all_locs = set(xml_module_store.modules[course_key].keys())
+                    all_locs.remove(source_course.location)
+
+                    def depth_first(subtree):
+                        """
+                        Import top down just so import code can make assumptions about parents always being available
+                        """
+                        if subtree.has_children:
+                            for child in subtree.get_children():
+                                try:
+                                    all_locs.remove(child.location)
+                                except KeyError:
+                                    # tolerate same child occurring under 2 parents such as in
+                                    # ContentStoreTest.test_image_import
+                                    pass
+                                if verbose:
+                                    log.debug('importing module location {loc}'.format(loc=child.location))
+
+                                _import_module_and_update_references(
+                                    child,
+                                    store,
+                                    user_id,
+                                    course_key,
+                                    dest_course_id,
+                                    do_import_static=do_import_static,
+                                    runtime=course.runtime
+                                )
+                                depth_first(child)
+
+                    depth_first(source_course)
+
+                    for leftover in all_locs:
+                        if verbose:
+                            log.debug('importing module location {loc}'.format(loc=leftover))
+
+                        _import_module_and_update_references(
+                            xml_module_store.get_item(leftover), store,
+                            user_id,
+                            course_key,
+                            dest_course_id,
+                            do_import_static=do_import_static,
+                            runtime=course.runtime
+                        )
 
-            # Import asset metadata stored in XML.
-            _import_course_asset_metadata(store, course_data_path, dest_course_id, raise_on_failure)
-
-            # STEP 3: import PUBLISHED items
-            # now loop through all the modules depth first and then orphans
-            with store.branch_setting(ModuleStoreEnum.Branch.published_only, dest_course_id):
-                all_locs = set(xml_module_store.modules[course_key].keys())
-                all_locs.remove(source_course.location)
-
-                def depth_first(subtree):
-                    """
-                    Import top down just so import code can make assumptions about parents always being available
-                    """
-                    if subtree.has_children:
-                        for child in subtree.get_children():
-                            try:
-                                all_locs.remove(child.location)
-                            except KeyError:
-                                # tolerate same child occurring under 2 parents such as in
-                                # ContentStoreTest.test_image_import
-                                pass
-                            if verbose:
-                                log.debug('importing module location {loc}'.format(loc=child.location))
-
-                            _import_module_and_update_references(
-                                child,
-                                store,
-                                user_id,
-                                course_key,
-                                dest_course_id,
-                                do_import_static=do_import_static,
-                                runtime=course.runtime
-                            )
-                            depth_first(child)
-
-                depth_first(source_course)
-
-                for leftover in all_locs:
-                    if verbose:
-                        log.debug('importing module location {loc}'.format(loc=leftover))
-
-                    _import_module_and_update_references(
-                        xml_module_store.get_item(leftover), store,
+                # STEP 4: import any DRAFT items
+                with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, dest_course_id):
+                    _import_course_draft(
+                        xml_module_store,
+                        store,
                         user_id,
+                        course_data_path,
                         course_key,
                         dest_course_id,
-                        do_import_static=do_import_static,
-                        runtime=course.runtime
+                        course.runtime
                     )
+    finally:
+        if static_import is not None:
+            static_pool.join()
 
-            # STEP 4: import any DRAFT items
-            with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, dest_course_id):
-                _import_course_draft(
-                    xml_module_store,
-                    store,
-                    user_id,
-                    course_data_path,
-                    course_key,
-                    dest_course_id,
-                    course.runtime
-                )
+    if static_import is not None:
+        # propagate any error raised by the static content import
+        static_import.get()
 
     return new_courses
 
@@ -12,7 +12,9 @@ import tarfile
 import unittest
 import uuid
 
+from cStringIO import StringIO
 from datetime import datetime, timedelta, tzinfo
+from fs.errors import ParentDirectoryMissingError, UnsupportedError
 from fs.osfs import OSFS
 from path import path
 from tempfile import mkdtemp
@@ -26,7 +28,7 @@ from opaque_keys.edx.locations import Location
 from xmodule.modulestore import EdxJSONEncoder
 from xmodule.modulestore.xml import XMLModuleStore
 from xmodule.modulestore.xml_exporter import (
-    convert_between_versions, get_version
+    convert_between_versions, get_version, TarExportFS
 )
 from xmodule.tests import DATA_DIR
 from xmodule.tests.helpers import directories_equal
@@ -153,6 +155,68 @@ class RoundTripTestCase(unittest.TestCase):
             ))
 
 
+class TarExportFSTestCase(unittest.TestCase):
+    """
+    Tests for the filesystem which exports into a tar archive.
+    """
+    def setUp(self):
+        self.tar_data = StringIO()
+        self.tar_file = tarfile.open(fileobj=self.tar_data, mode='w|gz')
+        self.addCleanup(self.tar_file.close)
+        self.export_fs = TarExportFS(self.tar_file).makeopendir('course')
+
+    def read_tar(self):
+        """
+        Closes the archive and returns a dict mapping the name of each of its members to their data
+        (or None for directories).
+        """
+        self.tar_file.close()
+        self.tar_data.seek(0)
+        members = {}
+        with tarfile.open(fileobj=self.tar_data, mode='r:gz') as tar_file:
+            for member in tar_file.getmembers():
+                members[member.name] = tar_file.extractfile(member).read() if member.isfile() else None
+        return members
+
+    def test_files_added_when_closed(self):
+        with self.export_fs.open('course.xml', 'w') as course_xml:
+            course_xml.write('<course/>')
+        chapter_fs = self.export_fs.makeopendir('chapter')
+        first = chapter_fs.open('first.xml', 'w')
+        second = chapter_fs.open('second.xml', 'w')
+        second.write('<chapter>2</chapter>')
+        first.write('<chapter>1</chapter>')
+        second.close()
+        first.close()
+        self.export_fs.makedir('static/images', recursive=True, allow_recreate=True)
+
+        self.assertEqual(
+            self.read_tar(),
+            {
+                'course': None,
+                'course/course.xml': '<course/>',
+                'course/chapter': None,
+                'course/chapter/first.xml': '<chapter>1</chapter>',
+                'course/chapter/second.xml': '<chapter>2</chapter>',
+                'course/static': None,
+                'course/static/images': None,
+            }
+        )
+
+    def test_missing_parent_directory(self):
+        with self.assertRaises(ParentDirectoryMissingError):
+            self.export_fs.open('chapter/first.xml', 'w')
+        with self.assertRaises(ParentDirectoryMissingError):
+            self.export_fs.makedir('static/images')
+
+    def test_write_only(self):
+        with self.export_fs.open('course.xml', 'w') as course_xml:
+            course_xml.write('<course/>')
+        self.assertTrue(self.export_fs.isfile('course.xml'))
+        with self.assertRaises(UnsupportedError):
+            self.export_fs.open('course.xml', 'r')
+
+
 class TestEdxJsonEncoder(unittest.TestCase):
     """
     Tests for xml_exporter.EdxJSONEncoder
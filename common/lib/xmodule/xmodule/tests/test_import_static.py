@@ -1,8 +1,9 @@
 """
 Tests that check that we ignore the appropriate files when importing courses.
 """
+import hashlib
 import unittest
-from mock import Mock
+from mock import Mock, patch
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.tests import DATA_DIR
@@ -15,6 +16,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -30,6 +32,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -39,3 +42,65 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+class ChangedFilesTestCase(unittest.TestCase):
+    "Tests for importing static files over the assets of a previous import"
+    def setUp(self):
+        self.course_dir = DATA_DIR / "tilde"
+        self.course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
+        self.content_store = Mock()
+        self.content_store.generate_thumbnail.return_value = (None, "location")
+        with open(self.course_dir / "static" / "example.txt", 'rb') as example:
+            self.example_data = example.read()
+
+    def _existing_asset(self, data, **attrs):
+        """
+        Returns the attributes of the example.txt asset as the content store would, if it had the given data
+        """
+        asset = {
+            'asset_key': self.course_id.make_asset_key('asset', 'example.txt'),
+            'displayname': 'example.txt',
+            'contentType': 'text/plain',
+            'import_path': 'example.txt',
+            'locked': False,
+            'length': len(data),
+            'md5': hashlib.md5(data).hexdigest(),
+        }
+        asset.update(attrs)
+        return asset
+
+    def test_unchanged_file_not_saved(self):
+        self.content_store.get_all_content_for_course.return_value = ([self._existing_asset(self.example_data)], 1)
+        remap_dict = import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertFalse(self.content_store.save.called)
+        self.assertFalse(self.content_store.set_attrs.called)
+        self.assertIn("example.txt", remap_dict)
+
+    def test_unchanged_file_attrs_updated(self):
+        self.content_store.get_all_content_for_course.return_value = (
+            [self._existing_asset(self.example_data, locked=True)], 1
+        )
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertFalse(self.content_store.save.called)
+        self.content_store.set_attrs.assert_called_once_with(
+            self.course_id.make_asset_key('asset', 'example.txt'), {'locked': False}
+        )
+
+    def test_changed_file_saved(self):
+        changed_data = self.example_data.replace("GREEN", "BLUE!")
+        self.content_store.get_all_content_for_course.return_value = ([self._existing_asset(changed_data)], 1)
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        saved_static_content = [call[0][0] for call in self.content_store.save.call_args_list]
+        self.assertEqual([sc.data for sc in saved_static_content], [self.example_data])
+
+    @patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_STREAMING_THRESHOLD', 0)
+    @patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_CHUNK_SIZE', 2)
+    def test_large_file_streamed(self):
+        self.content_store.get_all_content_for_course.return_value = ([], 0)
+        streamed_data = []
+        self.content_store.save.side_effect = lambda content: streamed_data.append(list(content.data))
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertEqual(len(streamed_data), 1)
+        self.assertGreater(len(streamed_data[0]), 1)
+        self.assertEqual(''.join(streamed_data[0]), self.example_data)
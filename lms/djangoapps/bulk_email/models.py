@@ -12,15 +12,18 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+from string import Formatter
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
 
 from html_to_text import html_to_text
-from mail_utils import wrap_message
+from mail_utils import wrap_message, wrap_line
 
 from xmodule_django.models import CourseKeyField
-from util.keyword_substitution import substitute_keywords_with_data
+from util.keyword_substitution import substitute_keywords_with_data, KEYWORD_FUNCTION_MAP
 
 log = logging.getLogger(__name__)
 
@@ -210,6 +213,26 @@ class CourseEmailTemplate(models.Model):
         # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
         return wrap_message(result)
 
+    def compile_plaintext(self, plaintext, context):
+        """
+        Compile the plain text message for sending to many recipients.
+
+        Returns a CompiledEmailTemplate of the plain text body (`plaintext`)
+        in the stored plain template, with the parts of the `context` dict that
+        are the same for all recipients already filled in.
+        """
+        return CompiledEmailTemplate(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Compile the HTML message for sending to many recipients.
+
+        Returns a CompiledEmailTemplate of the HTML body (`htmltext`) in the
+        stored HTML template, with the parts of the `context` dict that are
+        the same for all recipients already filled in.
+        """
+        return CompiledEmailTemplate(self.html_template, htmltext, context)
+
     def render_plaintext(self, plaintext, context):
         """
         Create plain text message.
@@ -229,6 +252,99 @@ class CourseEmailTemplate(models.Model):
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
 
+class CompiledEmailTemplate(object):
+    """
+    A message in a CourseEmailTemplate, rendered as far as it can be before
+    knowing who it is sent to.
+
+    Rendering the same message for each recipient with
+    CourseEmailTemplate._render formats and wraps the whole template every
+    time.  Here, the template is formatted with the context that is the same
+    for all recipients, and the lines that don't depend on the recipient are
+    wrapped, once.  Rendering for a recipient then only fills in the
+    remaining lines, and the result is the same as _render's.
+    """
+    # Context that is different for each recipient
+    RECIPIENT_KEYS = ('name', 'email', 'user_id')
+    MESSAGE_BODY_KEY = 'message_body'
+
+    # Stands for a value that isn't known yet in the formatted template
+    PLACEHOLDER = u'\ufdd0{}\ufdd0'
+    PLACEHOLDER_PATTERN = re.compile(u'\ufdd0([a-z_]+)\ufdd0')
+
+    def __init__(self, format_string, message_body, context):
+        """
+        Compile the message with body `message_body` in the template
+        `format_string`, given the context shared by all recipients.
+
+        Raises KeyError if the template uses a key that is neither in
+        `context` nor a recipient key.
+        """
+        self.format_string = format_string
+        self.message_body = message_body
+        self.context = context
+        # Each line is either a wrapped string, or a list of the strings and
+        # keys to join to get the line
+        self.lines = None
+
+        # Only plain {key} fields can be filled in later; render others all at once
+        for _literal, field_name, format_spec, conversion in Formatter().parse(format_string):
+            if field_name is not None and re.split(r'[.\[]', field_name)[0] in self.RECIPIENT_KEYS:
+                if field_name not in self.RECIPIENT_KEYS or format_spec or conversion:
+                    return
+
+        # The body depends on the recipient if it has keywords to substitute
+        body_varies = any(keyword in message_body for keyword in KEYWORD_FUNCTION_MAP)
+
+        formatted = format_string.format(**dict(
+            context,
+            **{key: self.PLACEHOLDER.format(key) for key in self.RECIPIENT_KEYS}
+        ))
+        formatted = formatted.replace(
+            COURSE_EMAIL_MESSAGE_BODY_TAG.format(),
+            self.PLACEHOLDER.format(self.MESSAGE_BODY_KEY) if body_varies else message_body,
+            1
+        )
+
+        self.lines = []
+        for line in formatted.split('\n'):
+            parts = self.PLACEHOLDER_PATTERN.split(line)
+            # the keys are at odd indices
+            self.lines.append(wrap_line(line) if len(parts) == 1 else parts)
+
+    def render(self, recipient_context):
+        """
+        Render the message for a recipient.
+
+        `recipient_context` is a dict of the values of RECIPIENT_KEYS for the
+        recipient, which are rendered like CourseEmailTemplate._render would
+        render them with the shared context updated with `recipient_context`.
+        """
+        context = dict(self.context, **recipient_context)
+        if self.lines is None:
+            return CourseEmailTemplate._render(self.format_string, self.message_body, context)  # pylint: disable=protected-access
+
+        values = dict(recipient_context)
+        if any(self.MESSAGE_BODY_KEY in parts for parts in self.lines if isinstance(parts, list)):
+            values[self.MESSAGE_BODY_KEY] = self.message_body
+            if 'user_id' in context and 'course_id' in context:
+                values[self.MESSAGE_BODY_KEY] = substitute_keywords_with_data(
+                    self.message_body, context['user_id'], context['course_id']
+                )
+
+        lines = []
+        for parts in self.lines:
+            if isinstance(parts, list):
+                line = u''.join(
+                    part if index % 2 == 0 else unicode(values[part]) for index, part in enumerate(parts)
+                )
+                # the filled in values may have line breaks
+                lines.append(wrap_message(line))
+            else:
+                lines.append(parts)
+        return u'\n'.join(lines)
+
+
 class CourseAuthorization(models.Model):
     """
     Enable the course email feature on a course-by-course basis.
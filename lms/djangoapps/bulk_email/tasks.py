@@ -5,6 +5,9 @@ to a course.
 import re
 import random
 import json
+import sys
+import time
+from multiprocessing.pool import ThreadPool
 from time import sleep
 
 import dogstats_wrapper as dog_stats_api
@@ -445,84 +448,100 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connection_pool = None
     try:
-        connection = get_connection()
-        connection.open()
+        # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+        # but if a task has been retried for rate-limiting reasons, then we wait
+        # for a period of time between all emails within this task.  Choice of
+        # the value depends on the number of workers that might be sending email in
+        # parallel, and what the SES throttle rate is.
+        send_interval = 0
+        if subtask_status.retried_nomax > 0:
+            send_interval = settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
+        connection_pool = SMTPConnectionPool(
+            getattr(settings, 'BULK_EMAIL_SMTP_CONNECTIONS', 1), send_interval, [_statsd_tag(course_title)]
+        )
+        connection_pool.open()
 
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
-        email_context.update(global_email_context)
+        # Define context values to use in all course emails, and render
+        # as much of the messages as we can before knowing the recipients:
+        email_context = dict(global_email_context)
+        email_context['course_id'] = course_email.course_id
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
 
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
+            # Send to as many users at the end of the list as there are connections.
+            # Each user is popped off of the to_list once they have been processed.
             # That way, the to_list will always contain the recipients remaining to be emailed.
             # This is convenient for retries, which will need to send to those who haven't
             # yet been emailed, but not send to those who have already been sent to.
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
-
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
-
-            try:
-                log.debug('Email with id %s to be sent to %s', email_id, email)
+            recipients = list(reversed(to_list[-connection_pool.size:]))
+            email_msgs = []
+            for current_recipient in recipients:
+                recipient_context = {
+                    'email': current_recipient['email'],
+                    'name': current_recipient['profile__name'],
+                    'user_id': current_recipient['pk'],
+                }
+
+                # Construct message content using templates and context:
+                plaintext_msg = plaintext_template.render(recipient_context)
+                html_msg = html_template.render(recipient_context)
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    subject,
+                    plaintext_msg,
+                    from_addr,
+                    [current_recipient['email']],
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
+                email_msgs.append(email_msg)
+                log.debug('Email with id %s to be sent to %s', email_id, current_recipient['email'])
+
+            retry_exc_info = None
+            unsent = []
+            for current_recipient, exc_info in zip(recipients, connection_pool.send(email_msgs)):
+                email = current_recipient['email']
+                exc = exc_info[1] if exc_info else None
+
+                if exc is None:
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
 
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
                 # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
+                elif isinstance(exc, SMTPDataError) and not 400 <= exc.smtp_code < 500:
                     # This will fall through and not retry the message.
                     log.warning('Task %s: email with id %s not delivered to %s due to error %s', task_id, email_id, email, exc.smtp_error)
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                log.warning('Task %s: email with id %s not delivered to %s due to error %s', task_id, email_id, email, exc)
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
+                    # This will fall through and not retry the message.
+                    log.warning('Task %s: email with id %s not delivered to %s due to error %s', task_id, email_id, email, exc)
+                    dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                    subtask_status.increment(failed=1)
 
-            else:
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
                 else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                    # The user stays on the list, to be retried.
+                    unsent.append(current_recipient)
+                    if retry_exc_info is None:
+                        retry_exc_info = exc_info
+
+            # Pop the users that were emailed off the end of the list only once they have
+            # been processed.  (That way, if there were a failure that needed to be retried,
+            # the user is still on the list.)
+            del to_list[-len(recipients):]
+            to_list.extend(reversed(unsent))
 
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            to_list.pop()
+            if retry_exc_info is not None:
+                # This will cause the outer handlers to catch the exception and retry the entire task.
+                raise retry_exc_info[0], retry_exc_info[1], retry_exc_info[2]
 
     except INFINITE_RETRY_ERRORS as exc:
         dog_stats_api.increment('course_email.infinite_retry', tags=[_statsd_tag(course_title)])
@@ -578,7 +597,66 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        if connection_pool is not None:
+            connection_pool.close()
+
+
+class SMTPConnectionPool(object):
+    """
+    A number of email connections, over which messages are sent concurrently.
+
+    Each connection sends one message at a time, and waits at least
+    `send_interval` times the number of connections between sends, so that
+    the pool as a whole sends no faster than one message per `send_interval`.
+    """
+    def __init__(self, size, send_interval=0, tags=None):
+        self.size = max(size, 1)
+        self.send_interval = send_interval
+        self.tags = tags or []
+        self.connections = [get_connection() for _ in range(self.size)]
+        self.last_sent = [None] * self.size
+        self.thread_pool = ThreadPool(self.size) if self.size > 1 else None
+
+    def open(self):
+        """Open all the connections."""
+        for connection in self.connections:
+            connection.open()
+
+    def close(self):
+        """Close all the connections, and stop the threads sending over them."""
+        for connection in self.connections:
+            connection.close()
+        if self.thread_pool is not None:
+            self.thread_pool.terminate()
+
+    def send(self, email_msgs):
+        """
+        Send each of `email_msgs` (no more than there are connections) over
+        its own connection.
+
+        Returns a list with, for each message, None if it was sent, or the
+        `sys.exc_info()` of the error sending it.
+        """
+        if self.thread_pool is None:
+            return [self._send(0, email_msg) for email_msg in email_msgs]
+        return self.thread_pool.map(lambda args: self._send(*args), enumerate(email_msgs))
+
+    def _send(self, index, email_msg):
+        """
+        Send `email_msg` over the connection at `index`, once it has waited long enough.
+        """
+        if self.send_interval and self.last_sent[index] is not None:
+            wait = self.last_sent[index] + self.send_interval * self.size - time.time()
+            if wait > 0:
+                sleep(wait)
+        self.last_sent[index] = time.time()
+
+        try:
+            with dog_stats_api.timer('course_email.single_send.time.overall', tags=self.tags):
+                self.connections[index].send_messages([email_msg])
+        except Exception:  # pylint: disable=broad-except
+            return sys.exc_info()
+        return None
 
 
 def _get_current_task():
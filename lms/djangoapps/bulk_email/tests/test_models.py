@@ -131,6 +131,49 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_templates_render_the_same(self):
+        for name in (None, "branded.template"):
+            template = CourseEmailTemplate.get_template(name=name)
+            context = self._get_sample_html_context()
+            del context['email']
+            recipient_context = {'email': 'student@test.com', 'name': 'Student', 'user_id': 1}
+            body = u"A body with\nline breaks, {braces} and a " + u"very long line " * 100
+
+            self.assertEquals(
+                template.compile_plaintext(body, context).render(recipient_context),
+                template.render_plaintext(body, dict(context, **recipient_context))
+            )
+            self.assertEquals(
+                template.compile_htmltext(body, context).render(recipient_context),
+                template.render_htmltext(body, dict(context, **recipient_context))
+            )
+
+    def test_compiled_template_missing_context(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_plain_context()
+        del context['course_url']
+        with self.assertRaises(KeyError):
+            template.compile_plaintext("My new plain text.", context)
+
+    @patch.dict('util.keyword_substitution.KEYWORD_FUNCTION_MAP', {'%%USER_ID%%': lambda user, course: user.username})
+    def test_compiled_template_with_keywords(self):
+        user = UserFactory.create()
+        course_id = SlashSeparatedCourseKey('abc', '123', 'doremi')
+        template = CourseEmailTemplate(plain_template=u"Hi {email}\n{{message_body}}\n{platform_name}")
+        with patch('util.keyword_substitution.modulestore'):
+            rendered = template.compile_plaintext(
+                u"Your id is %%USER_ID%%", {'platform_name': 'edX', 'course_id': course_id}
+            ).render({'email': user.email, 'name': '', 'user_id': user.id})
+        self.assertEquals(rendered, u"Hi {}\nYour id is {}\nedX".format(user.email, user.username))
+
+    def test_compiled_template_with_format_spec(self):
+        template = CourseEmailTemplate(plain_template=u"{name:>10}|{{message_body}}|{platform_name}")
+        compiled = template.compile_plaintext(u"body", {'platform_name': 'edX'})
+        self.assertEquals(
+            compiled.render({'email': '', 'name': 'Student', 'user_id': None}),
+            u"   Student|body|edX"
+        )
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
@@ -27,6 +27,7 @@ from celery.states import SUCCESS, FAILURE
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from bulk_email.models import CourseEmail, Optout, SEND_TO_ALL
 
@@ -254,6 +255,24 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([exception, None, None, None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, expected_succeeds, failed=expected_fails)
 
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=4)
+    def test_successful_with_connection_pool(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+            self.assertEquals(get_conn.call_count, 4)
+            self.assertEquals(get_conn.return_value.send_messages.call_count, num_emails)
+            sent_to = set(call[0][0][0].to[0] for call in get_conn.return_value.send_messages.call_args_list)
+            self.assertEquals(len(sent_to), num_emails)
+
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=4)
+    def test_email_address_failures_with_connection_pool(self):
+        self._test_email_address_failures(SMTPDataError(554, "Email address is blacklisted"))
+
     def test_smtp_blacklisted_user(self):
         # Test that celery handles permanent SMTPDataErrors by failing and not retrying.
         self._test_email_address_failures(SMTPDataError(554, "Email address is blacklisted"))
@@ -165,14 +165,38 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(
             user=student, course_id=course_id)
-        d = {'status': generated_certificate.status,
-             'mode': generated_certificate.mode}
-        if generated_certificate.grade:
-            d['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            d['download_url'] = generated_certificate.download_url
-
-        return d
+        return _certificate_status(generated_certificate)
     except GeneratedCertificate.DoesNotExist:
         pass
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+
+
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Return a dictionary mapping each of the course_ids to the status of the
+    certificate of the student in that course, as certificate_status_for_student
+    returns it, looking up all of the certificates at once.
+    """
+    statuses = {
+        course_id: {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+        for course_id in course_ids
+    }
+    if statuses:
+        for generated_certificate in GeneratedCertificate.objects.filter(user=student, course_id__in=course_ids):
+            statuses[generated_certificate.course_id] = _certificate_status(generated_certificate)
+    return statuses
+
+
+def _certificate_status(generated_certificate):
+    """
+    Return the status dictionary of certificate_status_for_student for the
+    GeneratedCertificate generated_certificate.
+    """
+    d = {'status': generated_certificate.status,
+         'mode': generated_certificate.mode}
+    if generated_certificate.grade:
+        d['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        d['download_url'] = generated_certificate.download_url
+
+    return d
@@ -10,7 +10,9 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 from student.tests.factories import UserFactory
-from certificates.models import CertificateStatuses, GeneratedCertificate, certificate_status_for_student
+from certificates.models import (
+    CertificateStatuses, GeneratedCertificate, certificate_status_for_student, certificate_statuses_for_student
+)
 from certificates.tests.factories import GeneratedCertificateFactory
 
 from util.milestones_helpers import (
@@ -33,6 +35,28 @@ class CertificatesModelTest(ModuleStoreTestCase):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_student(self):
+        student = UserFactory()
+        course = CourseFactory.create(org='edx', number='verified', display_name='Verified Course')
+        other_course = CourseFactory.create(org='edx', number='other', display_name='Other Course')
+        GeneratedCertificateFactory.create(
+            user=student,
+            course_id=course.id,
+            status=CertificateStatuses.downloadable,
+            mode=GeneratedCertificate.MODES.verified,
+            download_url='http://www.example.com/certificate.pdf',
+            grade='0.95',
+        )
+
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_student(student, [course.id, other_course.id])
+        self.assertEqual(statuses, {
+            course.id: certificate_status_for_student(student, course.id),
+            other_course.id: certificate_status_for_student(student, other_course.id),
+        })
+        self.assertEqual(statuses[course.id]['status'], CertificateStatuses.downloadable)
+        self.assertEqual(statuses[other_course.id]['status'], CertificateStatuses.unavailable)
+
     @patch.dict(settings.FEATURES, {'ENABLE_PREREQUISITE_COURSES': True, 'MILESTONES_APP': True})
     def test_course_milestone_collected(self):
         seed_milestone_relationship_types()
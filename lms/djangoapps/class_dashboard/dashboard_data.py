@@ -18,6 +18,34 @@ from opaque_keys.edx.locations import Location
 MAX_SCREEN_LIST_LENGTH = 250
 
 
+def _grade_counts(course_id, **filters):
+    """
+    Returns the number of students with each grade of the modules of the course matching `filters`.
+
+    `course_id` the course ID for the course interested in
+
+    Output is a list of dicts with 'module_state_key', 'grade', 'max_grade' and 'count_grade', ordered
+    by 'module_state_key' and 'grade'. The counts are read from the maintained grade counts if they are
+    enabled, or else aggregated from the studentmodule table.
+    """
+    if models.StudentModuleGradeCount.is_enabled():
+        return [
+            {'module_state_key': module_state_key, 'grade': grade, 'max_grade': max_grade, 'count_grade': count}
+            for module_state_key, grade, max_grade, count
+            in models.StudentModuleGradeCount.distribution(course_id=course_id, **filters)
+        ]
+
+    # Aggregate query on studentmodule table for grade data
+    return models.StudentModule.objects.filter(
+        course_id__exact=course_id,
+        **filters
+    ).values(
+        'module_state_key',
+        'grade',
+        'max_grade',
+    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+
+
 def get_problem_grade_distribution(course_id):
     """
     Returns the grade distribution per problem for the course
@@ -32,12 +60,7 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    db_query = _grade_counts(course_id, grade__isnull=False, module_type__exact="problem")
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -75,11 +98,20 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    if models.StudentModuleGradeCount.is_enabled():
+        # Everyone who opened a subsection is counted under some grade
+        db_query = []
+        for row in _grade_counts(course_id, module_type__exact="sequential"):
+            if db_query and db_query[-1]['module_state_key'] == row['module_state_key']:
+                db_query[-1]['count_sequential'] += row['count_grade']
+            else:
+                db_query.append({'module_state_key': row['module_state_key'], 'count_sequential': row['count_grade']})
+    else:
+        # Aggregate query on studentmodule table for "opening a subsection" data
+        db_query = models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            module_type__exact="sequential",
+        ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
@@ -105,17 +137,12 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
+    db_query = _grade_counts(
+        course_id,
         grade__isnull=False,
         module_type__exact="problem",
         module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+    )
 
     prob_grade_distrib = {}
 
@@ -317,3 +317,21 @@ class TestGetProblemGradeDistribution(ModuleStoreTestCase):
         """
         ret_val = has_instructor_access_for_class(self.instructor, self.course.id)
         self.assertEquals(ret_val, True)
+
+
+class TestGetGradeDistributionFromCounts(TestGetProblemGradeDistribution):
+    """
+    Run the same tests against the maintained grade counts
+    """
+
+    def setUp(self):
+        patcher = patch.dict('django.conf.settings.FEATURES', {'ENABLE_GRADE_DISTRIBUTION_AGGREGATES': True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super(TestGetGradeDistributionFromCounts, self).setUp()
+
+    def test_no_studentmodule_aggregation(self):
+        with patch('courseware.models.StudentModule.objects') as mock_objects:
+            get_problem_grade_distribution(self.course.id)
+            get_sequential_open_distrib(self.course.id)
+        self.assertFalse(mock_objects.filter.called)
@@ -9,7 +9,7 @@ from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 
 from xmodule.course_module import (
-    CourseDescriptor, CATALOG_VISIBILITY_CATALOG_AND_ABOUT,
+    CourseDescriptor, CourseSummary, CATALOG_VISIBILITY_CATALOG_AND_ABOUT,
     CATALOG_VISIBILITY_ABOUT)
 from xmodule.error_module import ErrorDescriptor
 from xmodule.x_module import XModule
@@ -55,8 +55,8 @@ def has_access(user, action, obj, course_key=None):
     user: a Django user object. May be anonymous. If none is passed,
                     anonymous is assumed
 
-    obj: The object to check access for.  A module, descriptor, location, or
-                    certain special strings (e.g. 'global')
+    obj: The object to check access for.  A module, descriptor, course summary,
+                    location, or certain special strings (e.g. 'global')
 
     action: A string specifying the action that the client is trying to perform.
 
@@ -76,7 +76,8 @@ def has_access(user, action, obj, course_key=None):
 
     # delegate the work to type-specific functions.
     # (start with more specific types, then get more general)
-    if isinstance(obj, CourseDescriptor):
+    # (a CourseSummary has the fields of its course that these checks read)
+    if isinstance(obj, (CourseDescriptor, CourseSummary)):
         return _has_access_course_desc(user, action, obj)
 
     if isinstance(obj, ErrorDescriptor):
@@ -107,7 +108,7 @@ def has_access(user, action, obj, course_key=None):
 # ================ Implementation helpers ================================
 def _has_access_course_desc(user, action, course):
     """
-    Check if user has access to a course descriptor.
+    Check if user has access to a course descriptor, or to the CourseSummary of one.
 
     Valid actions:
 
@@ -524,7 +525,7 @@ def _dispatch(table, action, user, obj):
         debug("%s user %s, object %s, action %s",
               'ALLOWED' if result else 'DENIED',
               user,
-              obj.location.to_deprecated_string() if isinstance(obj, XBlock) else str(obj),
+              obj.location.to_deprecated_string() if isinstance(obj, (XBlock, CourseSummary)) else str(obj),
               action)
         return result
 
@@ -75,6 +75,29 @@ def get_course_by_id(course_key, depth=0):
         raise Http404("Course not found.")
 
 
+def get_course_version(course):
+    """
+    Return a unicode string identifying the version of `course` that was
+    loaded, or None if the backing modulestore can't tell us.
+
+    Split courses are identified by the guid of their (immutable) structure.
+    Old Mongo courses use the time of the last edit or publish anywhere in
+    the course, which is propagated to the course block. XML courses have no
+    notion of versions, so callers must not cache anything keyed on them.
+    """
+    course_entry = getattr(course.runtime, 'course_entry', None)
+    if course_entry is not None:
+        return unicode(course_entry.structure['_id'])
+
+    get_subtree_edited_on = getattr(course.runtime, 'get_subtree_edited_on', None)
+    if get_subtree_edited_on is not None:
+        edited_on = get_subtree_edited_on(course)
+        if edited_on is not None:
+            return unicode(edited_on.isoformat())
+
+    return None
+
+
 class UserNotEnrolled(Http404):
     def __init__(self, course_key):
         super(UserNotEnrolled, self).__init__()
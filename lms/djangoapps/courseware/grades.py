@@ -1,16 +1,20 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from itertools import islice
 import json
 import random
 import logging
 
 from contextlib import contextmanager
+from datetime import datetime
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.test.client import RequestFactory
 
 import dogstats_wrapper as dog_stats_api
+from pytz import UTC
 
 from courseware import courses
 from courseware.model_data import FieldDataCache
@@ -20,15 +24,22 @@ from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.util.duedate import get_extended_due_date
-from .models import StudentModule
+from .models import StudentModule, PersistentSubsectionGrade, PersistentCourseGrade
 from .module_render import get_module_for_descriptor
 from .module_utils import yield_dynamic_descriptor_descendents
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
+from request_cache.middleware import RequestCache
 
 
 log = logging.getLogger("edx.courseware")
 
+# The number of students whose grading data iterate_grades_for loads together
+GRADING_CHUNK_SIZE = 500
+
+# How long the grading context of a course version stays in the django cache
+GRADING_CONTEXT_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 def answer_distributions(course_key):
     """
@@ -120,17 +131,237 @@ def answer_distributions(course_key):
     return answer_counts
 
 
+# A graded section, as known to CourseGradingContext:
+#  - location: usage key of the section
+#  - display_name: display name of the section
+#  - scored_locations: usage keys of the section and its descendents that
+#    have a score
+#  - always_recalculate: whether any of those is graded independently of
+#    interaction with the LMS, so the section always has to be graded
+GradedSection = namedtuple('GradedSection', 'location display_name scored_locations always_recalculate')
+
+
+class CourseGradingContext(object):
+    """
+    The parts of `course.grading_context` that grading a student needs, as a
+    dict of section format -> list of GradedSection.
+
+    Unlike `course.grading_context`, the graded sections only hold usage keys
+    and flags, so they can be pickled. They are cached in the request cache
+    and the django cache for each course version, rather than walking the
+    course tree again for every course object that is loaded. Descriptors are
+    only needed for the sections that have to be graded from the student's
+    state, and are loaded one section at a time when asked for with
+    `section_descriptor`.
+    """
+    def __init__(self, course, graded_sections):
+        self.course = course
+        self.graded_sections = graded_sections
+        self._section_descriptors = {}
+
+    @classmethod
+    def for_course(cls, course):
+        """
+        Return the CourseGradingContext for `course`, from the caches if the
+        version of `course` can be told.
+        """
+        course_version = courses.get_course_version(course)
+        if course_version is None:
+            return cls(course, cls._graded_sections(course))
+
+        cache_key = u'courseware.grades.grading_context.{}.{}'.format(course.id, course_version)
+        request_cache = RequestCache.get_request_cache().data.setdefault('grading-context-cache', {})
+        graded_sections = request_cache.get(cache_key)
+        if graded_sections is None:
+            graded_sections = cache.get(cache_key)
+            if graded_sections is None:
+                graded_sections = cls._graded_sections(course)
+                cache.set(cache_key, graded_sections, GRADING_CONTEXT_CACHE_TIMEOUT)
+            request_cache[cache_key] = graded_sections
+        return cls(course, graded_sections)
+
+    @staticmethod
+    def _graded_sections(course):
+        """
+        Return the graded sections of `course`, walking its tree through
+        `course.grading_context`.
+        """
+        graded_sections = {}
+        for section_format, sections in course.grading_context['graded_sections'].iteritems():
+            graded_sections[section_format] = [
+                GradedSection(
+                    location=section['section_descriptor'].location,
+                    display_name=section['section_descriptor'].display_name_with_default,
+                    scored_locations=[descriptor.location for descriptor in section['xmoduledescriptors']],
+                    always_recalculate=any(
+                        descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
+                    ),
+                )
+                for section in sections
+            ]
+        return graded_sections
+
+    def section_descriptor(self, section):
+        """
+        Return the descriptor of the GradedSection `section`, loading just the
+        section and its descendents rather than walking the whole course.
+        """
+        if section.location not in self._section_descriptors:
+            self._section_descriptors[section.location] = modulestore().get_item(section.location, depth=None)
+        return self._section_descriptors[section.location]
+
+
+class PersistentGradeStore(object):
+    """
+    Reads and writes the persisted subsection and course grades of one student
+    for the loaded version of a course.
+
+    Persisted grades are keyed on the course version, so publishing a new
+    version of the course invalidates all of them. Within a version, a grade
+    stays valid until one of the student's StudentModules in its scope is
+    modified, so a new submission only causes the affected subsection (and
+    the course aggregate) to be recomputed. Changes to the student's cohort
+    or partition groups discard all of their grades in the course (see
+    courseware.models).
+    """
+    def __init__(self, student, course_key, course_version):
+        self.student = student
+        self.course_key = course_key
+        self.course_version = course_version
+        # Captured before any score is read, so that StudentModules written
+        # while we are grading invalidate whatever we persist.
+        self.started = datetime.now(UTC)
+        self._subsection_grades = None
+        self._modified_modules = None
+
+    @classmethod
+    def for_student(cls, student, course):
+        """
+        Return a PersistentGradeStore for grading `student` in `course`, or
+        None if grades can't be persisted for this course.
+        """
+        if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES') or settings.GENERATE_PROFILE_SCORES:
+            return None
+        if not student.is_authenticated():
+            return None
+
+        course_version = courses.get_course_version(course)
+        if course_version is None:
+            return None
+        return cls(student, course.id, course_version)
+
+    @property
+    def subsection_grades(self):
+        """
+        A dict of subsection usage key -> PersistentSubsectionGrade for this
+        course version. Loaded on first access.
+        """
+        if self._subsection_grades is None:
+            self._subsection_grades = PersistentSubsectionGrade.grades_for_version(
+                self.student, self.course_key, self.course_version
+            )
+        return self._subsection_grades
+
+    @property
+    def modified_modules(self):
+        """
+        A dict of usage key -> modification time for each StudentModule that
+        was modified after the oldest persisted subsection grade was computed.
+        """
+        if self._modified_modules is None:
+            self._modified_modules = {}
+            if self.subsection_grades:
+                oldest = min(grade.computed for grade in self.subsection_grades.itervalues())
+                modified = StudentModule.objects.filter(
+                    student=self.student, course_id=self.course_key, modified__gte=oldest
+                ).values_list('module_state_key', 'modified')
+                for usage_key, modified_time in modified:
+                    self._modified_modules[usage_key.map_into_course(self.course_key)] = modified_time
+        return self._modified_modules
+
+    def course_grade(self):
+        """
+        Return the persisted grade summary for the course, or None if there
+        is none or it is out of date.
+        """
+        try:
+            persisted = PersistentCourseGrade.objects.get(user=self.student, course_id=self.course_key)
+        except PersistentCourseGrade.DoesNotExist:
+            return None
+
+        if persisted.course_version != self.course_version:
+            return None
+        if StudentModule.objects.filter(
+                student=self.student, course_id=self.course_key, modified__gte=persisted.computed
+        ).exists():
+            return None
+
+        grade_summary = json.loads(persisted.gradeset)
+        grade_summary['totaled_scores'] = {
+            section_format: [Score(*score) for score in scores]
+            for section_format, scores in grade_summary['totaled_scores'].iteritems()
+        }
+        return grade_summary
+
+    def subsection_grade(self, section):
+        """
+        Return a tuple (graded_total, scores) for the GradedSection `section`,
+        or None if there is no up-to-date persisted grade for it.
+        """
+        persisted = self.subsection_grades.get(section.location)
+        if persisted is None:
+            return None
+
+        for location in section.scored_locations:
+            modified = self.modified_modules.get(location)
+            if modified is not None and modified >= persisted.computed:
+                return None
+
+        graded_total = Score(persisted.earned, persisted.possible, True, section.display_name)
+        scores = [Score(*score) for score in json.loads(persisted.raw_scores)]
+        return graded_total, scores
+
+    def save_subsection_grade(self, section_location, graded_total, scores):
+        """
+        Persist the grade computed for the section at `section_location`.
+        """
+        PersistentSubsectionGrade.save_grade(
+            self.student,
+            self.course_key,
+            section_location,
+            course_version=self.course_version,
+            earned=graded_total.earned,
+            possible=graded_total.possible,
+            raw_scores=json.dumps(scores),
+            computed=self.started,
+        )
+
+    def save_course_grade(self, grade_summary):
+        """
+        Persist the grade summary computed for the course.
+        """
+        gradeset = dict(grade_summary)
+        gradeset.pop('raw_scores', None)
+        PersistentCourseGrade.save_grade(
+            self.student,
+            self.course_key,
+            course_version=self.course_version,
+            gradeset=json.dumps(gradeset),
+            computed=self.started,
+        )
+
+
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False):
+def grade(student, request, course, keep_raw_scores=False, field_data_cache=None):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
     """
     with manual_transaction():
-        return _grade(student, request, course, keep_raw_scores)
+        return _grade(student, request, course, keep_raw_scores, field_data_cache)
 
 
-def _grade(student, request, course, keep_raw_scores):
+def _grade(student, request, course, keep_raw_scores, field_data_cache=None):
     """
     Unwrapped version of "grade"
 
@@ -149,11 +380,15 @@ def _grade(student, request, course, keep_raw_scores):
     - keep_raw_scores : if True, then value for key 'raw_scores' contains scores
       for every graded module
 
+    field_data_cache: if given, a FieldDataCache for the student that already
+      holds the data for all of course.grading_context['all_descriptors'].
+      It is used in place of querying for each problem.
+
     More information on the format is in the docstring for CourseGrader.
-    """
-    grading_context = course.grading_context
-    raw_scores = []
 
+    If ENABLE_PERSISTENT_GRADES is set, up-to-date persisted grades are used
+    in place of grading again, and the grades computed here are persisted.
+    """
     # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
     # scores that were registered with the submissions API, which for the moment
     # means only openassessment (edx-ora2)
@@ -161,57 +396,85 @@ def _grade(student, request, course, keep_raw_scores):
         course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
     )
 
+    grade_store = PersistentGradeStore.for_student(student, course)
+    if grade_store is not None and not keep_raw_scores and not submissions_scores:
+        grade_summary = grade_store.course_grade()
+        if grade_summary is not None:
+            return grade_summary
+
+    grading_context = CourseGradingContext.for_course(course)
+    raw_scores = []
+
+    # The course grade can only be persisted if all of its sections can be.
+    course_grade_persistable = grade_store is not None and not submissions_scores
+
     totaled_scores = {}
     # This next complicated loop is just to collect the totaled_scores, which is
     # passed to the grader
-    for section_format, sections in grading_context['graded_sections'].iteritems():
+    for section_format, sections in grading_context.graded_sections.iteritems():
         format_scores = []
         for section in sections:
-            section_descriptor = section['section_descriptor']
-            section_name = section_descriptor.display_name_with_default
+            section_name = section.display_name
 
             # some problems have state that is updated independently of interaction
             # with the LMS, so they need to always be scored. (E.g. foldit.,
             # combinedopenended)
-            should_grade_section = any(
-                descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
-            )
+            should_grade_section = section.always_recalculate
 
             # If there are no problems that always have to be regraded, check to
             # see if any of our locations are in the scores from the submissions
             # API. If scores exist, we have to calculate grades for this section.
             if not should_grade_section:
                 should_grade_section = any(
-                    descriptor.location.to_deprecated_string() in submissions_scores
-                    for descriptor in section['xmoduledescriptors']
+                    location.to_deprecated_string() in submissions_scores
+                    for location in section.scored_locations
                 )
 
-            if not should_grade_section:
+            # Scores that don't come from StudentModules can change without us
+            # noticing, so sections that have them are never persisted.
+            section_persistable = grade_store is not None and not should_grade_section
+            course_grade_persistable = course_grade_persistable and section_persistable
+
+            persisted_grade = grade_store.subsection_grade(section) if section_persistable else None
+
+            if persisted_grade is None and not should_grade_section and field_data_cache is not None:
+                should_grade_section = any(
+                    field_data_cache.find_student_module(location) is not None
+                    for location in section.scored_locations
+                )
+            elif persisted_grade is None and not should_grade_section:
                 with manual_transaction():
                     should_grade_section = StudentModule.objects.filter(
                         student=student,
-                        module_state_key__in=[
-                            descriptor.location for descriptor in section['xmoduledescriptors']
-                        ]
+                        module_state_key__in=section.scored_locations
                     ).exists()
 
             # If we haven't seen a single problem in the section, we don't have
             # to grade it at all! We can assume 0%
-            if should_grade_section:
+            if persisted_grade is not None:
+                graded_total, scores = persisted_grade
+                if keep_raw_scores:
+                    raw_scores += scores
+            elif should_grade_section:
                 scores = []
+                section_descriptor = grading_context.section_descriptor(section)
 
                 def create_module(descriptor):
                     '''creates an XModule instance given a descriptor'''
                     # TODO: We need the request to pass into here. If we could forego that, our arguments
                     # would be simpler
-                    with manual_transaction():
-                        field_data_cache = FieldDataCache([descriptor], course.id, student)
-                    return get_module_for_descriptor(student, request, descriptor, field_data_cache, course.id)
+                    if field_data_cache is not None:
+                        module_field_data_cache = field_data_cache
+                    else:
+                        with manual_transaction():
+                            module_field_data_cache = FieldDataCache([descriptor], course.id, student)
+                    return get_module_for_descriptor(student, request, descriptor, module_field_data_cache, course.id)
 
                 for module_descriptor in yield_dynamic_descriptor_descendents(section_descriptor, create_module):
 
                     (correct, total) = get_score(
-                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores
+                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores,
+                        field_data_cache=field_data_cache
                     )
                     if correct is None and total is None:
                         continue
@@ -233,15 +496,19 @@ def _grade(student, request, course, keep_raw_scores):
                 if keep_raw_scores:
                     raw_scores += scores
             else:
+                scores = []
                 graded_total = Score(0.0, 1.0, True, section_name)
 
+            if section_persistable and persisted_grade is None:
+                grade_store.save_subsection_grade(section.location, graded_total, scores)
+
             #Add the graded total to totaled_scores
             if graded_total.possible > 0:
                 format_scores.append(graded_total)
             else:
                 log.info(
                     "Unable to grade a section with a total possible score of zero. " +
-                    str(section_descriptor.location)
+                    str(section.location)
                 )
 
         totaled_scores[section_format] = format_scores
@@ -259,6 +526,8 @@ def _grade(student, request, course, keep_raw_scores):
         # way to get all RAW scores out to instructor
         # so grader can be double-checked
         grade_summary['raw_scores'] = raw_scores
+    if course_grade_persistable:
+        grade_store.save_course_grade(grade_summary)
     return grade_summary
 
 
@@ -386,7 +655,7 @@ def _progress_summary(student, request, course):
     return chapters
 
 
-def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None):
+def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None, field_data_cache=None):
     """
     Return the score for a user on a problem, as a tuple (correct, total).
     e.g. (5,7) if you got 5 out of 7 points.
@@ -400,6 +669,8 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
            Can return None if user doesn't have access, or if something else went wrong.
     scores_cache: A dict of location names to (earned, possible) point tuples.
            If an entry is found in this cache, it takes precedence.
+    field_data_cache: A FieldDataCache for the user that holds the data of problem_descriptor.
+           If given, the user's StudentModule is looked up in it instead of being queried.
     """
     scores_cache = scores_cache or {}
 
@@ -426,14 +697,17 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
         # These are not problems, and do not have a score
         return (None, None)
 
-    try:
-        student_module = StudentModule.objects.get(
-            student=user,
-            course_id=course_id,
-            module_state_key=problem_descriptor.location
-        )
-    except StudentModule.DoesNotExist:
-        student_module = None
+    if field_data_cache is not None:
+        student_module = field_data_cache.find_student_module(problem_descriptor.location)
+    else:
+        try:
+            student_module = StudentModule.objects.get(
+                student=user,
+                course_id=course_id,
+                module_state_key=problem_descriptor.location
+            )
+        except StudentModule.DoesNotExist:
+            student_module = None
 
     if student_module is not None and student_module.max_grade is not None:
         correct = student_module.grade if student_module.grade is not None else 0
@@ -479,7 +753,7 @@ def manual_transaction():
         transaction.commit()
 
 
-def iterate_grades_for(course_id, students):
+def iterate_grades_for(course_id, students, chunk_size=GRADING_CHUNK_SIZE):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
     (student, gradeset, err_msg) for every student enrolled in the course.
@@ -496,6 +770,9 @@ def iterate_grades_for(course_id, students):
     - grade_breakdown : A breakdown of the major components that
         make up the final grade. (For display)
     - raw_scores: contains scores for every graded module
+
+    Students are graded in chunks of `chunk_size`, and the data needed to
+    grade all the students of a chunk is loaded with a few shared queries.
     """
     course = courses.get_course_by_id(course_id)
 
@@ -504,25 +781,57 @@ def iterate_grades_for(course_id, students):
     # grading that student.
     request = RequestFactory().get('/')
 
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course_id)]):
-            try:
-                request.user = student
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course)
-                yield student, gradeset, ""
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course_id,
-                    exc.message
-                )
-                yield student, {}, exc.message
+    for student_chunk in _chunked(students, chunk_size):
+        field_data_caches = _field_data_caches_for(course, student_chunk)
+
+        for student in student_chunk:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course_id)]):
+                try:
+                    request.user = student
+                    # Grading calls problem rendering, which calls masquerading,
+                    # which checks session vars -- thus the empty session dict below.
+                    # It's not pretty, but untangling that is currently beyond the
+                    # scope of this feature.
+                    request.session = {}
+                    gradeset = grade(
+                        student, request, course, field_data_cache=field_data_caches.get(student.id)
+                    )
+                    yield student, gradeset, ""
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Keep marching on even if this student couldn't be graded for
+                    # some reason, but log it for future reference.
+                    log.exception(
+                        'Cannot grade student %s (%s) in course %s because of exception: %s',
+                        student.username,
+                        student.id,
+                        course_id,
+                        exc.message
+                    )
+                    yield student, {}, exc.message
+
+
+def _chunked(items, chunk_size):
+    """
+    Yields lists of up to chunk_size values from the iterable items, without
+    materializing all of them at once.
+    """
+    iterator = iter(items)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def _field_data_caches_for(course, students):
+    """
+    Return a dict of student id -> FieldDataCache holding the data needed to
+    grade each of `students` in `course`.
+
+    If loading the data fails, an empty dict is returned, so that students are
+    graded with the data loaded per problem instead.
+    """
+    try:
+        return FieldDataCache.cache_for_users(course.grading_context['all_descriptors'], course.id, students)
+    except Exception:  # pylint: disable=broad-except
+        log.exception('Cannot load the grading data of a chunk of students in course %s', course.id)
+        return {}
@@ -0,0 +1,38 @@
+"""
+Recount the grades of the StudentModules of courses, from which the grade
+distributions of the instructor dashboard and staff debug info are read.
+"""
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.models import StudentModuleGradeCount
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Recount the grades of the StudentModules of the given courses, or of
+    all courses if none are given.
+
+    Run it after enabling FEATURES['ENABLE_GRADE_DISTRIBUTION_AGGREGATES'],
+    and whenever the counts seem to have drifted.
+
+    """
+    args = '[<course_id> ...]'
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        if args:
+            try:
+                course_keys = [CourseKey.from_string(arg) for arg in args]
+            except InvalidKeyError as error:
+                raise CommandError(u"Invalid course id: {}".format(error))
+        else:
+            course_keys = [course.id for course in modulestore().get_courses()]
+
+        for course_key in course_keys:
+            count = StudentModuleGradeCount.rebuild(course_key)
+            self.stdout.write(u"{}: {} grade counts\n".format(course_key, count))
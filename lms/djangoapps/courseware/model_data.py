@@ -122,6 +122,43 @@ class FieldDataCache(object):
 
         return FieldDataCache(descriptors, course_id, user, select_for_update, asides=asides)
 
+    @classmethod
+    def cache_for_users(cls, descriptors, course_id, users, asides=None):
+        """
+        Return a dict of user id -> FieldDataCache for each of `users`, each
+        caching the data needed by `descriptors`.
+
+        The caches are populated together, so the number of queries made grows
+        with the number of users only in chunks, rather than once per user and
+        descriptor as when building a FieldDataCache for each of them.
+
+        users: a list of authenticated django users
+        """
+        caches = {}
+        for user in users:
+            # Without descriptors, the constructor doesn't query anything
+            field_data_cache = cls([], course_id, user, asides=asides)
+            field_data_cache.descriptors = descriptors
+            caches[user.id] = field_data_cache
+
+        if not caches:
+            return caches
+
+        # All of the caches are for the same descriptors, so any of them can
+        # work out what needs loading
+        loader = caches.itervalues().next()
+        for scope, fields in loader._fields_to_cache().items():
+            for field_object in loader._retrieve_fields_for_users(scope, fields, caches.keys()):
+                cache_key = loader._cache_key_from_field_object(scope, field_object)
+                if scope == Scope.user_state_summary:
+                    # Not user specific, so shared by all of the caches
+                    for field_data_cache in caches.itervalues():
+                        field_data_cache.cache[cache_key] = field_object
+                else:
+                    caches[field_object.student_id].cache[cache_key] = field_object
+
+        return caches
+
     def _query(self, model_class, **kwargs):
         """
         Queries model_class with **kwargs, optionally adding select_for_update if
@@ -212,6 +249,53 @@ class FieldDataCache(object):
         else:
             return []
 
+    def _retrieve_fields_for_users(self, scope, fields, user_ids):
+        """
+        Queries the database for all of the fields in the specified scope for
+        all of the users in `user_ids`
+        """
+        if scope == Scope.user_state:
+            # Filtering on both users and usage ids would make for a query per
+            # chunk of each, so load the users' state for the whole course and
+            # discard what isn't needed.
+            usage_ids = self._all_usage_ids
+            return (
+                student_module
+                for student_module in self._chunked_query(
+                    StudentModule,
+                    'student__in',
+                    user_ids,
+                    course_id=self.course_id,
+                )
+                if student_module.module_state_key.map_into_course(self.course_id) in usage_ids
+            )
+        elif scope == Scope.user_state_summary:
+            return self._retrieve_fields(scope, fields)
+        elif scope == Scope.preferences:
+            return self._chunked_query(
+                XModuleStudentPrefsField,
+                'student__in',
+                user_ids,
+                module_type__in=self._all_block_types,
+                field_name__in=set(field.name for field in fields),
+            )
+        elif scope == Scope.user_info:
+            return self._chunked_query(
+                XModuleStudentInfoField,
+                'student__in',
+                user_ids,
+                field_name__in=set(field.name for field in fields),
+            )
+        else:
+            return []
+
+    def find_student_module(self, usage_key):
+        """
+        Return the StudentModule cached for `usage_key`, or None if there
+        isn't one.
+        """
+        return self.cache.get((Scope.user_state, usage_key))
+
     def _fields_to_cache(self):
         """
         Returns a map of scopes to fields in that scope that should be cached
@@ -14,11 +14,14 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 """
 from django.contrib.auth.models import User
 from django.conf import settings
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 
-from xmodule_django.models import CourseKeyField, LocationKeyField, BlockTypeKeyField
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup, CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.user_api.models import UserCourseTag
+from xmodule_django.models import CourseKeyField, LocationKeyField, BlockTypeKeyField, UsageKeyField
 
 
 class StudentModule(models.Model):
@@ -230,3 +233,318 @@ class OfflineComputedGradeLog(models.Model):
 
     def __unicode__(self):
         return "[OCGLog] %s: %s" % (self.course_id.to_deprecated_string(), self.created)  # pylint: disable=no-member
+
+
+class PersistentSubsectionGrade(models.Model):
+    """
+    A student's score on one graded subsection, as computed for a single
+    version of the course.
+
+    A row may only be used while `course_version` matches the version of the
+    course being graded and no StudentModule in the subsection has been
+    modified at or after `computed`. Rows are deleted when the student's
+    cohort or partition groups change.
+    """
+    class Meta:
+        unique_together = (('user', 'course_id', 'usage_key'),)
+
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    usage_key = UsageKeyField(max_length=255)
+    course_version = models.CharField(max_length=255, blank=True)
+
+    # The graded total of the subsection, as passed to the course grader
+    earned = models.FloatField()
+    possible = models.FloatField()
+
+    # The individual problem scores, stored as a JSON list of Score tuples
+    raw_scores = models.TextField(blank=True, default='[]')
+
+    # When the computation of this grade started
+    computed = models.DateTimeField(db_index=True)
+
+    @classmethod
+    def grades_for_version(cls, user, course_id, course_version):
+        """
+        Return a dict of subsection usage key -> PersistentSubsectionGrade
+        for all of the grades of `user` computed for `course_version`.
+        """
+        return {
+            grade.usage_key.map_into_course(course_id): grade
+            for grade in cls.objects.filter(user=user, course_id=course_id, course_version=course_version)
+        }
+
+    @classmethod
+    def save_grade(cls, user, course_id, usage_key, **values):
+        """
+        Create or replace the grade of `user` for the subsection `usage_key`.
+        """
+        grade, created = cls.objects.get_or_create(
+            user=user, course_id=course_id, usage_key=usage_key, defaults=values
+        )
+        if not created:
+            for field_name, value in values.iteritems():
+                setattr(grade, field_name, value)
+            grade.save()
+        return grade
+
+    def __unicode__(self):
+        return u"[PersistentSubsectionGrade] {}: {} ({}) = {}/{}".format(
+            self.user, self.usage_key, self.course_version, self.earned, self.possible
+        )
+
+
+class PersistentCourseGrade(models.Model):
+    """
+    The full grade summary of a student in a course, as computed for a single
+    version of the course from the student's PersistentSubsectionGrades.
+
+    The same validity rules as for PersistentSubsectionGrade apply, checked
+    against every StudentModule of the student in the course.
+    """
+    class Meta:
+        unique_together = (('user', 'course_id'),)
+
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    course_version = models.CharField(max_length=255, blank=True)
+
+    # The output of the course grader, stored as JSON
+    gradeset = models.TextField()
+
+    # When the computation of this grade started
+    computed = models.DateTimeField(db_index=True)
+
+    @classmethod
+    def save_grade(cls, user, course_id, **values):
+        """
+        Create or replace the course grade of `user` in `course_id`.
+        """
+        grade, created = cls.objects.get_or_create(user=user, course_id=course_id, defaults=values)
+        if not created:
+            for field_name, value in values.iteritems():
+                setattr(grade, field_name, value)
+            grade.save()
+        return grade
+
+    def __unicode__(self):
+        return u"[PersistentCourseGrade] {}: {} ({})".format(self.user, self.course_id, self.course_version)
+
+
+def _clear_persistent_grades(user_ids, course_id):
+    """
+    Discard all of the persisted grades of the given users in the course.
+    """
+    for model_class in (PersistentSubsectionGrade, PersistentCourseGrade):
+        model_class.objects.filter(user_id__in=user_ids, course_id=course_id).delete()
+
+
+@receiver(post_delete, sender=StudentModule)
+def clear_persistent_grades(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Deleting a StudentModule (e.g. when an instructor resets a student's
+    attempts) leaves no trace for the modification checks of the persisted
+    grades, so discard all of the student's grades in the course instead.
+    """
+    _clear_persistent_grades([instance.student_id], instance.course_id)
+
+
+@receiver(m2m_changed, sender=CourseUserGroup.users.through)
+def clear_persistent_grades_of_moved_users(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Which problems count towards a student's grade can depend on their cohort,
+    and moving them to another one modifies no StudentModule, so discard the
+    persisted grades of the students added to or removed from a course group.
+    """
+    action = kwargs['action']
+    pk_set = kwargs['pk_set']
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if kwargs['reverse']:
+        # `instance` is the user, and `pk_set` the course groups
+        if action == 'pre_clear':
+            groups = instance.course_groups.all()
+        else:
+            groups = CourseUserGroup.objects.filter(pk__in=pk_set)
+        for course_id in set(group.course_id for group in groups):
+            _clear_persistent_grades([instance.id], course_id)
+    else:
+        # `instance` is the course group, and `pk_set` the users
+        if action == 'pre_clear':
+            user_ids = list(instance.users.values_list('id', flat=True))
+        else:
+            user_ids = list(pk_set)
+        _clear_persistent_grades(user_ids, instance.course_id)
+
+
+@receiver(post_save, sender=CourseUserGroupPartitionGroup)
+@receiver(pre_delete, sender=CourseUserGroupPartitionGroup)
+def clear_persistent_grades_of_cohort(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Linking a cohort to another content group changes the partition group of
+    all of its students, so discard their persisted grades.
+    """
+    course_user_group = instance.course_user_group
+    _clear_persistent_grades(
+        list(course_user_group.users.values_list('id', flat=True)), course_user_group.course_id
+    )
+
+
+@receiver(post_save, sender=UserCourseTag)
+def clear_persistent_grades_of_reassigned_user(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discard the persisted grades of a student whose group in a randomly
+    assigned user partition changed.
+    """
+    if instance.key.startswith('xblock.partition_service.partition_'):
+        _clear_persistent_grades([instance.user_id], instance.course_id)
+
+
+class StudentModuleGradeCount(models.Model):
+    """
+    The number of StudentModules of a module that have a given grade and
+    max_grade, so that grade distributions can be read without aggregating
+    the (very large) StudentModule table.
+
+    The counts are kept up to date as StudentModules are saved and deleted
+    while FEATURES['ENABLE_GRADE_DISTRIBUTION_AGGREGATES'] is set. They only
+    start out right for courses rebuilt with the rebuild_grade_distributions
+    management command after enabling it.
+
+    Concurrent first saves of a grade may create more than one row for it,
+    so the counts of matching rows are always summed when reading.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_type = models.CharField(max_length=32, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_index=True, db_column='module_id')
+    grade = models.FloatField(null=True, blank=True)
+    max_grade = models.FloatField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        Return whether the counts are maintained, and should be read.
+        """
+        return bool(settings.FEATURES.get('ENABLE_GRADE_DISTRIBUTION_AGGREGATES'))
+
+    @classmethod
+    def add(cls, student_module, grade, max_grade, amount):
+        """
+        Add `amount` to the number of StudentModules of `student_module`'s
+        module that have `grade` and `max_grade`.
+        """
+        key = {
+            'course_id': student_module.course_id,
+            'module_state_key': student_module.module_state_key,
+        }
+        for field_name, value in (('grade', grade), ('max_grade', max_grade)):
+            # Filtering on None doesn't match NULLs
+            if value is None:
+                key[field_name + '__isnull'] = True
+            else:
+                key[field_name] = value
+
+        # Update a single row, in case there are duplicates
+        row_ids = list(cls.objects.filter(**key).values_list('id', flat=True)[:1])
+        if row_ids:
+            cls.objects.filter(id=row_ids[0]).update(count=F('count') + amount)
+        else:
+            cls.objects.create(
+                course_id=student_module.course_id,
+                module_type=student_module.module_type,
+                module_state_key=student_module.module_state_key,
+                grade=grade,
+                max_grade=max_grade,
+                count=amount,
+            )
+
+    @classmethod
+    def distribution(cls, **filters):
+        """
+        Return the (module_state_key, grade, max_grade, count) of the
+        StudentModules matching `filters`, for the grades that have any.
+        """
+        rows = cls.objects.filter(**filters).values(
+            'module_state_key', 'grade', 'max_grade'
+        ).annotate(total=Sum('count')).order_by('module_state_key', 'grade')
+        return [
+            (row['module_state_key'], row['grade'], row['max_grade'], row['total'])
+            for row in rows
+            if row['total'] > 0
+        ]
+
+    @classmethod
+    def rebuild(cls, course_id):
+        """
+        Recount the grades of all of the StudentModules of `course_id`.
+
+        StudentModules saved while the course is being recounted may be
+        counted twice or not at all.
+        """
+        rows = StudentModule.objects.filter(course_id=course_id).values(
+            'module_type', 'module_state_key', 'grade', 'max_grade'
+        ).annotate(total=Count('id'))
+        counts = [
+            cls(
+                course_id=course_id,
+                module_type=row['module_type'],
+                module_state_key=row['module_state_key'],
+                grade=row['grade'],
+                max_grade=row['max_grade'],
+                count=row['total'],
+            )
+            for row in rows
+        ]
+        with transaction.commit_on_success():
+            cls.objects.filter(course_id=course_id).delete()
+            cls.objects.bulk_create(counts)
+        return len(counts)
+
+    def __unicode__(self):
+        return u"[StudentModuleGradeCount] {} {}/{}: {}".format(
+            self.module_state_key, self.grade, self.max_grade, self.count
+        )
+
+
+@receiver(post_init, sender=StudentModule)
+def remember_counted_grade(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remember the grade that a StudentModule read from the database is
+    counted under, to move it to its new grade when it is saved.
+    """
+    loaded = instance.__dict__
+    # Don't load deferred fields
+    if instance.pk is not None and 'grade' in loaded and 'max_grade' in loaded:
+        instance._counted_grade = (loaded['grade'], loaded['max_grade'])  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=StudentModule)
+def update_grade_counts(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Move the saved StudentModule from the count of its old grade to the
+    count of its new one.
+    """
+    if not StudentModuleGradeCount.is_enabled():
+        return
+
+    new_grade = (instance.grade, instance.max_grade)
+    old_grade = getattr(instance, '_counted_grade', None)
+    if not created:
+        if old_grade is None or old_grade == new_grade:
+            # Unchanged, or updated without knowing what it was counted under
+            return
+        StudentModuleGradeCount.add(instance, old_grade[0], old_grade[1], -1)
+    StudentModuleGradeCount.add(instance, new_grade[0], new_grade[1], 1)
+    instance._counted_grade = new_grade  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=StudentModule)
+def remove_grade_count(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove the deleted StudentModule from the count of its grade.
+    """
+    counted_grade = getattr(instance, '_counted_grade', None)
+    if StudentModuleGradeCount.is_enabled() and counted_grade is not None:
+        StudentModuleGradeCount.add(instance, counted_grade[0], counted_grade[1], -1)
@@ -0,0 +1,85 @@
+"""
+Tests of the grade counts maintained for StudentModules.
+"""
+from django.core.management import call_command
+from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+
+from courseware.models import StudentModule, StudentModuleGradeCount
+from courseware.tests.factories import StudentModuleFactory
+from xmodule_modifiers import grade_histogram
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_GRADE_DISTRIBUTION_AGGREGATES': True})
+class TestStudentModuleGradeCount(TestCase):
+    """
+    Tests of StudentModuleGradeCount.
+    """
+    def setUp(self):
+        self.course_id = SlashSeparatedCourseKey("MITx", "999", "Robot_Super_Course")
+        self.problem = self.course_id.make_usage_key('problem', 'counted')
+
+    def _module(self, **kwargs):
+        """
+        Create a StudentModule of the problem.
+        """
+        return StudentModuleFactory.create(course_id=self.course_id, module_state_key=self.problem, **kwargs)
+
+    def _distribution(self):
+        """
+        Return the (grade, max_grade, count) of the problem.
+        """
+        return [
+            (grade, max_grade, count)
+            for __, grade, max_grade, count in StudentModuleGradeCount.distribution(module_state_key=self.problem)
+        ]
+
+    def test_created_modules_are_counted(self):
+        self._module()
+        self._module(grade=1, max_grade=2)
+        self._module(grade=1, max_grade=2)
+        self.assertEqual(self._distribution(), [(None, None, 1), (1, 2, 2)])
+
+    def test_regraded_modules_are_moved(self):
+        module = self._module(grade=0, max_grade=2)
+        self._module(grade=0, max_grade=2)
+
+        module = StudentModule.objects.get(id=module.id)
+        module.grade = 2
+        module.save()
+        # Saving without changing the grade doesn't count it again
+        module.save()
+        self.assertEqual(self._distribution(), [(0, 2, 1), (2, 2, 1)])
+
+    def test_deleted_modules_are_removed(self):
+        module = self._module(grade=1, max_grade=1)
+        StudentModule.objects.get(id=module.id).delete()
+        self.assertEqual(self._distribution(), [])
+
+    def test_duplicate_rows_are_summed(self):
+        self._module(grade=1, max_grade=1)
+        StudentModuleGradeCount.objects.create(
+            course_id=self.course_id, module_type='problem', module_state_key=self.problem,
+            grade=1, max_grade=1, count=2,
+        )
+        self.assertEqual(self._distribution(), [(1, 1, 3)])
+
+    def test_rebuild(self):
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_GRADE_DISTRIBUTION_AGGREGATES': False}):
+            self._module()
+            self._module(grade=1, max_grade=1)
+        self.assertEqual(self._distribution(), [])
+
+        call_command('rebuild_grade_distributions', self.course_id.to_deprecated_string())
+        self.assertEqual(self._distribution(), [(None, None, 1), (1, 1, 1)])
+
+        # Rebuilding again doesn't count anything twice
+        StudentModuleGradeCount.rebuild(self.course_id)
+        self.assertEqual(self._distribution(), [(None, None, 1), (1, 1, 1)])
+
+    def test_grade_histogram(self):
+        self._module(grade=1, max_grade=1)
+        self._module(grade=0, max_grade=1)
+        self._module(grade=1, max_grade=1)
+        self.assertEqual(grade_histogram(self.problem), [(0, 1), (1, 2)])
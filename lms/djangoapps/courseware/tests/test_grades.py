@@ -2,18 +2,24 @@
 Test grade calculation.
 """
 from django.http import Http404
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from mock import patch
+from request_cache.middleware import RequestCache
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
-from courseware.grades import grade, iterate_grades_for
+from courseware.grades import grade, iterate_grades_for, CourseGradingContext
+from courseware.models import PersistentCourseGrade, PersistentSubsectionGrade
+from courseware.tests.factories import StudentModuleFactory
+from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MOCK_MODULESTORE
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
-def _grade_with_errors(student, request, course, keep_raw_scores=False):
+def _grade_with_errors(student, request, course, keep_raw_scores=False, field_data_cache=None):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -24,7 +30,7 @@ def _grade_with_errors(student, request, course, keep_raw_scores=False):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grade(student, request, course, keep_raw_scores=keep_raw_scores)
+    return grade(student, request, course, keep_raw_scores=keep_raw_scores, field_data_cache=field_data_cache)
 
 
 @override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
@@ -105,6 +111,13 @@ class TestGradeIteration(ModuleStoreTestCase):
         self.assertTrue(all_gradesets[student2])
         self.assertTrue(all_gradesets[student5])
 
+    def test_students_are_loaded_in_chunks(self):
+        """Grading data should be loaded once for each chunk of students"""
+        with patch('courseware.grades.FieldDataCache.cache_for_users', return_value={}) as mock_cache_for_users:
+            gradeset_results = list(iterate_grades_for(self.course.id, self.students, chunk_size=2))
+        self.assertEqual(len(gradeset_results), 5)
+        self.assertEqual(mock_cache_for_users.call_count, 3)
+
     ################################# Helpers #################################
     def _gradesets_and_errors_for(self, course_id, students):
         """Simple helper method to iterate through student grades and give us
@@ -120,3 +133,166 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+@override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_PERSISTENT_GRADES': True})
+class TestPersistentGrades(ModuleStoreTestCase):
+    """
+    Test that grades are persisted and only recomputed when needed.
+    """
+    def setUp(self):
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+        section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            metadata={'graded': True, 'format': 'Homework'},
+        )
+        self.problem = ItemFactory.create(parent_location=section.location, category='problem')
+        self.course = self.store.get_course(self.course.id)
+
+        self.student = UserFactory.create()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.student
+        self.request.session = {}
+        self.student_module = StudentModuleFactory.create(
+            student=self.student,
+            course_id=self.course.id,
+            module_state_key=self.problem.location,
+            grade=1,
+            max_grade=2,
+        )
+
+    def _grade(self):
+        """Grade the student in the course"""
+        return grade(self.student, self.request, self.course)
+
+    def _homework_score(self):
+        """Grade the student and return their earned score on the homework"""
+        return self._grade()['totaled_scores']['Homework'][0].earned
+
+    def test_grades_are_persisted(self):
+        self._grade()
+        self.assertEqual(PersistentSubsectionGrade.objects.filter(user=self.student).count(), 1)
+        self.assertEqual(PersistentCourseGrade.objects.filter(user=self.student).count(), 1)
+
+    def test_persisted_grade_is_used(self):
+        gradeset = self._grade()
+        with patch('courseware.grades.get_score') as mock_get_score:
+            self.assertEqual(self._grade(), gradeset)
+            self.assertFalse(mock_get_score.called)
+
+    def test_persisted_raw_scores(self):
+        gradeset = grade(self.student, self.request, self.course, keep_raw_scores=True)
+        with patch('courseware.grades.get_score') as mock_get_score:
+            persisted_gradeset = grade(self.student, self.request, self.course, keep_raw_scores=True)
+            self.assertFalse(mock_get_score.called)
+        self.assertEqual(persisted_gradeset['raw_scores'], gradeset['raw_scores'])
+
+    def test_new_score_is_regraded(self):
+        self.assertEqual(self._homework_score(), 1)
+        self.student_module.grade = 2
+        self.student_module.save()
+        self.assertEqual(self._homework_score(), 2)
+
+    def test_deleted_module_clears_grades(self):
+        self._grade()
+        self.student_module.delete()
+        self._assert_grades_cleared()
+        self.assertEqual(self._homework_score(), 0)
+
+    def _assert_grades_cleared(self):
+        """Assert that none of the student's grades are persisted any more"""
+        self.assertFalse(PersistentSubsectionGrade.objects.filter(user=self.student).exists())
+        self.assertFalse(PersistentCourseGrade.objects.filter(user=self.student).exists())
+
+    def test_cohort_move_clears_grades(self):
+        cohort = CohortFactory.create(course_id=self.course.id)
+        other_cohort = CohortFactory.create(course_id=self.course.id, users=[self.student])
+        self._grade()
+        other_cohort.users.remove(self.student)
+        self._assert_grades_cleared()
+
+        self._grade()
+        cohort.users.add(self.student)
+        self._assert_grades_cleared()
+
+        self._grade()
+        self.student.course_groups.clear()
+        self._assert_grades_cleared()
+
+    def test_cohort_move_in_other_course_keeps_grades(self):
+        CohortFactory.create(course_id=SlashSeparatedCourseKey('org', 'other', 'run'), users=[self.student])
+        self._grade()
+        self.student.course_groups.clear()
+        self.assertTrue(PersistentCourseGrade.objects.filter(user=self.student).exists())
+
+    def test_cohort_group_link_clears_grades(self):
+        cohort = CohortFactory.create(course_id=self.course.id, users=[self.student])
+        self._grade()
+        link = CourseUserGroupPartitionGroup.objects.create(course_user_group=cohort, partition_id=0, group_id=1)
+        self._assert_grades_cleared()
+
+        self._grade()
+        link.delete()
+        self._assert_grades_cleared()
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_PERSISTENT_GRADES': False})
+    def test_disabled(self):
+        self._grade()
+        self.assertFalse(PersistentSubsectionGrade.objects.exists())
+        self.assertFalse(PersistentCourseGrade.objects.exists())
+
+
+class TestCourseGradingContext(ModuleStoreTestCase):
+    """
+    Test that the grading context of a course version is only computed once.
+    """
+    def setUp(self):
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+        self.section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            display_name='Homework 1',
+            metadata={'graded': True, 'format': 'Homework'},
+        )
+        self.problem = ItemFactory.create(parent_location=self.section.location, category='problem')
+        self.course = self.store.get_course(self.course.id)
+        RequestCache().clear_request_cache()
+
+    def test_graded_sections(self):
+        context = CourseGradingContext.for_course(self.course)
+        self.assertEqual(context.graded_sections.keys(), ['Homework'])
+        section = context.graded_sections['Homework'][0]
+        self.assertEqual(section.location, self.section.location)
+        self.assertEqual(section.display_name, 'Homework 1')
+        self.assertIn(self.problem.location, section.scored_locations)
+        self.assertFalse(section.always_recalculate)
+        self.assertEqual(context.section_descriptor(section).location, self.section.location)
+
+    def test_section_descriptor_does_not_walk_course(self):
+        CourseGradingContext.for_course(self.course)
+
+        # A course object whose grading context is cached only loads the section asked for
+        course = self.store.get_course(self.course.id)
+        context = CourseGradingContext.for_course(course)
+        section = context.graded_sections['Homework'][0]
+        section_descriptor = context.section_descriptor(section)
+        self.assertEqual(section_descriptor.location, self.section.location)
+        self.assertEqual([child.location for child in section_descriptor.get_children()], [self.problem.location])
+        self.assertNotIn('grading_context', course.__dict__)
+
+    def test_cached_per_version(self):
+        CourseGradingContext.for_course(self.course)
+
+        # Another course object for the same version reuses the grading context
+        with patch.object(CourseGradingContext, '_graded_sections') as mock_graded_sections:
+            CourseGradingContext.for_course(self.store.get_course(self.course.id))
+            self.assertFalse(mock_graded_sections.called)
+
+        # but a new version doesn't
+        ItemFactory.create(parent_location=self.section.location, category='problem')
+        context = CourseGradingContext.for_course(self.store.get_course(self.course.id))
+        self.assertEqual(len(context.graded_sections['Homework'][0].scored_locations), 2)
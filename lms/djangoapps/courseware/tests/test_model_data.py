@@ -339,3 +339,31 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestCacheForUsers(TestCase):
+    """Tests for FieldDataCache.cache_for_users"""
+    def setUp(self):
+        self.users = [UserFactory.create() for _ in range(3)]
+        self.descriptors = [mock_descriptor([mock_field(Scope.user_state, 'a_field')])]
+
+    def test_student_modules_are_assigned_to_their_user(self):
+        student_module = StudentModuleFactory(student=self.users[1])
+        caches = FieldDataCache.cache_for_users(self.descriptors, course_id, self.users)
+
+        self.assertEquals(sorted(caches), sorted(user.id for user in self.users))
+        self.assertEquals(caches[self.users[1].id].find_student_module(location('usage_id')), student_module)
+        self.assertIsNone(caches[self.users[0].id].find_student_module(location('usage_id')))
+        self.assertIsNone(caches[self.users[2].id].find_student_module(location('usage_id')))
+
+    def test_unrelated_student_modules_are_skipped(self):
+        StudentModuleFactory(student=self.users[0], module_state_key=location('other_id'))
+        caches = FieldDataCache.cache_for_users(self.descriptors, course_id, self.users)
+        self.assertEquals(caches[self.users[0].id].cache, {})
+
+    def test_queries_do_not_grow_with_users(self):
+        with self.assertNumQueries(1):
+            FieldDataCache.cache_for_users(self.descriptors, course_id, self.users)
+
+    def test_no_users(self):
+        self.assertEquals(FieldDataCache.cache_for_users(self.descriptors, course_id, []), {})
@@ -1,4 +1,5 @@
 from lms.lib.comment_client import CommentClientRequestError
+from lms.lib.comment_client.utils import enable_request_memo, disable_request_memo
 from django_comment_client.utils import JsonError
 import json
 import logging
@@ -22,3 +23,16 @@ class AjaxExceptionMiddleware(object):
             except ValueError:
                 return JsonError(exception.message, exception.status_code)
         return None
+
+
+class CommentClientRequestMemoMiddleware(object):
+    """
+    Middleware that answers identical GET requests to the comments service
+    made while handling the same request only once
+    """
+    def process_request(self, request):
+        enable_request_memo()
+
+    def process_response(self, request, response):
+        disable_request_memo()
+        return response
@@ -1,8 +1,10 @@
 import django.http
 from django.test import TestCase
 import json
+from mock import patch, Mock
 
 import lms.lib.comment_client
+from lms.lib.comment_client.utils import perform_request
 import django_comment_client.middleware as middleware
 
 
@@ -37,3 +39,53 @@ class AjaxExceptionTestCase(TestCase):
         self.assertIsNone(self.a.process_exception(self.request1, self.exception0))
         self.assertIsNone(self.a.process_exception(self.request0, self.exception1))
         self.assertIsNone(self.a.process_exception(self.request0, self.exception0))
+
+
+@patch('lms.lib.comment_client.utils.requests.Session.request')
+class CommentClientRequestMemoTestCase(TestCase):
+    def setUp(self):
+        self.middleware = middleware.CommentClientRequestMemoMiddleware()
+        self.request = django.http.HttpRequest()
+        self.url = 'http://localhost:4567/api/v1/threads/dummy'
+
+    def _mock_response(self, mock_request, data):
+        mock_request.return_value = Mock(status_code=200, text=json.dumps(data), json=Mock(return_value=data))
+
+    def test_identical_gets_coalesced(self, mock_request):
+        self._mock_response(mock_request, {'id': 'dummy'})
+        self.middleware.process_request(self.request)
+        first = perform_request('get', self.url, {'mark_as_read': True})
+        first['body'] = 'changed by the caller'
+        second = perform_request('get', self.url, {'mark_as_read': True})
+        self.middleware.process_response(self.request, django.http.HttpResponse())
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(second, {'id': 'dummy'})
+
+    def test_different_params_not_coalesced(self, mock_request):
+        self._mock_response(mock_request, {'id': 'dummy'})
+        self.middleware.process_request(self.request)
+        perform_request('get', self.url, {'mark_as_read': True})
+        perform_request('get', self.url, {'mark_as_read': False})
+        self.middleware.process_response(self.request, django.http.HttpResponse())
+
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_writes_clear_memo(self, mock_request):
+        self._mock_response(mock_request, {'id': 'dummy'})
+        self.middleware.process_request(self.request)
+        perform_request('get', self.url)
+        perform_request('put', self.url, {'body': 'new body'})
+        perform_request('get', self.url)
+        self.middleware.process_response(self.request, django.http.HttpResponse())
+
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_memo_scoped_to_request(self, mock_request):
+        self._mock_response(mock_request, {'id': 'dummy'})
+        self.middleware.process_request(self.request)
+        perform_request('get', self.url)
+        self.middleware.process_response(self.request, django.http.HttpResponse())
+        perform_request('get', self.url)
+
+        self.assertEqual(mock_request.call_count, 2)
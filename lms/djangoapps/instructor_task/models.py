@@ -19,6 +19,8 @@ import csv
 import json
 import hashlib
 import os.path
+import shutil
+import tempfile
 import urllib
 
 from boto.s3.connection import S3Connection
@@ -193,9 +195,10 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. `store_rows()` accepts any iterable of rows, including
+    generators, and writes them out incrementally so that reports never have
+    to be held in memory in their entirety. Only complete files are ever made
+    visible to `links_for()`.
     """
     @classmethod
     def from_config(cls):
@@ -218,6 +221,23 @@ class ReportStore(object):
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    def _get_utf8_decoded_rows(self, csv_lines):
+        """
+        Given the lines of a utf-8 encoded CSV file, return the rows they
+        contain, with their strings decoded to unicode.
+        """
+        for row in csv.reader(csv_lines):
+            yield [item.decode('utf-8') for item in row]
+
+    def _get_csv_data(self, rows):
+        """
+        Return the contents of a utf-8 encoded CSV file holding `rows`.
+        """
+        output_buffer = StringIO()
+        csvwriter = csv.writer(output_buffer)
+        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        return output_buffer.getvalue()
+
 
 class S3ReportStore(ReportStore):
     """
@@ -231,6 +251,10 @@ class S3ReportStore(ReportStore):
     conventions on where files are stored to know what to display. Clients using
     this class can name the final file whatever they want.
     """
+    # S3 requires every part of a multipart upload but the last one to be at
+    # least 5MB.
+    MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
     def __init__(self, bucket_name, root_path):
         self.root_path = root_path
 
@@ -308,19 +332,38 @@ class S3ReportStore(ReportStore):
     def store_rows(self, course_id, filename, rows):
         """
         Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        strings), write them out to S3 as a gzip'd csv file.
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
-        """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
 
-        self.store(course_id, filename, output_buffer)
+        `rows` is consumed lazily. Once the compressed data grows past
+        `MULTIPART_PART_SIZE`, it is sent to S3 in parts of a multipart upload,
+        which S3 only makes visible once the upload is completed. Smaller
+        files are sent with a single `store()`.
+        """
+        output = S3MultipartUploadBuffer(
+            self.bucket,
+            self.key_for(course_id, filename).key,
+            self.MULTIPART_PART_SIZE,
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Type": "text/csv",
+            }
+        )
+        try:
+            gzip_file = GzipFile(fileobj=output, mode="wb")
+            csvwriter = csv.writer(gzip_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            gzip_file.close()
+
+            if output.upload is None:
+                self.store(course_id, filename, output.buffer)
+            else:
+                output.complete_upload()
+        except Exception:
+            output.cancel_upload()
+            raise
 
     def links_for(self, course_id):
         """
@@ -333,6 +376,108 @@ class S3ReportStore(ReportStore):
             for key in sorted(self.bucket.list(prefix=course_dir.key), reverse=True, key=lambda k: k.last_modified)
         ]
 
+    def shard_key_for(self, course_id, report_id, shard_name=''):
+        """Return the S3 key we would use to store and retrieve the given
+        shard of a report. Shards live outside of the course directory, so
+        they are never listed by `links_for()`."""
+        hashed_course_id = hashlib.sha1(course_id.to_deprecated_string())
+
+        key = Key(self.bucket)
+        key.key = "{}/shards/{}/{}/{}".format(
+            self.root_path,
+            hashed_course_id.hexdigest(),
+            report_id,
+            shard_name
+        )
+
+        return key
+
+    def store_shard(self, course_id, report_id, shard_name, rows):
+        """
+        Store `rows` as the shard named `shard_name` of the report identified
+        by `report_id`. Shards are partial CSV files that are combined into a
+        report once all of them have been written.
+        """
+        self.shard_key_for(course_id, report_id, shard_name).set_contents_from_string(self._get_csv_data(rows))
+
+    def shards_for(self, course_id, report_id):
+        """
+        Return the sorted names of all the shards stored for `report_id`.
+        """
+        shard_dir = self.shard_key_for(course_id, report_id)
+        return sorted(key.key[len(shard_dir.key):] for key in self.bucket.list(prefix=shard_dir.key))
+
+    def shard_rows(self, course_id, report_id, shard_name):
+        """
+        Return an iterator over the rows of a shard stored by `store_shard()`.
+        """
+        data = self.shard_key_for(course_id, report_id, shard_name).get_contents_as_string()
+        return self._get_utf8_decoded_rows(StringIO(data))
+
+    def delete_shards(self, course_id, report_id):
+        """
+        Delete all the shards stored for `report_id`.
+        """
+        shard_dir = self.shard_key_for(course_id, report_id)
+        self.bucket.delete_keys([key.key for key in self.bucket.list(prefix=shard_dir.key)])
+
+
+class S3MultipartUploadBuffer(object):
+    """
+    Write-only file-like object that sends what is written to it to S3 as the
+    parts of a multipart upload, each at least `part_size` bytes long. The
+    upload is only started once there is a full part to send; until then,
+    everything is kept in `buffer`, and `upload` is None.
+    """
+    def __init__(self, bucket, key_name, part_size, headers=None):
+        self.bucket = bucket
+        self.key_name = key_name
+        self.part_size = part_size
+        self.headers = headers
+        self.buffer = StringIO()
+        self.upload = None
+        self.num_parts = 0
+
+    def write(self, data):
+        """Buffer `data`, sending a part to S3 if the buffer is full."""
+        self.buffer.write(data)
+        if self.buffer.tell() >= self.part_size:
+            self._upload_part()
+
+    def flush(self):
+        """Parts are only sent once they are full, so there's nothing to do."""
+        pass
+
+    def _upload_part(self):
+        """Send the contents of the buffer as the next part of the upload."""
+        if self.upload is None:
+            self.upload = self.bucket.initiate_multipart_upload(self.key_name, headers=self.headers)
+        self.num_parts += 1
+        self.buffer.seek(0)
+        self.upload.upload_part_from_file(self.buffer, self.num_parts)
+        self.buffer = StringIO()
+
+    def complete_upload(self):
+        """Send whatever is left in the buffer, and complete the upload."""
+        if self.buffer.tell() > 0:
+            self._upload_part()
+        self.upload.complete_upload()
+
+    def cancel_upload(self):
+        """Cancel the upload, if it was started, so S3 discards its parts."""
+        if self.upload is not None:
+            self.upload.cancel_upload()
+
+
+def _current_umask():
+    """
+    Return the umask of the process. It can only be read by setting it, so it
+    is set back straight away.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
 
 class LocalFSReportStore(ReportStore):
     """
@@ -390,12 +535,41 @@ class LocalFSReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of strings),
         write this data out.
+
+        `rows` is consumed lazily and written to a temporary file, which is
+        then renamed into place so that only complete files are ever visible.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        self._write_atomically(
+            self.path_to(course_id, filename),
+            lambda f: csv.writer(f).writerows(self._get_utf8_encoded_rows(rows))
+        )
 
-        self.store(course_id, filename, output_buffer)
+    def _write_atomically(self, full_path, write_fcn):
+        """
+        Call `write_fcn` with a temporary file object, then rename the file
+        to `full_path`. The temporary file is created under `root_path`, so
+        the rename never crosses filesystems and is atomic. It is removed if
+        `write_fcn` fails.
+        """
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        tmp_dir = os.path.join(self.root_path, '.tmp')
+        if not os.path.exists(tmp_dir):
+            os.makedirs(tmp_dir)
+
+        tmp_file = tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False)
+        try:
+            with tmp_file:
+                write_fcn(tmp_file)
+            # NamedTemporaryFile is only readable by its owner, so give it the mode
+            # that open() would have given a new file before moving it into place
+            os.chmod(tmp_file.name, 0666 & ~_current_umask())
+            os.rename(tmp_file.name, full_path)
+        except Exception:
+            os.remove(tmp_file.name)
+            raise
 
     def links_for(self, course_id):
         """
@@ -415,3 +589,48 @@ class LocalFSReportStore(ReportStore):
             (filename, ("file://" + urllib.quote(full_path)))
             for filename, full_path in files
         ]
+
+    def shard_path_to(self, course_id, report_id, shard_name=''):
+        """Return the full path to the given shard of a report. Shards live
+        outside of the course directory, so they are never listed by
+        `links_for()`."""
+        return os.path.join(
+            self.root_path,
+            '.shards',
+            urllib.quote(course_id.to_deprecated_string(), safe=''),
+            report_id,
+            shard_name
+        )
+
+    def store_shard(self, course_id, report_id, shard_name, rows):
+        """
+        Store `rows` as the shard named `shard_name` of the report identified
+        by `report_id`.
+        """
+        self._write_atomically(
+            self.shard_path_to(course_id, report_id, shard_name),
+            lambda f: csv.writer(f).writerows(self._get_utf8_encoded_rows(rows))
+        )
+
+    def shards_for(self, course_id, report_id):
+        """
+        Return the sorted names of all the shards stored for `report_id`.
+        """
+        shard_dir = self.shard_path_to(course_id, report_id)
+        if not os.path.exists(shard_dir):
+            return []
+        return sorted(os.listdir(shard_dir))
+
+    def shard_rows(self, course_id, report_id, shard_name):
+        """
+        Return an iterator over the rows of a shard stored by `store_shard()`.
+        """
+        with open(self.shard_path_to(course_id, report_id, shard_name), "rb") as f:
+            data = f.read()
+        return self._get_utf8_decoded_rows(StringIO(data))
+
+    def delete_shards(self, course_id, report_id):
+        """
+        Delete all the shards stored for `report_id`.
+        """
+        shutil.rmtree(self.shard_path_to(course_id, report_id), ignore_errors=True)
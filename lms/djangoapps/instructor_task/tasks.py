@@ -31,6 +31,8 @@ from instructor_task.tasks_helper import (
     reset_attempts_module_state,
     delete_problem_module_state,
     upload_grades_csv,
+    delegate_grades_csv_shards,
+    upload_grades_csv_shard,
     upload_students_csv,
     cohort_students_and_upload
 )
@@ -140,10 +142,23 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('graded')
-    task_fn = partial(upload_grades_csv, xmodule_instance_args)
+    if settings.FEATURES.get('ENABLE_GRADE_REPORT_SUBTASKS'):
+        task_fn = partial(delegate_grades_csv_shards, calculate_grades_csv_shard)
+    else:
+        task_fn = partial(upload_grades_csv, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_shard(entry_id, student_ids, subtask_status_dict):
+    """
+    Grade a chunk of the students of a course, as a subtask of
+    `calculate_grades_csv`. The last subtask to complete merges the results
+    of all of them into the final grades CSV.
+    """
+    return upload_grades_csv_shard(entry_id, student_ids, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
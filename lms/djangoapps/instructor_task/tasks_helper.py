@@ -5,13 +5,16 @@ running state of a course.
 """
 import json
 from datetime import datetime
+from itertools import islice
 from time import time
 import unicodecsv
 
 from celery import Task, current_task
 from celery.utils.log import get_task_logger
 from celery.states import SUCCESS, FAILURE
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.files.storage import DefaultStorage
 from django.db import transaction, reset_queries
 import dogstats_wrapper as dog_stats_api
@@ -22,15 +25,21 @@ from util.file import course_filename_prefix_generator, UniversalNewlineIterator
 from xmodule.modulestore.django import modulestore
 
 from courseware.courses import get_course_by_id
-from courseware.grades import iterate_grades_for
+from courseware.grades import iterate_grades_for, GRADING_CHUNK_SIZE
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
 from instructor_analytics.basic import enrolled_students_features
 from instructor_analytics.csvs import format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    queue_subtasks_for_query,
+    check_subtask_is_valid,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from openedx.core.djangoapps.course_groups.cohorts import get_cohorts_for_users
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
 from student.models import CourseEnrollment
@@ -47,6 +56,10 @@ UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
 
+# Lock expiration for merging grade report shards, which should be long enough
+# for the merge to complete.
+GRADE_REPORT_MERGE_LOCK_EXPIRE = 60 * 30
+
 
 class BaseInstructorTask(Task):
     """
@@ -511,7 +524,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
 
     Arguments:
         rows: CSV data in the following format (first column may be a
-            header):
+            header). This may be any iterable of rows, e.g. a generator;
+            rows are written out as they are produced:
             [
                 [row1_colum1, row1_colum2, ...],
                 ...
@@ -531,26 +545,17 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
     )
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+def _grade_report_rows(course, students, task_progress, err_rows):
     """
-    For a given `course_id`, generate a grades CSV file for all students that
-    are enrolled, and store using a `ReportStore`. Once created, the files can
-    be accessed by instantiating another `ReportStore` (via
-    `ReportStore.from_config()`) and calling `link_for()` on it. Writes are
-    buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
-    that are visible in ReportStore will be complete ones.
+    Grade `students` in `course`, yielding the rows of the grade report as
+    they are computed, starting with a header row (unless no student could be
+    graded). Students that fail to be graded are appended to the `err_rows`
+    list instead, which starts with a header row of its own if any is added.
 
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+    `task_progress` is updated as each student is graded.
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
+    course_id = course.id
     status_interval = 100
-    enrolled_students = CourseEnrollment.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
-
-    course = get_course_by_id(course_id)
     cohorts_header = ['Cohort Name'] if course.is_cohorted else []
 
     partition_service = LmsPartitionService(user=None, course_id=course_id)
@@ -559,10 +564,8 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
     # Loop over all our students and build our CSV lists in memory
     header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
     current_step = {'step': 'Calculating Grades'}
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
+    for student, gradeset, err_msg, cohort, partition_groups in _iterate_grades_with_groups(course, students, partitions):
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -573,9 +576,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             task_progress.succeeded += 1
             if not header:
                 header = [section['label'] for section in gradeset[u'section_breakdown']]
-                rows.append(
-                    ["id", "email", "username", "grade"] + header + cohorts_header + group_configs_header
-                )
+                yield ["id", "email", "username", "grade"] + header + cohorts_header + group_configs_header
 
             percents = {
                 section['label']: section.get('percent', 0.0)
@@ -585,13 +586,9 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
             cohorts_group_name = []
             if course.is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
-                cohorts_group_name.append(group.name if group else '')
+                cohorts_group_name.append(cohort.name if cohort else '')
 
-            group_configs_group_names = []
-            for partition in partitions:
-                group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
-                group_configs_group_names.append(group.name if group else '')
+            group_configs_group_names = [group.name if group else '' for group in partition_groups]
 
             # Not everybody has the same gradable items. If the item is not
             # found in the user's gradeset, just assume it's a 0. The aggregated
@@ -600,30 +597,282 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             # possible for a student to have a 0.0 show up in their row but
             # still have 100% for the course.
             row_percents = [percents.get(label, 0.0) for label in header]
-            rows.append(
+            yield (
                 [student.id, student.email, student.username, gradeset['percent']] +
                 row_percents + cohorts_group_name + group_configs_group_names
             )
         else:
             # An empty gradeset means we failed to grade a student.
             task_progress.failed += 1
+            if not err_rows:
+                err_rows.append(["id", "username", "error_msg"])
             err_rows.append([student.id, student.username, err_msg])
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the actual upload
+def _iterate_grades_with_groups(course, students, partitions):
+    """
+    Grade `students` like `iterate_grades_for()`, and look up their cohort and
+    their group in each of the `partitions`, without assigning them to any.
+
+    Yields a tuple of (student, gradeset, err_msg, cohort, partition_groups)
+    for every student, where `partition_groups` lists the student's group (or
+    None) in each partition. Cohorts and groups are looked up for a chunk of
+    students at a time.
+    """
+    students = iter(students)
+    student_chunk = list(islice(students, GRADING_CHUNK_SIZE))
+    while student_chunk:
+        user_ids = [student.id for student in student_chunk]
+        cohorts = get_cohorts_for_users(user_ids, course.id) if course.is_cohorted else {}
+
+        groups_by_partition = []
+        for partition in partitions:
+            if hasattr(partition.scheme, 'get_groups_for_users'):
+                groups_by_partition.append(partition.scheme.get_groups_for_users(course.id, user_ids, partition))
+            else:
+                # The scheme can only tell the groups of users one at a time
+                groups_by_partition.append({
+                    student.id: LmsPartitionService(student, course.id).get_group(partition, assign=False)
+                    for student in student_chunk
+                })
+
+        for student, gradeset, err_msg in iterate_grades_for(course.id, student_chunk):
+            partition_groups = [groups.get(student.id) for groups in groups_by_partition]
+            yield student, gradeset, err_msg, cohorts.get(student.id), partition_groups
+
+        student_chunk = list(islice(students, GRADING_CHUNK_SIZE))
+
+
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    For a given `course_id`, generate a grades CSV file for all students that
+    are enrolled, and store using a `ReportStore`. Once created, the files can
+    be accessed by instantiating another `ReportStore` (via
+    `ReportStore.from_config()`) and calling `link_for()` on it. Rows are
+    written out as students are graded, but ReportStore never makes part of a
+    CSV file visible -- i.e. any files that are visible in ReportStore will be
+    complete ones.
+
+    As we start to add more CSV downloads, it will probably be worthwhile to
+    make a more general CSVDoc class instead of building out the rows like we
+    do here.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    enrolled_students = CourseEnrollment.users_enrolled_in(course_id)
+    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+
+    course = get_course_by_id(course_id)
+    err_rows = []
+    rows = _grade_report_rows(course, enrolled_students.iterator(), task_progress, err_rows)
+
+    # Students are graded as their rows are uploaded.
     upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
 
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+
+    # If there are any error rows, write them out as well
+    if err_rows:
         upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
 
     # One last update before we close out...
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _grade_report_shard_id(task_id, csv_name):
+    """
+    Return the id under which the shards of the `csv_name` report generated
+    by the InstructorTask with the given `task_id` are stored.
+    """
+    return u"{task_id}-{csv_name}".format(task_id=task_id, csv_name=csv_name)
+
+
+def delegate_grades_csv_shards(shard_task, entry_id, course_id, task_input, action_name):
+    """
+    Split the generation of a grades CSV file into subtasks that each grade
+    no more than settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK enrolled students,
+    and queue them up. `shard_task` is the celery task that grades a chunk of
+    students; see `upload_grades_csv_shard()`.
+
+    Each subtask stores its rows as a shard in the `ReportStore`. The last
+    subtask to finish merges the shards into the final report.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_id = entry.task_id
+
+    # As in bulk email, a task that has been requeued after its subtasks
+    # were defined should not queue a second set of them.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u"Task %s has already been processed for grade report!  InstructorTask = %s", task_id, entry)
+        return json.loads(entry.task_output)
+
+    enrolled_students = CourseEnrollment.users_enrolled_in(course_id).order_by('id')
+    if not enrolled_students.exists():
+        # There's nothing to split up, but we still want an (empty) report.
+        return upload_grades_csv(None, entry_id, course_id, task_input, action_name)
+
+    def _create_grades_csv_subtask(student_list, initial_subtask_status):
+        """Creates a subtask to grade a given list of students."""
+        return shard_task.subtask(
+            (
+                entry_id,
+                [student['pk'] for student in student_list],
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    TASK_LOG.info(u"Task %s: Preparing to queue subtasks for grading course %s", task_id, course_id)
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_grades_csv_subtask,
+        enrolled_students,
+        [],
+        settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK,
+    )
+
+
+def upload_grades_csv_shard(entry_id, student_ids, subtask_status_dict):
+    """
+    Grade the students with the given `student_ids`, and store the resulting
+    rows as shards of the grade report (and error report) of the InstructorTask
+    identified by `entry_id`. Shards are named after the first id in
+    `student_ids`, so that they sort in the same order as students are
+    enrolled in a single-task grade report.
+
+    Once every subtask of the InstructorTask is done, the shards are merged
+    into the final reports by `merge_grades_csv_shards()`.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    num_students = len(student_ids)
+
+    # Reject subtasks that have been requeued or duplicated; this raises if
+    # the subtask shouldn't be run.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        entry = InstructorTask.objects.get(pk=entry_id)
+        course_id = entry.course_id
+        course = get_course_by_id(course_id)
+        students = User.objects.filter(pk__in=student_ids).order_by('id')
+
+        action_name = json.loads(entry.task_output)['action_name']
+        task_progress = TaskProgress(action_name, num_students, time())
+        err_rows = []
+        rows = list(_grade_report_rows(course, students, task_progress, err_rows))
+
+        report_store = ReportStore.from_config()
+        shard_name = u"{:012d}.csv".format(min(student_ids))
+        if rows:
+            report_store.store_shard(course_id, _grade_report_shard_id(entry.task_id, 'grade_report'), shard_name, rows)
+        if err_rows:
+            report_store.store_shard(
+                course_id, _grade_report_shard_id(entry.task_id, 'grade_report_err'), shard_name, err_rows
+            )
+    except Exception as exc:
+        # Unexpected exception. Try to write out the failure to the entry before failing.
+        TASK_LOG.exception(u"Grade report subtask %s for instructor task %d: failed unexpectedly!", current_task_id, entry_id)
+        # Since we don't know how far we got, count all students as having failed,
+        # and list them all in the error report rather than leaving them out of the reports.
+        _store_failed_grades_csv_shard(entry_id, student_ids, exc)
+        subtask_status.increment(failed=num_students, state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        _merge_grades_csv_shards_if_complete(entry_id)
+        raise
+
+    subtask_status.increment(succeeded=task_progress.succeeded, failed=task_progress.failed, state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    _merge_grades_csv_shards_if_complete(entry_id)
+
+    return subtask_status.to_dict()
+
+
+def _store_failed_grades_csv_shard(entry_id, student_ids, exc):
+    """
+    Store a shard of the error report of the InstructorTask identified by
+    `entry_id` which lists all of the students with the given `student_ids`,
+    whose subtask failed with the exception `exc`.
+    """
+    try:
+        entry = InstructorTask.objects.get(pk=entry_id)
+        err_msg = u"Grade report subtask failed: {}".format(exc)
+        students = User.objects.filter(pk__in=student_ids).order_by('id').values_list('id', 'username')
+        err_rows = [["id", "username", "error_msg"]]
+        err_rows.extend([student_id, username, err_msg] for student_id, username in students)
+        ReportStore.from_config().store_shard(
+            entry.course_id,
+            _grade_report_shard_id(entry.task_id, 'grade_report_err'),
+            u"{:012d}.csv".format(min(student_ids)),
+            err_rows
+        )
+    except Exception:  # pylint: disable=broad-except
+        TASK_LOG.exception(
+            u"Grade report for instructor task %d: could not list the students of a failed subtask", entry_id
+        )
+
+
+def _merge_grades_csv_shards_if_complete(entry_id):
+    """
+    Merge the grade report shards if all the subtasks of the InstructorTask
+    identified by `entry_id` are done. The subtask that brings the
+    InstructorTask to completion is the one that does the merge.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    if entry.task_state == SUCCESS:
+        merge_grades_csv_shards(entry)
+
+
+def _merged_shard_rows(report_store, course_id, report_id):
+    """
+    Yield the rows of all the shards stored for `report_id`, in order.
+    Only the first shard's header row is kept.
+    """
+    header_seen = False
+    for shard_name in report_store.shards_for(course_id, report_id):
+        shard_rows = report_store.shard_rows(course_id, report_id, shard_name)
+        header = next(shard_rows, None)
+        if header is not None and not header_seen:
+            header_seen = True
+            yield header
+        for row in shard_rows:
+            yield row
+
+
+def merge_grades_csv_shards(entry):
+    """
+    Merge the shards stored by the subtasks of the grade report InstructorTask
+    `entry` into the final grade report (and error report, if any student
+    could not be graded), then delete the shards.
+
+    A cache lock makes sure that the merge is done only once, should two
+    subtasks see the InstructorTask complete.
+    """
+    lock_key = "grade-report-merge-{}".format(entry.task_id)
+    if not cache.add(lock_key, 'true', GRADE_REPORT_MERGE_LOCK_EXPIRE):
+        TASK_LOG.warning(u"Grade report shards of task %s are already being merged", entry.task_id)
+        return
+
+    course_id = entry.course_id
+    timestamp = entry.created or datetime.now(UTC)
+    report_store = ReportStore.from_config()
+    for csv_name in ('grade_report', 'grade_report_err'):
+        report_id = _grade_report_shard_id(entry.task_id, csv_name)
+        # The error report is only written out if some student failed to be
+        # graded, but there is always a grade report.
+        if csv_name == 'grade_report' or report_store.shards_for(course_id, report_id):
+            upload_csv_to_report_store(
+                _merged_shard_rows(report_store, course_id, report_id), csv_name, course_id, timestamp
+            )
+        report_store.delete_shards(course_id, report_id)
+
+    TASK_LOG.info(u"Merged grade report shards of task %s for course %s", entry.task_id, course_id)
+
+
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing profile
@@ -6,9 +6,10 @@ from cStringIO import StringIO
 import mock
 import time
 from datetime import datetime
+import os
 from unittest import TestCase
 
-from instructor_task.models import LocalFSReportStore, S3ReportStore
+from instructor_task.models import LocalFSReportStore, S3MultipartUploadBuffer, S3ReportStore
 from instructor_task.tests.test_base import TestReportMixin
 from opaque_keys.edx.locator import CourseLocator
 
@@ -84,6 +85,14 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_store_rows_from_generator(self):
+        """
+        Test that ReportStore.store_rows() accepts rows from a generator.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([i] for i in range(3)))
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     """
@@ -93,6 +102,54 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config()
 
+    def test_shards(self):
+        """
+        Test that shards are listed in order, read back as unicode, kept out
+        of the download links, and deleted together.
+        """
+        report_store = self.create_report_store()
+        report_store.store_shard(self.course_id, 'report', '002.csv', [[u'id', u'name'], [2, u'ni\xf1o']])
+        report_store.store_shard(self.course_id, 'report', '001.csv', [[u'id', u'name'], [1, u'student']])
+
+        self.assertEqual(report_store.shards_for(self.course_id, 'report'), ['001.csv', '002.csv'])
+        self.assertEqual(
+            list(report_store.shard_rows(self.course_id, 'report', '002.csv')),
+            [[u'id', u'name'], [u'2', u'ni\xf1o']]
+        )
+        self.assertEqual(report_store.links_for(self.course_id), [])
+
+        report_store.delete_shards(self.course_id, 'report')
+        self.assertEqual(report_store.shards_for(self.course_id, 'report'), [])
+
+    def test_store_rows_failure(self):
+        """
+        Test that no partial file is left behind if the rows can't all be
+        generated.
+        """
+        def rows():
+            """Yield a header row, then fail."""
+            yield [u'id']
+            raise ValueError()
+
+        report_store = self.create_report_store()
+        with self.assertRaises(ValueError):
+            report_store.store_rows(self.course_id, 'report.csv', rows())
+        self.assertEqual(report_store.links_for(self.course_id), [])
+
+    def test_stored_file_mode(self):
+        """
+        Test that stored reports get the mode of newly created files rather
+        than that of the temporary file they were written to.
+        """
+        report_store = self.create_report_store()
+        old_umask = os.umask(0022)
+        try:
+            report_store.store_rows(self.course_id, 'report.csv', [[u'id']])
+        finally:
+            os.umask(old_umask)
+        mode = os.stat(report_store.path_to(self.course_id, 'report.csv')).st_mode
+        self.assertEqual(mode & 0777, 0644)
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
@@ -105,3 +162,32 @@ class S3ReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     def create_report_store(self):
         """ Create and return a S3ReportStore. """
         return S3ReportStore.from_config()
+
+
+class S3MultipartUploadBufferTestCase(TestCase):
+    """
+    Test the S3MultipartUploadBuffer used to stream reports to S3.
+    """
+    def setUp(self):
+        self.bucket = mock.Mock()
+        self.upload = self.bucket.initiate_multipart_upload.return_value
+        self.buffer = S3MultipartUploadBuffer(self.bucket, 'key', 4)
+
+    def test_parts(self):
+        self.buffer.write('ab')
+        self.assertFalse(self.bucket.initiate_multipart_upload.called)
+        self.buffer.write('cde')
+        self.buffer.write('f')
+        self.buffer.complete_upload()
+
+        self.assertEqual(
+            [(args[0].getvalue(), args[1]) for args, _kwargs in self.upload.upload_part_from_file.call_args_list],
+            [('abcde', 1), ('f', 2)]
+        )
+        self.assertTrue(self.upload.complete_upload.called)
+
+    def test_cancel(self):
+        self.buffer.write('abcde')
+        self.buffer.cancel_upload()
+        self.assertTrue(self.upload.cancel_upload.called)
+        self.assertFalse(self.upload.complete_upload.called)
@@ -7,8 +7,11 @@ Tests that CSV grade report generation works with unicode emails.
 
 """
 import ddt
+from celery.states import SUCCESS
+from django.test.utils import override_settings
 from mock import Mock, patch
 import tempfile
+from uuid import uuid4
 import unicodecsv
 
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -17,8 +20,15 @@ from student.models import CourseEnrollment
 from xmodule.partitions.partitions import Group, UserPartition
 
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
-from instructor_task.models import ReportStore
-from instructor_task.tasks_helper import cohort_students_and_upload, upload_grades_csv, upload_students_csv
+from instructor_task.models import InstructorTask, ReportStore
+from instructor_task.tasks_helper import (
+    cohort_students_and_upload,
+    delegate_grades_csv_shards,
+    upload_grades_csv,
+    upload_grades_csv_shard,
+    upload_students_csv,
+)
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase, TestReportMixin
 
 
@@ -157,6 +167,80 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
 
 
+@patch('instructor_task.tasks_helper._get_current_task')
+@override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+class TestGradeReportShards(TestReportMixin, InstructorTaskCourseTestCase):
+    """
+    Tests that grade reports generated by subtasks are merged correctly.
+    """
+    def setUp(self):
+        self.course = CourseFactory.create()
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='grade_course',
+        )
+
+    def _run_grade_report(self):
+        """
+        Run the grade report task, executing each of its subtasks
+        synchronously as soon as it is queued.
+        """
+        def _create_subtask(args, **kwargs):  # pylint: disable=unused-argument
+            """Return a subtask that grades its students when applied."""
+            return Mock(apply_async=lambda: upload_grades_csv_shard(*args))
+
+        shard_task = Mock()
+        shard_task.subtask.side_effect = _create_subtask
+        delegate_grades_csv_shards(shard_task, self.entry.id, self.course.id, {}, 'graded')
+        return shard_task
+
+    def test_shards_are_merged(self, _mock_current_task):
+        students = [self.create_student(u'student{}'.format(i)) for i in range(5)]
+        shard_task = self._run_grade_report()
+        self.assertEqual(shard_task.subtask.call_count, 3)
+
+        report_store = ReportStore.from_config()
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        with open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            usernames = [row['username'] for row in unicodecsv.DictReader(csv_file)]
+        self.assertEqual(usernames, [student.username for student in students])
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertFalse(report_store.shards_for(self.course.id, u'{}-grade_report'.format(entry.task_id)))
+
+    @patch('instructor_task.tasks_helper.iterate_grades_for')
+    def test_grading_failure(self, mock_iterate_grades_for, _mock_current_task):
+        student = self.create_student('username', 'student@example.com')
+        mock_iterate_grades_for.return_value = [(student, {}, 'Cannot grade student')]
+        self._run_grade_report()
+
+        report_store = ReportStore.from_config()
+        self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
+
+    @patch('instructor_task.tasks_helper._grade_report_rows')
+    def test_shard_failure(self, mock_grade_report_rows, _mock_current_task):
+        students = [self.create_student(u'student{}'.format(i)) for i in range(2)]
+        mock_grade_report_rows.side_effect = Exception('Cannot grade shard')
+        with self.assertRaises(Exception):
+            self._run_grade_report()
+
+        # the students of the failed shard are listed in the error report
+        report_store = ReportStore.from_config()
+        report_id = u'{}-grade_report_err'.format(self.entry.task_id)
+        shard_names = report_store.shards_for(self.course.id, report_id)
+        self.assertEqual(len(shard_names), 1)
+        rows = list(report_store.shard_rows(self.course.id, report_id, shard_names[0]))
+        self.assertEqual(rows[0], ["id", "username", "error_msg"])
+        self.assertEqual(
+            [(row[0], row[1]) for row in rows[1:]],
+            [(unicode(student.id), student.username) for student in students]
+        )
+
+
 @ddt.ddt
 class TestStudentReport(TestReportMixin, InstructorTaskCourseTestCase):
     """
@@ -3,26 +3,15 @@ Namespace that defines fields common to all blocks used in the LMS
 """
 from lazy import lazy
 
-from xblock.fields import Boolean, Scope, String, XBlockMixin, Dict
+from xblock.fields import Boolean, Scope, String, XBlockMixin
 from xblock.validation import ValidationMessage
-from xmodule.modulestore.inheritance import UserPartitionList
+from xmodule.modulestore.inheritance import GroupAccessDict, UserPartitionList
 from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPartitionGroupError
 
 # Make '_' a no-op so we can scrape strings
 _ = lambda text: text
 
 
-class GroupAccessDict(Dict):
-    """Special Dict class for serializing the group_access field"""
-    def from_json(self, access_dict):
-        if access_dict is not None:
-            return {int(k): access_dict[k] for k in access_dict}
-
-    def to_json(self, access_dict):
-        if access_dict is not None:
-            return {unicode(k): access_dict[k] for k in access_dict}
-
-
 class LmsBlockMixin(XBlockMixin):
     """
     Mixin that defines fields common to all blocks used in the LMS
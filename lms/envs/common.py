@@ -323,6 +323,19 @@ FEATURES = {
 
     # For easily adding modes to courses during acceptance testing
     'MODE_CREATION_FOR_TESTING': False,
+
+    # Persist computed subsection and course grades, and only recompute the
+    # ones affected by new submissions or a new version of the course
+    'ENABLE_PERSISTENT_GRADES': False,
+
+    # Split grade report generation into subtasks that each grade a chunk of
+    # the enrolled students, and merge their output into a single report
+    'ENABLE_GRADE_REPORT_SUBTASKS': False,
+
+    # Keep counts of the grades of each module up to date as students are
+    # graded, and read grade distributions from them. Run the
+    # rebuild_grade_distributions management command after enabling this.
+    'ENABLE_GRADE_DISTRIBUTION_AGGREGATES': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -608,6 +621,16 @@ DOC_STORE_CONFIG = {
     # as the collection name for asset metadata.
     # Otherwise, a default collection name will be used.
 }
+
+# Serve course assets from a local disk cache through the web server, rather than
+# streaming them through Django: 'nginx' sets X-Accel-Redirect to
+# STATIC_CONTENT_SENDFILE_URL (an `internal` location that serves
+# STATIC_CONTENT_SENDFILE_ROOT), 'apache' sets X-Sendfile (mod_xsendfile).
+# None streams assets through Django.
+STATIC_CONTENT_SENDFILE_BACKEND = None
+STATIC_CONTENT_SENDFILE_ROOT = ENV_ROOT / "static_content_cache"
+STATIC_CONTENT_SENDFILE_URL = '/static_content_cache/'
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -640,6 +663,9 @@ MODULESTORE = {
                         'default_class': 'xmodule.hidden_module.HiddenDescriptor',
                         'fs_root': DATA_DIR,
                         'render_template': 'edxmako.shortcuts.render_to_string',
+                        # Upper bound, in bytes, of the process-wide cache of course structures.
+                        # Define a 'course_structure_cache' in CACHES to share them between processes.
+                        'structure_cache_size': 256 * 1024 * 1024,
                     }
                 },
             ]
@@ -672,6 +698,15 @@ CODE_JAIL = {
 #   ]
 COURSES_WITH_UNSAFE_CODE = []
 
+# How many problems to keep the parsed XML and script context of in each
+# process, so that building them again doesn't re-run their scripts. 0
+# disables it.
+CAPA_PARSED_PROBLEM_CACHE_SIZE = 1000
+
+# How many bytes of (compressed) results of problem code to keep in each
+# process, in front of the ones kept in the default cache. 0 disables it.
+SAFE_EXEC_LOCAL_CACHE_SIZE = 16 * 1024 * 1024
+
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG/TEMPLATE_DEBUG in your environment settings files, not here
 DEBUG = False
@@ -717,6 +752,10 @@ if not EDX_PLATFORM_REVISION:
 STATIC_URL = '/static/'
 STATIC_ROOT = ENV_ROOT / "staticfiles"
 
+# The total length of the blocks' contents that have had their /static/ urls rewritten
+# to keep, per process. 0 disables remembering static file and modulestore lookups too.
+STATIC_URL_REWRITE_CACHE_SIZE = 10 * 1024 * 1024
+
 STATICFILES_DIRS = [
     COMMON_ROOT / "static",
     PROJECT_ROOT / "static",
@@ -962,6 +1001,7 @@ MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
     'microsite_configuration.middleware.MicrositeMiddleware',
     'django_comment_client.middleware.AjaxExceptionMiddleware',
+    'django_comment_client.middleware.CommentClientRequestMemoMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
 
@@ -1445,6 +1485,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of SMTP connections that each bulk email task sends over concurrently.
+# When a task is retried for rate-related reasons, the connections together
+# still wait BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS between messages.
+BULK_EMAIL_SMTP_CONNECTIONS = 1
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -1636,6 +1681,12 @@ MOBILE_STORE_URLS = {
     'google': '#'
 }
 
+############### Enrollments and course access roles ###############
+# How many seconds to keep snapshots of each user's enrollments and course
+# access roles in the cache, between requests. They are forgotten whenever
+# the user's enrollments or roles change. 0 disables it.
+ENROLLMENT_AND_ROLE_CACHE_TIMEOUT = 300
+
 ################# Student Verification #################
 VERIFY_STUDENT = {
     "DAYS_GOOD_FOR": 365,  # How many days is a verficiation good for?
@@ -1684,6 +1735,10 @@ CERT_NAME_LONG = "Certificate of Achievement"
 ###################### Grade Downloads ######################
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Number of students graded by each subtask when the
+# ENABLE_GRADE_REPORT_SUBTASKS feature is enabled.
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = 1000
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
@@ -134,6 +134,17 @@ STATICFILES_DIRS += [
 STATICFILES_STORAGE = 'pipeline.storage.NonPackagingPipelineStorage'
 PIPELINE_ENABLED = False
 
+# Tests mock out staticfiles_storage and the modulestore, so don't remember their lookups
+STATIC_URL_REWRITE_CACHE_SIZE = 0
+
+# Tests mock out script execution, so don't share the parsed problems
+CAPA_PARSED_PROBLEM_CACHE_SIZE = 0
+SAFE_EXEC_LOCAL_CACHE_SIZE = 0
+
+# Tests change enrollments and roles in ways that don't send signals (e.g. by
+# rolling back transactions), so don't keep them between requests
+ENROLLMENT_AND_ROLE_CACHE_TIMEOUT = 0
+
 update_module_store_settings(
     MODULESTORE,
     module_store_options={
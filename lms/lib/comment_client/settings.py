@@ -6,3 +6,8 @@ else:
     SERVICE_HOST = 'http://localhost:4567'
 
 PREFIX = SERVICE_HOST + '/api/v1'
+
+# Connections to the comments service kept open per LMS process, and how many
+# times to retry a request that fails to connect.
+POOL_SIZE = getattr(settings, "COMMENTS_SERVICE_POOL_SIZE", 10)
+MAX_RETRIES = getattr(settings, "COMMENTS_SERVICE_MAX_RETRIES", 0)
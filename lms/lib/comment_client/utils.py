@@ -1,14 +1,28 @@
 from contextlib import contextmanager
+from copy import deepcopy
 import dogstats_wrapper as dog_stats_api
 import logging
+import os
 import requests
+import threading
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 from time import time
 from uuid import uuid4
 from django.utils.translation import get_language
 
+import settings as cc_settings
+
 log = logging.getLogger(__name__)
 
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# Responses to GET requests made while handling the current LMS request, if
+# enabled by enable_request_memo. Thread local, as is the LMS request.
+_request_memo = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -50,6 +64,55 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+def get_session():
+    """
+    Return the requests.Session used to talk to the comments service.
+
+    It keeps up to POOL_SIZE connections to the service open, so that
+    requests don't each open a new one. Each process gets its own, as
+    connections can't be shared across a fork.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=cc_settings.POOL_SIZE,
+                    max_retries=cc_settings.MAX_RETRIES,
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session, _session_pid = session, pid
+    return _session
+
+
+def enable_request_memo():
+    """
+    Start answering identical GET requests to the comments service from
+    memory, until disable_request_memo is called.
+
+    Meant to be scoped to one LMS request, by CommentClientRequestMemoMiddleware.
+    """
+    _request_memo.responses = {}
+
+
+def disable_request_memo():
+    """
+    Stop answering GET requests from memory, and forget their responses.
+    """
+    _request_memo.responses = None
+
+
+def _request_memo_responses():
+    """
+    Return the dict of memoized responses, or None if the memo isn't enabled.
+    """
+    return getattr(_request_memo, 'responses', None)
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
 
@@ -66,6 +129,22 @@ def perform_request(method, url, data_or_params=None, raw=False,
         'X-Edx-Api-Key': getattr(settings, "COMMENTS_SERVICE_KEY", None),
         'Accept-Language': get_language(),
     }
+
+    # Identical GETs within the same LMS request get the same response. Any
+    # other request may change what they would return, so it forgets them all.
+    memo_key = None
+    memo_responses = _request_memo_responses()
+    if memo_responses is not None:
+        if method == 'get':
+            memo_key = (url, repr(sorted(data_or_params.items())), headers['Accept-Language'], raw)
+            if memo_key in memo_responses:
+                metric_tags.append(u'memo:hit')
+                dog_stats_api.increment('comment_client.request.count', tags=metric_tags)
+                return deepcopy(memo_responses[memo_key])
+            metric_tags.append(u'memo:miss')
+        else:
+            memo_responses.clear()
+
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
 
@@ -76,7 +155,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = get_session().request(
             method,
             url,
             data=data,
@@ -102,6 +181,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
         raise CommentClient500Error(response.text)
     else:
         if raw:
+            if memo_key is not None:
+                memo_responses[memo_key] = response.text
             return response.text
         else:
             try:
@@ -129,6 +210,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
                     value=data.get('num_pages', 1),
                     tags=metric_tags
                 )
+            if memo_key is not None:
+                memo_responses[memo_key] = deepcopy(data)
             return data
 
 
@@ -6,13 +6,14 @@ forums, and to the cohort admin views.
 import logging
 import random
 
-from django.db.models.signals import post_save, m2m_changed
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import ugettext as _
 
 from courseware import courses
 from eventtracking import tracker
+from request_cache.middleware import RequestCache
 from student.models import get_user_by_username_or_email
 from .models import CourseUserGroup, CourseUserGroupPartitionGroup
 
@@ -23,6 +24,7 @@ log = logging.getLogger(__name__)
 @receiver(post_save, sender=CourseUserGroup)
 def _cohort_added(sender, **kwargs):
     """Emits a tracking log event each time a cohort is created"""
+    _clear_cohort_cache()
     instance = kwargs["instance"]
     if kwargs["created"] and instance.group_type == CourseUserGroup.COHORT:
         tracker.emit(
@@ -41,6 +43,7 @@ def _cohort_membership_changed(sender, **kwargs):
             for cohort in cohort_iter
         )
 
+    _clear_cohort_cache()
     action = kwargs["action"]
     instance = kwargs["instance"]
     pk_set = kwargs["pk_set"]
@@ -70,6 +73,28 @@ def _cohort_membership_changed(sender, **kwargs):
         tracker.emit(event_name, event)
 
 
+@receiver(post_delete, sender=CourseUserGroup)
+def _cohort_deleted(sender, **kwargs):  # pylint: disable=unused-argument
+    """Forgets the cohorts looked up in this request when a cohort is deleted"""
+    _clear_cohort_cache()
+
+
+def _get_cohort_cache():
+    """
+    Return the cohorts looked up by get_cohort in this request, as a dict of
+    (user id, course key) -> CourseUserGroup, or None if the course isn't
+    cohorted.
+    """
+    return RequestCache.get_request_cache().data.setdefault('course_groups.cohorts', {})
+
+
+def _clear_cohort_cache():
+    """
+    Forget the cohorts looked up in this request, e.g. because memberships changed.
+    """
+    _get_cohort_cache().clear()
+
+
 # A 'default cohort' is an auto-cohort that is automatically created for a course if no auto_cohort_groups have been
 # specified. It is intended to be used in a cohorted-course for users who have yet to be assigned to a cohort.
 # Note 1: If an administrator chooses to configure a cohort with the same name, the said cohort will be used as
@@ -214,6 +239,12 @@ def get_cohort(user, course_key, assign=True):
     Raises:
        ValueError if the CourseKey doesn't exist.
     """
+    # The cohorts that have been looked up already in this request
+    cohort_cache = _get_cohort_cache()
+    cache_key = (user.id, course_key)
+    if cache_key in cohort_cache:
+        return cohort_cache[cache_key]
+
     # First check whether the course is cohorted (users shouldn't be in a cohort
     # in non-cohorted courses, but settings can change after course starts)
     try:
@@ -222,14 +253,16 @@ def get_cohort(user, course_key, assign=True):
         raise ValueError("Invalid course_key")
 
     if not course.is_cohorted:
+        cohort_cache[cache_key] = None
         return None
 
     try:
-        return CourseUserGroup.objects.get(
+        cohort_cache[cache_key] = CourseUserGroup.objects.get(
             course_id=course_key,
             group_type=CourseUserGroup.COHORT,
             users__id=user.id,
         )
+        return cohort_cache[cache_key]
     except CourseUserGroup.DoesNotExist:
         # Didn't find the group.  We'll go on to create one if needed.
         if not assign:
@@ -249,9 +282,49 @@ def get_cohort(user, course_key, assign=True):
         name=group_name
     )
     user.course_groups.add(group)
+    cohort_cache[cache_key] = group
     return group
 
 
+def get_cohorts_for_users(user_ids, course_key):
+    """
+    Given the ids of some users and a CourseKey, return the users' cohorts in
+    that course, looked up all at once.
+
+    Unlike get_cohort(), users that don't have a cohort aren't assigned one.
+
+    Arguments:
+        user_ids: a list of ids of Django users.
+        course_key: CourseKey
+
+    Returns:
+        A dict of user id -> CourseUserGroup, for the users that have a
+        cohort.  Empty if the course isn't cohorted.
+
+    Raises:
+       ValueError if the CourseKey doesn't exist.
+    """
+    try:
+        course = courses.get_course_by_id(course_key)
+    except Http404:
+        raise ValueError("Invalid course_key")
+
+    if not course.is_cohorted or not user_ids:
+        return {}
+
+    course_cohorts = {
+        cohort.id: cohort for cohort in CourseUserGroup.objects.filter(
+            course_id=course_key,
+            group_type=CourseUserGroup.COHORT,
+        )
+    }
+    memberships = CourseUserGroup.users.through.objects.filter(
+        courseusergroup__in=course_cohorts.keys(),
+        user__in=user_ids,
+    ).values_list('user', 'courseusergroup')
+    return {user_id: course_cohorts[cohort_id] for user_id, cohort_id in memberships}
+
+
 def get_course_cohorts(course):
     """
     Get a list of all the cohorts in the given course. This will include auto cohorts,
@@ -394,3 +467,17 @@ def get_group_info_for_cohort(cohort):
     if len(res):
         return res[0].group_id, res[0].partition_id
     return None, None
+
+
+def get_group_info_for_cohorts(cohorts):
+    """
+    Get the ids of the group and partition to which each of the given cohorts
+    has been linked, like get_group_info_for_cohort(), with a single query.
+
+    Returns a dict of cohort id -> (group id, partition id), for the cohorts
+    that have been linked.
+    """
+    return {
+        link.course_user_group_id: (link.group_id, link.partition_id)
+        for link in CourseUserGroupPartitionGroup.objects.filter(course_user_group__in=[cohort.id for cohort in cohorts])
+    }
@@ -7,7 +7,7 @@ from courseware import courses
 from courseware.masquerade import get_masquerading_group_info
 from xmodule.partitions.partitions import NoSuchUserPartitionGroupError
 
-from .cohorts import get_cohort, get_group_info_for_cohort
+from .cohorts import get_cohort, get_cohorts_for_users, get_group_info_for_cohort, get_group_info_for_cohorts
 
 
 log = logging.getLogger(__name__)
@@ -22,16 +22,16 @@ class CohortPartitionScheme(object):
 
     # pylint: disable=unused-argument
     @classmethod
-    def get_group_for_user(cls, course_key, user, user_partition, track_function=None):
+    def get_group_for_user(cls, course_key, user, user_partition, assign=True, track_function=None):
         """
         Returns the Group from the specified user partition to which the user
         is assigned, via their cohort membership and any mappings from cohorts
         to partitions / groups that might exist.
 
         If the user has not yet been assigned to a cohort, an assignment *might*
-        be created on-the-fly, as determined by the course's cohort config.
-        Any such side-effects will be triggered inside the call to
-        cohorts.get_cohort().
+        be created on-the-fly, as determined by the course's cohort config
+        (unless `assign` is False).  Any such side-effects will be triggered
+        inside the call to cohorts.get_cohort().
 
         If the user has no cohort mapping, or there is no (valid) cohort ->
         partition group mapping found, the function returns None.
@@ -46,12 +46,44 @@ class CohortPartitionScheme(object):
                 # If the group no longer exists then the masquerade is not in effect
                 pass
 
-        cohort = get_cohort(user, course_key)
+        cohort = get_cohort(user, course_key, assign=assign)
         if cohort is None:
             # student doesn't have a cohort
             return None
 
         group_id, partition_id = get_group_info_for_cohort(cohort)
+        return cls._get_linked_group(user_partition, cohort, group_id, partition_id)
+
+    @classmethod
+    def get_groups_for_users(cls, course_key, user_ids, user_partition):
+        """
+        Returns the Groups from the specified user partition to which the users
+        with the given ids are assigned, like get_group_for_user() does for
+        each of them, in a few queries for all of them.
+
+        Users that haven't been assigned to a cohort yet aren't assigned one,
+        and masquerading isn't taken into account.
+
+        Returns a dict of user id -> Group, for the users that are in a group.
+        """
+        cohorts = get_cohorts_for_users(user_ids, course_key)
+        links = get_group_info_for_cohorts(set(cohorts.values()))
+
+        groups = {}
+        for user_id, cohort in cohorts.iteritems():
+            group_id, partition_id = links.get(cohort.id, (None, None))
+            group = cls._get_linked_group(user_partition, cohort, group_id, partition_id)
+            if group is not None:
+                groups[user_id] = group
+        return groups
+
+    @classmethod
+    def _get_linked_group(cls, user_partition, cohort, group_id, partition_id):
+        """
+        Returns the Group from the specified user partition that the cohort is
+        linked to (as group `group_id` of partition `partition_id`), or None
+        if the cohort isn't linked to a valid group of that partition.
+        """
         if partition_id is None:
             # cohort isn't mapped to any partition group.
             return None
@@ -4,6 +4,7 @@ Helper methods for testing cohorts.
 from factory import post_generation, Sequence
 from factory.django import DjangoModelFactory
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore import ModuleStoreEnum
 
@@ -93,3 +94,6 @@ def config_course_cohorts(
         modulestore().update_item(course, ModuleStoreEnum.UserID.test)
     except NotImplementedError:
         pass
+
+    # Cohorts looked up in the current "request" may not be valid anymore
+    RequestCache().clear_request_cache()
@@ -7,6 +7,7 @@ from django.test.utils import override_settings
 from mock import call, patch
 
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
 from xmodule.modulestore.django import modulestore, clear_existing_modulestores
@@ -132,6 +133,7 @@ class TestCohorts(TestCase):
         Make sure that course is reloaded every time--clear out the modulestore.
         """
         clear_existing_modulestores()
+        RequestCache().clear_request_cache()
         self.toy_course_key = SlashSeparatedCourseKey("edX", "toy", "2012_Fall")
 
     def test_is_course_cohorted(self):
@@ -232,6 +234,56 @@ class TestCohorts(TestCase):
         self.assertEquals(cohorts.get_cohort(user, course.id).name, "AutoGroup")
 
 
+    def test_get_cohort_is_cached(self):
+        """
+        Make sure cohorts.get_cohort() only looks up a user's cohort once per
+        request, until cohort memberships change.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, discussions=[], cohorted=True)
+        user = UserFactory(username="test", email="a@b.com")
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=[user])
+        other_cohort = CohortFactory(course_id=course.id, name="OtherCohort")
+
+        self.assertEquals(cohorts.get_cohort(user, course.id).id, cohort.id)
+        with self.assertNumQueries(0):
+            self.assertEquals(cohorts.get_cohort(user, course.id).id, cohort.id)
+
+        cohorts.add_user_to_cohort(other_cohort, user.username)
+        self.assertEquals(cohorts.get_cohort(user, course.id).id, other_cohort.id)
+
+        RequestCache().clear_request_cache()
+        with self.assertNumQueries(1):
+            self.assertEquals(cohorts.get_cohort(user, course.id).id, other_cohort.id)
+
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure cohorts.get_cohorts_for_users() looks up the cohorts of all
+        the users at once, without assigning any.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        users = [UserFactory() for _ in range(4)]
+        self.assertEquals(cohorts.get_cohorts_for_users([user.id for user in users], course.id), {})
+
+        config_course_cohorts(course, discussions=[], cohorted=True)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=users[:2])
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort", users=users[2:3])
+        # Groups in other courses aren't cohorts of this course
+        CohortFactory(name="OtherCourseCohort", users=users)
+
+        with self.assertNumQueries(2):
+            user_cohorts = cohorts.get_cohorts_for_users([user.id for user in users], course.id)
+        self.assertEquals(
+            {user_id: cohort.id for user_id, cohort in user_cohorts.iteritems()},
+            {users[0].id: first_cohort.id, users[1].id: first_cohort.id, users[2].id: second_cohort.id}
+        )
+        self.assertIsNone(cohorts.get_cohort(users[3], course.id, assign=False))
+
+        self.assertRaises(
+            ValueError,
+            lambda: cohorts.get_cohorts_for_users([users[0].id], SlashSeparatedCourseKey("course", "does_not", "exist"))
+        )
+
     def test_auto_cohorting(self):
         """
         Make sure cohorts.get_cohort() does the right thing with auto_cohort_groups
@@ -651,6 +703,21 @@ class TestCohortsAndPartitionGroups(TestCase):
             (None, None),
         )
 
+    def test_get_group_info_for_cohorts(self):
+        """
+        Test that the links of many cohorts are looked up at once
+        """
+        self._link_cohort_partition_group(
+            self.first_cohort,
+            self.partition_id,
+            self.group1_id,
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                cohorts.get_group_info_for_cohorts([self.first_cohort, self.second_cohort]),
+                {self.first_cohort.id: (self.group1_id, self.partition_id)},
+            )
+
     def test_multiple_cohorts(self):
         """
         Test that multiple cohorts can be linked to the same partition group
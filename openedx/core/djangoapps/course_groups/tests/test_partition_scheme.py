@@ -185,6 +185,27 @@ class TestCohortPartitionScheme(django.test.TestCase):
         # check link is correct
         self.assert_student_in_group(self.groups[0])
 
+    def test_groups_for_users(self):
+        """
+        Test that the groups of many students are looked up at once, without
+        assigning them to cohorts.
+        """
+        self.setup_student_in_group_0()
+        other_students = [UserFactory.create() for _ in range(2)]
+        second_cohort = CohortFactory(course_id=self.course_key, users=other_students[:1])
+        link_cohort_to_partition_group(second_cohort, self.user_partition.id, self.groups[1].id)
+
+        user_ids = [self.student.id] + [student.id for student in other_students]
+        self.assertEqual(
+            CohortPartitionScheme.get_groups_for_users(self.course_key, user_ids, self.user_partition),
+            {self.student.id: self.groups[0], other_students[0].id: self.groups[1]}
+        )
+        self.assertIsNone(
+            CohortPartitionScheme.get_group_for_user(
+                self.course_key, other_students[1], self.user_partition, assign=False
+            )
+        )
+
     def test_partition_changes_nondestructive(self):
         """
         If the name of a user partition is changed, or a group is added to the